@@ -0,0 +1,147 @@
+// apps/assets/ducts.js
+// Browser-side ductulator and fitting-loss card: the straight-duct physics of
+// apps/shared/ducts.py (duct_drop, velocity_pressure and the friction correlations of
+// apps/shared/friction.py) so neither card waits on a server round trip. Presets, mode
+// labels and defaults come from ducts.JS_CONSTANTS via the du-consts store. Parity with
+// the Python on a shared input grid: python -m apps.shared.ducts (needs node on PATH)
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    ducts: {
+        friction: function (Re, eps, D, mode, re_lam) {
+            if (!(Re > 0) || !(D > 0)) { return 0.0; }
+            if (Re < re_lam) { return 64.0 / Re; }
+            const rel = eps / D;
+            const sj = 0.25 / Math.log10(rel / 3.7 + 5.74 / Re ** 0.9) ** 2;
+            if (mode === "haaland") { return (-1.8 * Math.log10((rel / 3.7) ** 1.11 + 6.9 / Re)) ** -2; }
+            if (mode !== "colebrook") { return sj; }
+            // Newton on x = 1/√f from Swamee–Jain, as friction.colebrook
+            const a = rel / 3.7, b = 2.51 / Re;
+            let x = 1.0 / Math.sqrt(sj);
+            for (let it = 0; it < 10; it++) {
+                const inner = a + b * x;
+                const dx = (x + 2.0 * Math.log10(inner)) / (1.0 + 2.0 * b / (inner * Math.LN10));
+                x = x - dx;
+                if (Math.abs(dx) / x < 1e-12) { break; }
+            }
+            return 1.0 / (x * x);
+        },
+
+        geometry: function (shape, a_mm, b_mm) {
+            const a = (a_mm || 0.0) / 1000.0, b = (b_mm || 0.0) / 1000.0;
+            if (shape === "circular") { return [Math.PI * a * a / 4.0, a]; }
+            return [a * b, a + b === 0 ? 0.0 : 1.30 * (a * b) ** 0.625 / (a + b) ** 0.25];
+        },
+
+        drop: function (flow_ls, area, D, eps, rho, mu, L, mode, re_lam) {
+            const V = area <= 0 ? 0.0 : (flow_ls || 0.0) / 1000.0 / area;
+            const Re = V === 0 ? 0.0 : rho * V * D / mu;
+            const f = window.dash_clientside.ducts.friction(Re, eps, D, mode, re_lam);
+            const pa_m = D === 0 ? 0.0 : f * (rho * V * V) / (2.0 * D);
+            return {pa_m: pa_m, pa_total: pa_m * L, V: V, Re: Re, f: f};
+        },
+
+        // Python's f"{x:,.{d}f}" (comma) and f"{x:.{d}f}"
+        fixed: function (x, d, comma) {
+            const s = Number(x).toFixed(d);
+            if (!comma) { return s; }
+            const [whole, frac] = s.split(".");
+            const grouped = whole.replace(/\B(?=(\d{3})+(?!\d))/g, ",");
+            return frac === undefined ? grouped : grouped + "." + frac;
+        },
+
+        // Python's f"{x:g}"
+        g: function (x) {
+            if (x === 0) { return "0"; }
+            const strip = s => s.includes(".") ? s.replace(/0+$/, "").replace(/\.$/, "") : s;
+            const [m, e] = x.toExponential(5).split("e");
+            const exp = Number(e);
+            if (exp >= -4 && exp < 6) { return strip(x.toFixed(5 - exp)); }
+            return strip(m) + "e" + (exp < 0 ? "-" : "+") + String(Math.abs(exp)).padStart(2, "0");
+        },
+
+        ductulator: function (n_clicks, flow_ls, shape, diam_mm, width_mm, height_mm, length_m,
+                              rough_preset, rough_custom_mm, rho, mu, fmode, c) {
+            const nu = window.dash_clientside.no_update;
+            const du = window.dash_clientside.ducts;
+            const el = (type, children, props) => ({
+                type: type, namespace: "dash_html_components",
+                props: Object.assign({children: children}, props || {}),
+            });
+
+            flow_ls = Number(flow_ls || 0); length_m = Number(length_m || 0);
+            rho = Number(rho || c.rho); mu = Number(mu || c.mu);
+            if ([flow_ls, length_m, rho, mu].some(Number.isNaN)) {
+                return ["Please enter valid numeric values.", nu];
+            }
+
+            let dims_label;
+            if (shape === "circular") {
+                if (!diam_mm) { return ["Enter a diameter.", nu]; }
+                dims_label = `Ø ${du.fixed(diam_mm, 0)} mm`;
+            } else {
+                if (!(width_mm && height_mm)) { return ["Enter width and height.", nu]; }
+                dims_label = `${du.fixed(width_mm, 0)} × ${du.fixed(height_mm, 0)} mm`;
+            }
+            const [A, D] = shape === "circular" ? du.geometry("circular", diam_mm)
+                                                : du.geometry("rectangular", width_mm, height_mm);
+
+            let eps = c.presets[rough_preset];
+            if (eps == null) {
+                const custom = rough_custom_mm == null ? NaN : Number(rough_custom_mm);
+                eps = Number.isNaN(custom) ? c.eps : (custom || 0.0) / 1000.0;
+            }
+
+            fmode = fmode in c.modes ? fmode : "swamee_jain";
+            const r = du.drop(flow_ls, A, D, eps, rho, mu, length_m, fmode, c.re_lam);
+            const VP = 0.5 * rho * r.V * r.V;
+            const fmt = (v, unit, d) => `${du.fixed(v, d)} ${unit}`.trimEnd();
+
+            const duct_div = el("Div", [
+                el("Div", [el("B", "Inputs")]),
+                el("Ul", [
+                    el("Li", `Flow: ${fmt(flow_ls, "L/s", 1)}`),
+                    el("Li", `Shape & size: ${dims_label}`),
+                    el("Li", `Length: ${fmt(length_m, "m", 2)}`),
+                    el("Li", `Roughness ε: ${fmt(eps * 1000, "mm", 3)} (${rough_preset})`),
+                    el("Li", `Air ρ: ${fmt(rho, "kg/m³", 3)}   •   μ: ${du.g(mu)} Pa·s`),
+                ]),
+                el("Hr"),
+                el("Div", [el("B", "Results")]),
+                el("Ul", [
+                    el("Li", `Area A: ${fmt(A, "m²", 4)}`),
+                    el("Li", `Equivalent diameter Dₑ: ${fmt(D * 1000, "mm", 1)}`),
+                    el("Li", `Velocity V: ${fmt(r.V, "m/s", 3)}`),
+                    el("Li", `Reynolds number Re: ${du.fixed(r.Re, 0, true)}`),
+                    el("Li", `Friction factor f: ${fmt(r.f, "", 5)} (${c.modes[fmode]})`),
+                    el("Li", `Velocity pressure VP = ½ρV²: ${fmt(VP, "Pa", 2)}`),
+                    el("Li", `Friction rate Δp/L: ${fmt(r.pa_m, "Pa/m", 3)}`),
+                    el("Li", `Total straight loss Δp = (Δp/L)·L: ${fmt(r.pa_total, "Pa", 2)}`),
+                ]),
+                el("Div", "Note: straight-duct result only. Add fitting losses separately using K·VP."),
+            ]);
+            return [duct_div, Math.round(r.V * 1000) / 1000];
+        },
+
+        fitting: function (rho, v, k) {
+            const vp = 0.5 * rho * v * v;
+            return {vp: vp, dp: k * vp};
+        },
+
+        pressure_loss: function (rho, v, k) {
+            if (rho == null || v == null || k == null) { return ""; }
+            const du = window.dash_clientside.ducts;
+            const r = du.fitting(Number(rho), Number(v), Number(k));
+            const el = (type, children, props) => ({
+                type: type, namespace: "dash_html_components",
+                props: Object.assign({children: children}, props || {}),
+            });
+            const subtle = {color: "#666", marginLeft: "6px"};
+            const line = (label, x) => el("Div", [
+                el("B", label),
+                el("Strong", `${du.fixed(x, 2, true)} Pa`),
+                el("Span", ` (${du.fixed(x / 1000, 3)} kPa)`, {style: subtle}),
+            ]);
+            return el("Div", [line("Velocity pressure = ", r.vp), line("Fitting loss = ", r.dp)],
+                      {style: {lineHeight: "1.6", margin: 0}});
+        },
+    },
+});
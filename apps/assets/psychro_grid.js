@@ -0,0 +1,45 @@
+// apps/assets/psychro_grid.js
+// Browser-side psychrometric readout for the DB/RH sliders: bilinear lookup in the
+// grid built by apps/shared/psychro_grid.py (same maths as psychro_grid.interpolate),
+// so dragging a slider never waits on the server. Typed values still go to the
+// server for exact CoolProp properties.
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    psychro: {
+        interpolate: function (grid, db, rh) {
+            const [d0, dd, nd] = grid.db, [r0, dr, nr] = grid.rh;
+            const clamp = (v, lo, hi) => Math.min(Math.max(v, lo), hi);
+            const x = clamp((db - d0) / dd, 0, nd - 1), y = clamp((rh - r0) / dr, 0, nr - 1);
+            const i = Math.min(Math.floor(x), nd - 2), j = Math.min(Math.floor(y), nr - 2);
+            const fx = x - i, fy = y - j;
+            const out = {};
+            for (const k of ["W", "h", "Twb", "v"]) {
+                const a = grid[k], at = (ii, jj) => a[ii * nr + jj];
+                out[k] = (1 - fx) * (1 - fy) * at(i, j) + fx * (1 - fy) * at(i + 1, j)
+                       + (1 - fx) * fy * at(i, j + 1) + fx * fy * at(i + 1, j + 1);
+            }
+            return out;
+        },
+
+        state_point: function (db, rh, grid, exact, fig) {
+            const nu = window.dash_clientside.no_update;
+            // psy-exact is one-shot: consumed (cleared) by the first slider update after the
+            // server set it, so dragging back to the same values later still interpolates
+            const clear = exact ? null : nu;
+            if (db == null || rh == null || !grid || !fig) { return [nu, nu, nu, nu, clear]; }
+            // the server just pushed these slider values along with exact properties
+            if (exact && exact.db === db && exact.rh === rh) { return [nu, nu, nu, nu, null]; }
+
+            const s = window.dash_clientside.psychro.interpolate(grid, db, rh);
+            const idx = fig.data.findIndex(t => t.name === "State point");
+            const data = fig.data.slice();
+            data[idx] = Object.assign({}, data[idx], {
+                x: [db], y: [s.W],
+                hovertemplate: `DB: ${db.toFixed(1)} °C<br>RH: ${rh.toFixed(0)}%<br>W: ${s.W.toFixed(2)} g/kg<extra></extra>`,
+            });
+            const readout = `≈ h = ${s.h.toFixed(2)} kJ/kg_da · W = ${s.W.toFixed(2)} g/kg · `
+                          + `Twb = ${s.Twb.toFixed(2)} °C · v = ${s.v.toFixed(3)} m³/kg`
+                          + "  (interpolated — type a value for exact)";
+            return [Object.assign({}, fig, {data: data}), readout, db, rh, clear];
+        },
+    },
+});
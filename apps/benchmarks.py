@@ -0,0 +1,110 @@
+# apps/benchmarks.py
+# Callback latency benchmarks. Requests go through the Dash test client, so routing, the
+# callback and JSON serialisation are all timed as the browser's request would see them.
+# Run: python -m apps.benchmarks [psychro|pipe ...]
+import json
+import re
+import statistics
+import sys
+import time
+import plotly.utils
+from apps.app import app
+
+_client = app.server.test_client()
+_client.get("/apps/_dash-layout")
+
+def _page(name):
+    return sys.modules[f"pages.{name}"]
+
+def _callback_key(outputs, inputs):
+    # outputs with allow_duplicate carry an @hash suffix; pick the callback with these inputs
+    plain = "..%s.." % "...".join(outputs) if len(outputs) > 1 else outputs[0]
+    strip = lambda k: re.sub(r"@[0-9a-f]+", "", k)
+    for key, cb in app.callback_map.items():
+        if strip(key) == plain and {f"{i['id']}.{i['property']}" for i in cb["inputs"]} == set(inputs):
+            return key
+    raise KeyError(plain)
+
+def request(outputs, inputs, state=None, changed=None):
+    """POST one callback; returns (ms, response bytes)."""
+    key = _callback_key(outputs, inputs)
+    split = lambda s: s.rsplit(".", 1)
+    outs = [{"id": split(o)[0], "property": split(o)[1]} for o in outputs]
+    body = {"output": key, "outputs": outs if len(outs) > 1 else outs[0],
+            "inputs": [{"id": split(k)[0], "property": split(k)[1], "value": v} for k, v in inputs.items()],
+            "state": [{"id": split(k)[0], "property": split(k)[1], "value": v} for k, v in (state or {}).items()],
+            "changedPropIds": changed or [next(iter(inputs))]}
+    t0 = time.perf_counter()
+    r = _client.post("/apps/_dash-update-component", json=body)
+    ms = (time.perf_counter() - t0)*1e3
+    assert r.status_code == 200, r.get_data(as_text=True)[-500:]
+    return ms, len(r.get_data())
+
+def report(label, runs):
+    ms = [m for m, _ in runs]
+    print(f"  {label:<44} median {statistics.median(ms):7.1f} ms   p90 {sorted(ms)[int(0.9*len(ms))]:7.1f} ms"
+          f"   {runs[-1][1]/1e3:7.1f} kB")
+
+# ------------------ Psychrometric chart: update_chart ------------------
+def psychro(n=50):
+    page = _page("pyschometricchart")
+    outputs = ["psy.figure", "state-readout.children", "db.value", "db_input.value", "rh.value",
+               "rh_input.value", "alt_input.value", "p_input.value", "psy-grid.data", "psy-exact.data"]
+    inputs = {"db_input.n_submit": None, "db_input.n_blur": None, "rh_input.n_submit": None,
+              "rh_input.n_blur": None, "alt_input.value": 0, "p_input.value": 101.325}
+    print("psychrometric chart, update_chart")
+
+    # before the cached curves and Patch: every interaction rebuilt and resent the whole figure
+    runs = []
+    for i in range(n):
+        t0 = time.perf_counter()
+        page.psychro_grid.cache_clear()
+        body = json.dumps(page.make_psychro_figure().to_plotly_json(), cls=plotly.utils.PlotlyJSONEncoder)
+        runs.append(((time.perf_counter() - t0)*1e3, len(body)))
+    report("full figure rebuild (before)", runs)
+
+    runs = [request(outputs, {**inputs, "db_input.n_submit": i},
+                    {"db_input.value": 10.0 + 0.5*i, "rh_input.value": 20.0 + i}, ["db_input.n_submit"])
+            for i in range(n)]
+    report("typed DB/RH → state-point Patch", runs)
+
+    runs = [request(outputs, {**inputs, "alt_input.value": 50*(i % 40)},
+                    {"db_input.value": 25.0, "rh_input.value": 50.0}, ["alt_input.value"])
+            for i in range(n)]
+    report("altitude edit → curve Patch (40 pressures)", runs)
+
+# ------------------ Pipe friction chart: draw_chart ------------------
+def pipe(n=50):
+    page = _page("pipe_friction_chart")
+    outputs = ["pipe-chart.figure", "point-readout.children", "temp-readout.children", "eps-readout.children"]
+    inputs = {"sizes.value": list(page.PIPE_IDS_M), "temp.value": 10, "eps.value": 0.046,
+              "fluid.value": "Water", "conc.value": 30, "pipe-fmode.value": "haaland"}
+    state = {"Q_in.value": 1.0, "dp_in.value": 200.0}
+    print("pipe friction chart, draw_chart (all six sizes, state point on)")
+
+    # every temperature tick a new key (0…n−1 °C): property lookup plus a figure build
+    page.base_figure.cache_clear()
+    runs = [request(outputs, {**inputs, "temp.value": t}, state, ["temp.value"]) for t in range(n)]
+    report("temperature ticks, uncached figure", runs)
+    runs = [request(outputs, {**inputs, "temp.value": 10 + i % 5}, state, ["temp.value"]) for i in range(n)]
+    report("temperature ticks, cached figure", runs)
+
+    # the property lookup inside it, against the PropsSI pair it replaced
+    from CoolProp.CoolProp import PropsSI
+    from apps.shared import fluids
+    t0 = time.perf_counter()
+    for t in range(n):
+        fluids.props(float(t), "Water", 0)
+    table_us = (time.perf_counter() - t0)/n*1e6
+    t0 = time.perf_counter()
+    for t in range(n):
+        PropsSI("D", "T", t + 273.16, "P", 101325.0, "Water"); PropsSI("V", "T", t + 273.16, "P", 101325.0, "Water")
+    propssi_us = (time.perf_counter() - t0)/n*1e6
+    print(f"  water ρ/μ per tick: table {table_us:.0f} µs vs PropsSI pair {propssi_us:.0f} µs")
+
+
+BENCHMARKS = {"psychro": psychro, "pipe": pipe}
+
+if __name__ == "__main__":
+    for name in sys.argv[1:] or BENCHMARKS:
+        BENCHMARKS[name]()
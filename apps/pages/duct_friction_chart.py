@@ -0,0 +1,183 @@
+# apps/pages/duct_friction_chart.py
+# Duct friction chart: Pa/m against L/s on log–log axes with spiral duct Ø and velocity
+# isolines, from the ductulator's physics (apps/shared/ducts.py). The curve family for a
+# (roughness, ρ, μ, friction mode) key is built once and cached; the state point is patched in.
+from functools import lru_cache
+import numpy as np
+import plotly.graph_objects as go
+from dash import register_page, html, dcc, Input, Output, State, callback, Patch
+from apps.shared.friction import MODES
+from apps.shared.air import air_props
+from apps.shared.ducts import (ROUGHNESS_PRESETS, CIRCULAR_MM, duct_drop, duct_drops, circular_for_gradient)
+
+register_page(__name__, path="/duct-friction-chart", name="Duct Friction Chart")
+
+FIGURE_CACHE_SIZE = 32
+
+Q_RANGE = (10.0, 50_000.0)   # L/s
+DP_RANGE = (0.1, 20.0)       # Pa/m
+VELOCITY_ISOLINES = (2, 3, 4, 5, 6, 7, 8, 10, 12, 15, 20)  # m/s
+# state point placeholder, always last, after the Ø lines, velocity lines and their two label traces
+POINT_TRACE = len(CIRCULAR_MM) + len(VELOCITY_ISOLINES) + 2
+
+def make_figure(eps_m, rho, mu, mode="swamee_jain"):
+    Q = np.logspace(*np.log10(Q_RANGE), 240)
+    fig = go.Figure()
+
+    # constant Ø: Pa/m over the flow range, every size in one array pass
+    D = np.array(CIRCULAR_MM, float)/1000.0
+    r = duct_drops(Q[None, :], np.pi*D[:, None]**2/4.0, D[:, None], eps=eps_m, rho=rho, mu=mu, mode=mode)
+    label_x, label_y = [], []
+    for i, d_mm in enumerate(CIRCULAR_MM):
+        fig.add_trace(go.Scatter(x=Q, y=r["Pa_per_m"][i], customdata=r["V"][i], mode="lines",
+                                 line=dict(color="#7f7f7f", width=1), legendgroup="d",
+                                 name="Duct Ø (mm)", showlegend=i == 0,
+                                 hovertemplate=f"Ø {d_mm} mm<br>Q=%{{x:.3g}} L/s<br>Δp/L=%{{y:.3g}} Pa/m"
+                                               "<br>v=%{customdata:.2f} m/s<extra></extra>"))
+        inside = np.flatnonzero(r["Pa_per_m"][i] <= DP_RANGE[1])  # label where the line leaves the chart
+        if len(inside):
+            label_x.append(Q[inside[-1]]); label_y.append(r["Pa_per_m"][i][inside[-1]])
+        else:
+            label_x.append(None); label_y.append(None)
+
+    # constant velocity: Q = v·A along a continuous Ø range
+    Dc = np.logspace(np.log10(0.05), np.log10(2.5), 160)
+    vlabel_x, vlabel_y = [], []
+    for i, v in enumerate(VELOCITY_ISOLINES):
+        Qv = v*np.pi*Dc**2/4.0*1000.0
+        dp = duct_drops(Qv, np.pi*Dc**2/4.0, Dc, eps=eps_m, rho=rho, mu=mu, mode=mode)["Pa_per_m"]
+        fig.add_trace(go.Scatter(x=Qv, y=dp, customdata=Dc*1000.0, mode="lines",
+                                 line=dict(color="#1f77b4", width=1, dash="dash"), legendgroup="v",
+                                 name="Velocity (m/s)", showlegend=i == 0,
+                                 hovertemplate=f"v = {v} m/s<br>Q=%{{x:.3g}} L/s<br>Δp/L=%{{y:.3g}} Pa/m"
+                                               "<br>Ø=%{customdata:.0f} mm<extra></extra>"))
+        inside = np.flatnonzero((dp >= DP_RANGE[0]) & (Qv <= Q_RANGE[1]))
+        if len(inside):
+            vlabel_x.append(Qv[inside[-1]]); vlabel_y.append(dp[inside[-1]])
+        else:
+            vlabel_x.append(None); vlabel_y.append(None)
+
+    fig.add_trace(go.Scatter(x=label_x, y=label_y, text=[str(d) for d in CIRCULAR_MM], mode="text",
+                             textposition="top left", textfont=dict(size=10, color="#555"),
+                             hoverinfo="skip", showlegend=False))
+    fig.add_trace(go.Scatter(x=vlabel_x, y=vlabel_y, text=[f"{v} m/s" for v in VELOCITY_ISOLINES],
+                             mode="text", textposition="bottom left", textfont=dict(size=10, color="#1f77b4"),
+                             hoverinfo="skip", showlegend=False))
+    fig.add_trace(go.Scatter(x=[], y=[], mode="markers", marker=dict(size=11, symbol="x", color="#d62728"),
+                             name="State point",
+                             hovertemplate="Q=%{x:.3g} L/s<br>Δp/L=%{y:.3g} Pa/m<extra></extra>"))
+    fig.update_layout(
+        xaxis=dict(type="log", title="Flow Q (L/s)", range=list(np.log10(Q_RANGE))),
+        yaxis=dict(type="log", title="Friction rate Δp/L (Pa/m)", range=list(np.log10(DP_RANGE))),
+        template="plotly_white", margin=dict(l=60, r=20, t=30, b=50),
+    )
+    return fig
+
+@lru_cache(maxsize=FIGURE_CACHE_SIZE)
+def base_figure(eps_mm, rho, mu, mode="swamee_jain"):
+    """Curves for one (roughness, ρ, μ, friction mode) key — built once, then reused.
+    Returns the plotly JSON dict; callers must copy before mutating."""
+    return make_figure(eps_mm*1e-3, rho, mu, mode).to_plotly_json()
+
+def _chart_key(preset, custom_mm, t_c, altitude_m, mode):
+    # roughness to 0.001 mm; ρ and μ come quantised from air_props (0.1 °C, 10 m)
+    eps_mm = ROUGHNESS_PRESETS.get(preset)
+    eps_mm = eps_mm*1000.0 if eps_mm is not None else 0.15 if custom_mm is None else float(custom_mm)
+    rho, mu = air_props(20.0 if t_c is None else t_c, altitude_m or 0.0)
+    return round(max(eps_mm, 0.0), 3), rho, mu, mode if mode in MODES else "swamee_jain"
+
+def point_overlay(Q_in, dp_in, eps_mm, rho, mu, mode="swamee_jain"):
+    """(state-point x, y, readout) for the current Q / Δp/L inputs."""
+    air = f"ρ = {rho:.3f} kg/m³ · μ = {mu*1e6:.2f} µPa·s · ε = {eps_mm:.3f} mm"
+    if not (Q_in and dp_in and Q_in > 0 and dp_in > 0):
+        return [], [], html.Div(air)
+    d = float(circular_for_gradient(Q_in, dp_in, eps=eps_mm*1e-3, rho=rho, mu=mu, mode=mode)[0])
+    v = Q_in/1000.0/(np.pi*(d/1000.0)**2/4.0)
+    lines = [air, f"Exact Ø for {Q_in:,.0f} L/s at {dp_in:g} Pa/m: {d:.0f} mm at {v:.2f} m/s"]
+    d_std = next((s for s in CIRCULAR_MM if s >= d), None)
+    if d_std is None:
+        lines.append(f"Larger than the largest spiral size ({CIRCULAR_MM[-1]} mm).")
+    else:
+        D = d_std/1000.0
+        pa_m, _, v_std, _, _ = duct_drop(Q_in, np.pi*D*D/4.0, D, eps=eps_mm*1e-3, rho=rho, mu=mu, mode=mode)
+        lines.append(f"Next spiral size up: Ø {d_std} mm at {pa_m:.3f} Pa/m, {v_std:.2f} m/s")
+    return [Q_in], [dp_in], html.Div([html.Div(t) for t in lines])
+
+# --------------- Layout ---------------
+layout = html.Div(style={"padding": "16px"}, children=[
+    html.H2("Interactive Duct Friction Chart"),
+
+    html.Div([
+        html.Div([
+            html.Label("Duct material", style={"marginRight": "10px"}),
+            dcc.Dropdown(id="dfc-rough-preset", clearable=False, value="Galvanized steel (0.15 mm)",
+                         options=[{"label": k, "value": k} for k in ROUGHNESS_PRESETS], style={"width": "260px"}),
+            html.Label("Custom ε (mm)", style={"margin": "0 10px 0 14px"}),
+            dcc.Input(id="dfc-rough-custom", type="number", value=0.15, step=0.01, min=0, debounce=True,
+                      style={"width": "90px"}),
+        ], style={"display": "flex", "alignItems": "center", "marginBottom": "8px"}),
+
+        html.Div([
+            html.Label("Air temperature (°C)", style={"marginRight": "10px"}),
+            dcc.Input(id="dfc-temp", type="number", value=20.0, step=1, debounce=True, style={"width": "90px"}),
+            html.Label("Altitude (m)", style={"margin": "0 10px 0 14px"}),
+            dcc.Input(id="dfc-alt", type="number", value=0.0, step=50, debounce=True, style={"width": "90px"}),
+            html.Label("Friction factor", style={"margin": "0 10px 0 14px"}),
+            dcc.Dropdown(id="dfc-fmode", clearable=False, value="swamee_jain", style={"width": "260px"},
+                         options=[{"label": lbl, "value": k} for k, lbl in MODES.items()]),
+        ], style={"display": "flex", "alignItems": "center", "marginBottom": "8px"}),
+
+        html.Label("Overlay a state point"),
+        html.Div([
+            html.Span("Q (L/s)"),
+            dcc.Input(id="dfc-q", type="number", value=600.0, step=10.0,
+                      style={"width": "110px", "marginRight": "14px"}),
+            html.Span("Δp/L (Pa/m)"),
+            dcc.Input(id="dfc-dp", type="number", value=1.0, step=0.1,
+                      style={"width": "110px", "marginRight": "14px"}),
+        ], style={"display": "flex", "alignItems": "center", "gap": "10px"}),
+        html.Div(id="dfc-readout", style={"color": "#555", "marginTop": "6px", "lineHeight": "1.6"}),
+    ], style={"maxWidth": "1100px"}),
+
+    dcc.Graph(id="duct-chart", style={"height": "750px"}),
+])
+
+# --------------- Base chart: curves change only with roughness / air / friction mode ---------------
+@callback(
+    Output("duct-chart", "figure"),
+    Output("dfc-readout", "children"),
+    Input("dfc-rough-preset", "value"),
+    Input("dfc-rough-custom", "value"),
+    Input("dfc-temp", "value"),
+    Input("dfc-alt", "value"),
+    Input("dfc-fmode", "value"),
+    State("dfc-q", "value"),
+    State("dfc-dp", "value"),
+)
+def draw_chart(preset, custom_mm, t_c, altitude_m, mode, Q_in, dp_in):
+    key = _chart_key(preset, custom_mm, t_c, altitude_m, mode)
+    base = base_figure(*key)
+    x, y, readout = point_overlay(Q_in, dp_in, *key)
+    data = list(base["data"])
+    data[POINT_TRACE] = {**data[POINT_TRACE], "x": x, "y": y}
+    return {**base, "data": data}, readout
+
+# --------------- Overlay: Q / Δp/L only move the marker and refresh the readout ---------------
+@callback(
+    Output("duct-chart", "figure", allow_duplicate=True),
+    Output("dfc-readout", "children", allow_duplicate=True),
+    Input("dfc-q", "value"),
+    Input("dfc-dp", "value"),
+    State("dfc-rough-preset", "value"),
+    State("dfc-rough-custom", "value"),
+    State("dfc-temp", "value"),
+    State("dfc-alt", "value"),
+    State("dfc-fmode", "value"),
+    prevent_initial_call=True,
+)
+def draw_point(Q_in, dp_in, preset, custom_mm, t_c, altitude_m, mode):
+    x, y, readout = point_overlay(Q_in, dp_in, *_chart_key(preset, custom_mm, t_c, altitude_m, mode))
+    fig = Patch()
+    fig["data"][POINT_TRACE]["x"] = x
+    fig["data"][POINT_TRACE]["y"] = y
+    return fig, readout
@@ -1,9 +1,20 @@
 # apps/pages/ductsystem_resistance.py
-from dash import register_page, html, dcc
+import base64
+import json
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from dash import register_page, html, dcc, dash_table, Input, Output, State, callback
 from apps.shared.ui import BRAND, MUTED, BLACK
+from apps.shared import duct_tree
 
 register_page(__name__, path="/ductsystemresistance", name="Duct System Resistance")
 
+NETWORK_CACHE_SIZE = 16
+EDITABLE = ("length_m", "k", "diameter_mm", "width_mm", "height_mm", "flow_ls")
+# built networks keyed by their section table; an edit moves the tree to its new key
+_NETWORKS = OrderedDict()
+
 layout = html.Div(
     style={"width": "100%", "padding": "16px", "fontFamily": "Segoe UI, Inter, Arial", "color": BLACK},
     children=[
@@ -96,5 +107,193 @@ layout = html.Div(
             style={"marginBottom": "12px"},
         ),
 
+        dcc.Markdown("### Static regain sizing", style={"margin": "6px 0"}),
+        dcc.Markdown(
+            r"""
+        Each section after the first is sized so that the static pressure regained from its drop in
+        velocity pays for its own friction and fitting losses:
+
+        $$
+        R\left(P_{v,up} - P_v\right) = \left(\frac{f L}{D} + K\right) P_v
+        $$
+
+        where $R$ is the regain coefficient (typically 0.75). Sections leaving the fan run at the
+        starting velocity; sizes are rounded up to the next standard circular size before the next
+        level down is sized.
+            """,
+            mathjax=True,
+            style={"marginBottom": "8px"},
+        ),
+        dcc.Upload(id="sr-upload",
+                   children=html.Div(["Drop or ", html.A("select"),
+                                      " a duct tree CSV (node, parent, length_m, k, flow_ls)"]),
+                   style={"width": "100%", "maxWidth": "900px", "padding": "14px", "borderWidth": "1px",
+                          "borderStyle": "dashed", "borderRadius": "10px", "textAlign": "center"}),
+        dcc.Store(id="sr-data", data=duct_tree.SAMPLE_TREE.to_dict("records")),
+        html.Div("Using the sample two-branch supply until a CSV is loaded.",
+                 id="sr-status", style={"color": MUTED, "margin": "6px 0"}),
+        html.Div([
+            html.Span("Start velocity (m/s)"),
+            dcc.Input(id="sr-vstart", type="number", value=7.0, step=0.5, style={"width": "80px"}),
+            html.Span("Minimum velocity (m/s)"),
+            dcc.Input(id="sr-vmin", type="number", value=2.5, step=0.5, style={"width": "80px"}),
+            html.Span("Regain R"),
+            dcc.Input(id="sr-r", type="number", value=duct_tree.REGAIN, step=0.05, min=0.1, max=1.0,
+                      style={"width": "80px"}),
+        ], style={"display": "flex", "alignItems": "center", "gap": "10px", "flexWrap": "wrap"}),
+        dash_table.DataTable(
+            id="sr-table", data=[], page_size=20,
+            style_table={"overflowX": "auto", "maxWidth": "900px", "marginTop": "8px"},
+            style_cell={"padding": "6px", "fontSize": "14px", "fontVariantNumeric": "tabular-nums"},
+            style_header={"backgroundColor": "#f7f7f7", "fontWeight": 600},
+        ),
+
+        dcc.Markdown("### Network total pressure", style={"margin": "18px 0 6px"}),
+        dcc.Markdown(
+            r"""
+        Each section loses $P_T = \Delta p_f + K_T P_v$. The fan must supply the largest total from the
+        fan to a terminal (the **index run**) plus the terminal's own loss; every other terminal has surplus
+        for its damper. Sizes start from the static regain result above (or the CSV's `diameter_mm`,
+        `width_mm` and `height_mm`); edit lengths, K, sizes or terminal flows in the table.
+            """,
+            mathjax=True,
+            style={"marginBottom": "8px"},
+        ),
+        html.Div([
+            html.Span("Terminal loss (Pa)"),
+            dcc.Input(id="net-terminal-pa", type="number", value=25.0, step=5, style={"width": "80px"}),
+        ], style={"display": "flex", "alignItems": "center", "gap": "10px"}),
+        html.Div(id="net-summary", style={"fontWeight": 600, "margin": "10px 0"}),
+        dash_table.DataTable(
+            id="net-sections", data=[], page_size=20, editable=True,
+            columns=[{"name": "Section", "id": "node", "editable": False},
+                     {"name": "From", "id": "parent", "editable": False},
+                     {"name": "L (m)", "id": "length_m", "type": "numeric"},
+                     {"name": "K", "id": "k", "type": "numeric"},
+                     {"name": "Ø (mm)", "id": "diameter_mm", "type": "numeric"},
+                     {"name": "W (mm)", "id": "width_mm", "type": "numeric"},
+                     {"name": "H (mm)", "id": "height_mm", "type": "numeric"},
+                     {"name": "Terminal Q (L/s)", "id": "flow_ls", "type": "numeric"}],
+            style_table={"overflowX": "auto", "maxWidth": "900px"},
+            style_cell={"padding": "6px", "fontSize": "14px", "fontVariantNumeric": "tabular-nums"},
+            style_header={"backgroundColor": "#f7f7f7", "fontWeight": 600},
+        ),
+        dash_table.DataTable(
+            id="net-terminals", data=[], page_size=20, sort_action="native",
+            style_table={"overflowX": "auto", "maxWidth": "900px", "marginTop": "12px"},
+            style_cell={"padding": "6px", "fontSize": "14px", "fontVariantNumeric": "tabular-nums"},
+            style_header={"backgroundColor": "#f7f7f7", "fontWeight": 600},
+        ),
     ],
 )
+
+@callback(
+    Output("sr-data", "data"),
+    Output("sr-status", "children"),
+    Input("sr-upload", "contents"),
+    Input("sr-upload", "filename"),
+    prevent_initial_call=True,
+)
+def load_duct_tree(contents, filename):
+    if not contents:
+        return duct_tree.SAMPLE_TREE.to_dict("records"), "Using the sample two-branch supply."
+    try:
+        df = duct_tree.parse_tree_csv(base64.b64decode(contents.split(",", 1)[1]).decode("utf-8-sig"))
+        duct_tree.euler_tour(duct_tree.parent_index(df))
+    except Exception as e:
+        return duct_tree.SAMPLE_TREE.to_dict("records"), f"Could not read {filename}: {e}"
+    return df.to_dict("records"), f"{filename}: {len(df)} nodes"
+
+def _num(v, default):
+    try: return float(v)
+    except (TypeError, ValueError): return default
+
+@callback(
+    Output("sr-table", "data"),
+    Output("sr-table", "columns"),
+    Output("net-sections", "data"),
+    Input("sr-data", "data"),
+    Input("sr-vstart", "value"),
+    Input("sr-vmin", "value"),
+    Input("sr-r", "value"),
+)
+def size_static_regain(rows, v_start, v_min, R):
+    df = pd.DataFrame(rows)
+    v_start = max(_num(v_start, 7.0), 0.5)
+    res = duct_tree.static_regain(duct_tree.parent_index(df), df["length_m"].to_numpy(float),
+                                  df["k"].to_numpy(float), df["flow_ls"].to_numpy(float), v_start=v_start,
+                                  v_min=min(max(_num(v_min, 0.0), 0.0), v_start),
+                                  R=min(max(_num(R, duct_tree.REGAIN), 0.1), 1.0))
+    data = [{"Section": df["node"][i], "Depth": int(res["depth"][i]), "Q (L/s)": round(res["flow_ls"][i], 1),
+             "Ø exact (mm)": round(res["d_exact_mm"][i]), "Ø (mm)": round(res["d_mm"][i]),
+             "V (m/s)": round(res["v"][i], 2), "Friction (Pa)": round(res["friction"][i], 2),
+             "Fitting (Pa)": round(res["fitting"][i], 2), "Regain (Pa)": round(res["regain"][i], 2),
+             "Static vs fan (Pa)": round(res["static"][i], 1)}
+            for i in res["order"][1:]]
+    # the network table starts from the CSV's sizes where given, else the regain sizes
+    given = lambda c: df[c].to_numpy(float) if c in df else np.full(len(df), np.nan)
+    rect = (given("width_mm") > 0) & (given("height_mm") > 0)
+    d = np.where(given("diameter_mm") > 0, given("diameter_mm"), res["d_mm"])
+    sections = [{"node": df["node"][i], "parent": df["parent"][i], "length_m": float(df["length_m"][i]),
+                 "k": float(df["k"][i]), "diameter_mm": None if rect[i] else round(float(d[i])),
+                 "width_mm": float(given("width_mm")[i]) if rect[i] else None,
+                 "height_mm": float(given("height_mm")[i]) if rect[i] else None,
+                 "flow_ls": float(df["flow_ls"][i]) if res["leaf"][i] else None}
+                for i in range(len(df))]
+    return data, [{"name": c, "id": c} for c in (data[0] if data else ["Section"])], sections
+
+
+def _key(rows, terminal_pa):
+    return json.dumps([terminal_pa, rows], sort_keys=True, default=str)
+
+def _build_network(rows, terminal_pa):
+    df = pd.DataFrame(rows)
+    col = lambda c: pd.to_numeric(df[c], errors="coerce").fillna(0.0).clip(lower=0.0).to_numpy(float)
+    return duct_tree.DuctTree(duct_tree.parent_index(df), col("length_m"), col("k"), col("flow_ls"),
+                              diameter_mm=col("diameter_mm"), width_mm=col("width_mm"),
+                              height_mm=col("height_mm"), terminal_pa=terminal_pa)
+
+def _network(rows, previous, terminal_pa):
+    """DuctTree for the table: a single-cell edit updates the cached tree incrementally."""
+    tree = _NETWORKS.pop(_key(previous, terminal_pa), None) if previous else None
+    changed = [] if tree is None or len(previous) != len(rows) else \
+        [(i, c) for i, (a, b) in enumerate(zip(previous, rows)) for c in EDITABLE if a.get(c) != b.get(c)]
+    num = lambda v: max(_num(v, 0.0), 0.0)
+    if tree is not None and len(changed) == 1 and all(a["node"] == b["node"] for a, b in zip(previous, rows)):
+        i, c = changed[0]
+        if c == "flow_ls":
+            tree.set_flow(i, num(rows[i][c]) if tree.leaf[i] else 0.0)
+        else:
+            tree.set_section(i, **{{"k": "K", "length_m": "length"}.get(c, c): num(rows[i][c])})
+    else:
+        tree = _build_network(rows, terminal_pa)
+    _NETWORKS[_key(rows, terminal_pa)] = tree
+    while len(_NETWORKS) > NETWORK_CACHE_SIZE:
+        _NETWORKS.popitem(last=False)
+    return tree
+
+@callback(
+    Output("net-summary", "children"),
+    Output("net-terminals", "data"),
+    Output("net-terminals", "columns"),
+    Input("net-sections", "data"),
+    Input("net-terminal-pa", "value"),
+    State("net-sections", "data_previous"),
+)
+def network_pressure(rows, terminal_pa, previous):
+    if not rows:
+        return "", [], []
+    terminal_pa = max(_num(terminal_pa, 0.0), 0.0)
+    try:
+        tree = _network(rows, previous, terminal_pa)
+    except ValueError as e:
+        return str(e), [], []
+    names = [r["node"] for r in rows]
+    j, fan_pa, path = tree.index_run()
+    summary = (f"Index run: {' → '.join(names[i] for i in path)}   •   Fan total pressure: {fan_pa:,.1f} Pa   •   "
+               f"Fan flow: {tree.flow[tree.root]:,.0f} L/s")
+    data = [{"Terminal": names[i], "Q (L/s)": round(tree.flow[i], 1), "V (m/s)": round(tree.v[i], 2),
+             "P_T to terminal (Pa)": round(tree.cum[i], 1),
+             "Surplus for damper (Pa)": round(fan_pa - tree.cum[i] - tree.terminal_pa[i], 1)}
+            for i in tree.order if tree.leaf[i] and i != tree.root]
+    return summary, data, [{"name": c, "id": c} for c in (data[0] if data else ["Terminal"])]
@@ -1,56 +1,19 @@
 # apps/pages/ductulator.py
-from dash import register_page, html, dcc, Input, Output, State, callback, no_update
+from dash import (register_page, html, dcc, dash_table, Input, Output, State, callback, clientside_callback,
+                  ClientsideFunction, no_update)
 from apps.shared.ui import BRAND, MUTED, BLACK, section_card, input_box
-import math
+from apps.shared.friction import MODES
+import base64
+import numpy as np
+import pandas as pd
+from apps.shared.ducts import (RHO_AIR, MU_AIR, ROUGHNESS_PRESETS, DUCT_LIMITS, TARGET_PA_M, JS_CONSTANTS,
+                               size_ducts, rect_equivalents, nearest_rect_for_flow,
+                               parse_schedule_csv, schedule_air, schedule_results)
+from apps.shared.air import air_props
 
 register_page(__name__, path="/ductulator", name="Ductulator")
 
-# ------------------ Physics helpers ------------------
-RHO_AIR = 1.2     # kg/m^3 @ ~20°C
-MU_AIR  = 1.8e-5  # Pa·s   @ ~20°C
-
-ROUGHNESS_PRESETS = {
-    "Galvanized steel (0.15 mm)": 0.00015,
-    "Spiral steel (0.09 mm)":     0.00009,
-    "Flexible duct (~1.0 mm)":    0.00100,
-    "Custom…":                    None,
-}
-
-def area_m2(shape: str, a_mm: float, b_mm: float | None = None) -> float:
-    if shape == "circular":
-        D = (a_mm or 0.0) / 1000.0
-        return math.pi * (D**2) / 4.0
-    a = (a_mm or 0.0) / 1000.0
-    b = (b_mm or 0.0) / 1000.0
-    return a * b
-
-def equiv_diameter_m(shape: str, a_mm: float, b_mm: float | None = None) -> float:
-    if shape == "circular":
-        return (a_mm or 0.0) / 1000.0
-    a = (a_mm or 0.0) / 1000.0
-    b = (b_mm or 0.0) / 1000.0
-    if a + b == 0:
-        return 0.0
-    # ASHRAE equal-friction equivalent diameter
-    return 1.30 * (a * b) ** 0.625 / (a + b) ** 0.25
-
-def velocity_ms(flow_ls: float, area: float) -> float:
-    Q = (flow_ls or 0.0) / 1000.0  # m³/s
-    return 0.0 if area <= 0 else Q / area
-
-def swamee_jain_f(Re: float, eps: float, D: float) -> float:
-    if Re <= 0 or D <= 0: return 0.0
-    if Re < 2000.0: return 64.0 / Re
-    term = (eps / (3.7 * D)) + (5.74 / (Re ** 0.9))
-    return 0.25 / (math.log10(term) ** 2)
-
-def duct_drop(flow_ls: float, area: float, D: float, *, eps=0.00015, rho=RHO_AIR, mu=MU_AIR, L=1.0):
-    """Return (Pa_per_m, Pa_total, V, Re, f) for straight duct."""
-    V  = velocity_ms(flow_ls, area)
-    Re = 0.0 if V == 0 else rho * V * D / mu
-    f  = swamee_jain_f(Re, eps, D)
-    pa_per_m = 0.0 if D == 0 else f * (rho * V * V) / (2.0 * D)
-    return pa_per_m, pa_per_m * L, V, Re, f
+BULK_PREVIEW_ROWS = 15
 
 # ------------------ UI helpers ------------------
 ROW_STYLE = {
@@ -117,7 +80,18 @@ layout = html.Div(
         form_row(label_with_hint("Custom roughness ε", "used only if Custom… selected"),
                  dcc.Input(id="du-rough-custom", type="number", value=0.15, step=0.01, style={"width": "200px"}), "mm"),
 
-        form_row(html.Div(html.B("Air density ρ")),
+        form_row(html.Div(html.B("Friction factor")),
+                 dcc.Dropdown(id="du-fmode",
+                              options=[{"label": v, "value": k} for k, v in MODES.items()],
+                              value="swamee_jain", clearable=False, style={"width": "200px"}), ""),
+
+        form_row(label_with_hint("Air temperature", "sets ρ and μ below (50 % RH)"),
+                 dcc.Input(id="du-temp", type="number", value=20.0, step=1, debounce=True,
+                           style={"width": "200px"}), "°C"),
+        form_row(label_with_hint("Altitude", "standard-atmosphere pressure"),
+                 dcc.Input(id="du-alt", type="number", value=0.0, step=50, debounce=True,
+                           style={"width": "200px"}), "m"),
+        form_row(label_with_hint("Air density ρ", "from temperature and altitude; editable"),
                  dcc.Input(id="du-rho", type="number", value=RHO_AIR, step=0.05, style={"width": "200px"}), "kg/m³"),
         form_row(label_with_hint("Dynamic viscosity μ", "~1.8×10⁻⁵ at 20 °C"),
                  dcc.Input(id="du-mu", type="number", value=MU_AIR, step=1e-6, style={"width": "200px"}), "Pa·s"),
@@ -126,10 +100,87 @@ layout = html.Div(
                     style={"padding": "8px 14px", "borderRadius": "8px", "border": "1px solid #ccc",
                            "background": "#f7f7f7", "marginTop": "8px"}),
 
+        dcc.Store(id="du-consts", data=JS_CONSTANTS),
         html.Div(id="du-results",
                  style={"marginTop": "16px", "padding": "14px", "border": "1px solid #e5e5e5",
                         "borderRadius": "10px", "maxWidth": "820px", "background": "#fafafa", "lineHeight": "1.6"}),
 
+        html.H2("Size a Duct"),
+        dcc.Markdown(
+            f"Enter a flow to get standard sizes inside the ductwork rules for the duty, ranked by "
+            f"closeness to the constant pressure gradient target of **{TARGET_PA_M:.1f} Pa/m**. "
+            "Roughness, friction factor, ρ and μ are taken from the form above."
+        ),
+        html.Div([
+            html.Span("Flow (L/s)"),
+            dcc.Input(id="du-size-flow", type="number", value=600, step=10, debounce=True, style={"width": "100px"}),
+            html.Span("Duty"),
+            dcc.Dropdown(id="du-size-duty", clearable=False, value="supply", style={"width": "170px"},
+                         options=[{"label": v[0], "value": k} for k, v in DUCT_LIMITS.items()]),
+            html.Span("Shape"),
+            dcc.Dropdown(id="du-size-shape", clearable=False, value="both", style={"width": "150px"},
+                         options=[{"label": "Circular", "value": "circular"},
+                                  {"label": "Rectangular", "value": "rectangular"},
+                                  {"label": "Either", "value": "both"}]),
+        ], style={"display": "flex", "alignItems": "center", "gap": "10px", "flexWrap": "wrap"}),
+        html.Div(id="du-size-status", style={"color": "#555", "margin": "6px 0"}),
+        dash_table.DataTable(
+            id="du-size-table", data=[], columns=[],
+            style_table={"overflowX": "auto", "maxWidth": "820px", "marginBottom": "24px"},
+            style_cell={"padding": "6px", "fontSize": "14px", "fontVariantNumeric": "tabular-nums"},
+            style_header={"backgroundColor": "#f7f7f7", "fontWeight": 600},
+        ),
+
+        html.H2("Rectangular Equivalents"),
+        dcc.Markdown(
+            "Standard rectangles (100–2500 mm in 50 mm steps, aspect ≤ 4) whose ASHRAE equivalent "
+            "diameter is within the tolerance of a round duct, and the smallest rectangle for a flow "
+            "at a friction limit."
+        ),
+        html.Div([
+            html.Span("Ø (mm)"),
+            dcc.Input(id="du-eq-d", type="number", value=350, step=5, debounce=True, style={"width": "90px"}),
+            html.Span("± (%)"),
+            dcc.Input(id="du-eq-tol", type="number", value=3, step=0.5, min=0, debounce=True, style={"width": "70px"}),
+            html.Span("Flow (L/s)"),
+            dcc.Input(id="du-eq-flow", type="number", value=600, step=10, debounce=True, style={"width": "90px"}),
+            html.Span("≤ Pa/m"),
+            dcc.Input(id="du-eq-dp", type="number", value=TARGET_PA_M, step=0.1, min=0.05, debounce=True,
+                      style={"width": "70px"}),
+        ], style={"display": "flex", "alignItems": "center", "gap": "10px", "flexWrap": "wrap"}),
+        html.Div(id="du-eq-nearest", style={"fontWeight": 600, "margin": "8px 0"}),
+        dash_table.DataTable(
+            id="du-eq-table", data=[], page_size=10,
+            columns=[{"name": c, "id": c} for c in ("Size (mm)", "Dₑ (mm)", "Aspect")],
+            style_table={"overflowX": "auto", "maxWidth": "500px", "marginBottom": "24px"},
+            style_cell={"padding": "6px", "fontSize": "14px", "fontVariantNumeric": "tabular-nums"},
+            style_header={"backgroundColor": "#f7f7f7", "fontWeight": 600},
+        ),
+
+        html.H2("Duct Schedule (CSV)"),
+        dcc.Markdown(
+            "Run a whole duct schedule through the same calculation. Columns: `flow_ls`, `shape` "
+            "(circular/rectangular), `diameter_mm` or `width_mm` and `height_mm`, and optionally "
+            "`id`, `length_m`, `temp_c` and `altitude_m`. Roughness and friction factor are taken from "
+            "the form above; rows with `temp_c` or `altitude_m` get their own air properties, the rest "
+            "use the form's ρ and μ."
+        ),
+        dcc.Upload(id="du-bulk-upload",
+                   children=html.Div(["Drop or ", html.A("select"), " a duct schedule CSV"]),
+                   style={"width": "100%", "maxWidth": "820px", "padding": "14px", "borderWidth": "1px",
+                          "borderStyle": "dashed", "borderRadius": "10px", "textAlign": "center"}),
+        html.Div(id="du-bulk-status", style={"color": "#555", "margin": "6px 0"}),
+        html.Button("Download results CSV", id="du-bulk-go", n_clicks=0, disabled=True,
+                    style={"padding": "8px 14px", "borderRadius": "8px", "border": "1px solid #ccc",
+                           "background": "#f7f7f7", "marginBottom": "8px"}),
+        dcc.Download(id="du-bulk-download"),
+        dash_table.DataTable(
+            id="du-bulk-table", data=[], columns=[],
+            style_table={"overflowX": "auto", "maxWidth": "820px", "marginBottom": "24px"},
+            style_cell={"padding": "6px", "fontSize": "14px", "fontVariantNumeric": "tabular-nums"},
+            style_header={"backgroundColor": "#f7f7f7", "fontWeight": 600},
+        ),
+
         html.H2("Pressure Calculation"),
         dcc.Markdown("Compute **fitting pressure loss**."),
 
@@ -172,35 +223,37 @@ def toggle_shape_rows(shape):
         return SHOW_ROW_STYLE, HIDE_ROW_STYLE, HIDE_ROW_STYLE
     return HIDE_ROW_STYLE, SHOW_ROW_STYLE, SHOW_ROW_STYLE
 
-# ------------------ Compute helpers ------------------
-def calc_pressure_loss(rho, v, k):
-    if rho is None or v is None or k is None:
-        return ""
-    rho = float(rho); v = float(v); k = float(k)
-    vp = 0.5 * rho * v * v
-    dp = k * vp
-    subtle = {"color": "#666", "marginLeft": "6px"}
-
-    return html.Div(
-        [
-            html.Div([
-                html.B("Velocity pressure = "),
-                html.Strong(f"{vp:,.2f} Pa"),
-                html.Span(f" ({vp/1000:.3f} kPa)", style=subtle),
-            ]),
-            html.Div([
-                html.B("Fitting loss = "),
-                html.Strong(f"{dp:,.2f} Pa"),
-                html.Span(f" ({dp/1000:.3f} kPa)", style=subtle),
-            ]),
-        ],
-        style={"lineHeight": "1.6", "margin": 0}
-    )
-# ------------------ Ductulator (button-triggered) ------------------
-# Also writes the computed velocity into the pressure card's velocity input.
+# ------------------ Air properties ------------------
 @callback(
+    Output("du-rho", "value"),
+    Output("du-mu", "value"),
+    Input("du-temp", "value"),
+    Input("du-alt", "value"),
+)
+def air_from_conditions(t_c, altitude_m):
+    try:
+        rho, mu = air_props(float(t_c), float(altitude_m or 0.0))
+    except (TypeError, ValueError):
+        return no_update, no_update
+    return round(rho, 4), float(f"{mu:.4g}")
+
+# ------------------ Compute helpers ------------------
+def roughness_m(preset, custom_mm):
+    eps = ROUGHNESS_PRESETS.get(preset)
+    if eps is None:
+        try:
+            eps = (float(custom_mm) or 0.0) / 1000.0
+        except Exception:
+            eps = 0.00015
+    return eps
+
+# ------------------ Ductulator and pressure card (browser-side) ------------------
+# Both run in apps/assets/ducts.js, which mirrors duct_drop and velocity_pressure; the
+# ductulator also writes its velocity into the pressure card's velocity input.
+clientside_callback(
+    ClientsideFunction(namespace="ducts", function_name="ductulator"),
     Output("du-results", "children"),
-    Output("vel-kvp", "value"),              # <— populate velocity field
+    Output("vel-kvp", "value"),
     Input("du-calc", "n_clicks"),
     State("du-flow", "value"),
     State("du-shape", "value"),
@@ -212,87 +265,162 @@ def calc_pressure_loss(rho, v, k):
     State("du-rough-custom", "value"),
     State("du-rho", "value"),
     State("du-mu", "value"),
+    State("du-fmode", "value"),
+    State("du-consts", "data"),
     prevent_initial_call=True,
 )
-def compute_ductulator(n_clicks,
-                       flow_ls, shape, diam_mm, width_mm, height_mm, length_m,
-                       rough_preset, rough_custom_mm, rho, mu):
-
-    # Validate basics
-    try:
-        flow_ls = float(flow_ls or 0)
-        length_m = float(length_m or 0)
-        rho = float(rho or RHO_AIR)
-        mu  = float(mu  or MU_AIR)
-    except Exception:
-        return "Please enter valid numeric values.", no_update
-
-    # Geometry
-    if shape == "circular":
-        if not diam_mm:
-            return "Enter a diameter.", no_update
-        A = area_m2("circular", float(diam_mm))
-        D = equiv_diameter_m("circular", float(diam_mm))
-        dims_label = f"Ø {float(diam_mm):.0f} mm"
-    else:
-        if not (width_mm and height_mm):
-            return "Enter width and height.", no_update
-        A = area_m2("rectangular", float(width_mm), float(height_mm))
-        D = equiv_diameter_m("rectangular", float(width_mm), float(height_mm))
-        dims_label = f"{float(width_mm):.0f} × {float(height_mm):.0f} mm"
-
-    # Roughness selection (convert custom mm -> m)
-    eps = ROUGHNESS_PRESETS.get(rough_preset)
-    if eps is None:
-        try:
-            eps = (float(rough_custom_mm) or 0.0) / 1000.0
-        except Exception:
-            eps = 0.00015
-
-    # Calculations
-    pa_m, pa_total, V, Re, f = duct_drop(flow_ls, A, D, eps=eps, rho=rho, mu=mu, L=length_m)
-    VP = 0.5 * rho * V * V
 
-    def fmt(v, unit="", d=3):
-        try:
-            return f"{v:.{d}f} {unit}".rstrip()
-        except Exception:
-            return str(v)
-
-    duct_div = html.Div([
-        html.Div([html.B("Inputs")]),
-        html.Ul([
-            html.Li(f"Flow: {fmt(flow_ls, 'L/s', 1)}"),
-            html.Li(f"Shape & size: {dims_label}"),
-            html.Li(f"Length: {fmt(length_m, 'm', 2)}"),
-            html.Li(f"Roughness ε: {fmt(eps*1000, 'mm', 3)} ({rough_preset})"),
-            html.Li(f"Air ρ: {fmt(rho, 'kg/m³', 3)}   •   μ: {mu:g} Pa·s"),
-        ]),
-        html.Hr(),
-        html.Div([html.B("Results")]),
-        html.Ul([
-            html.Li(f"Area A: {fmt(A, 'm²', 4)}"),
-            html.Li(f"Equivalent diameter Dₑ: {fmt(D*1000, 'mm', 1)}"),
-            html.Li(f"Velocity V: {fmt(V, 'm/s', 3)}"),
-            html.Li(f"Reynolds number Re: {Re:,.0f}"),
-            html.Li(f"Friction factor f: {fmt(f, '', 5)}"),
-            html.Li(f"Velocity pressure VP = ½ρV²: {fmt(VP, 'Pa', 2)}"),
-            html.Li(f"Friction rate Δp/L: {fmt(pa_m, 'Pa/m', 3)}"),
-            html.Li(f"Total straight loss Δp = (Δp/L)·L: {fmt(pa_total, 'Pa', 2)}"),
-        ]),
-        html.Div("Note: straight-duct result only. Add fitting losses separately using K·VP."),
-    ])
-
-    # Return results and set the velocity field for the pressure card
-    return duct_div, round(V, 3)
-
-# ------------------ Pressure calc (live) ------------------
-# Live update as ρ, v, or K changes (no button needed)
-@callback(
+clientside_callback(
+    ClientsideFunction(namespace="ducts", function_name="pressure_loss"),
     Output("pressure-kvp", "children"),
     Input("rho-kvp", "value"),
     Input("vel-kvp", "value"),
     Input("k-kvp", "value"),
 )
-def live_pressure(rho_kvp, v_kvp, k_kvp):
-    return calc_pressure_loss(rho_kvp, v_kvp, k_kvp)
+
+# ------------------ Size a duct ------------------
+@callback(
+    Output("du-size-status", "children"),
+    Output("du-size-table", "data"),
+    Output("du-size-table", "columns"),
+    Input("du-size-flow", "value"),
+    Input("du-size-duty", "value"),
+    Input("du-size-shape", "value"),
+    Input("du-rough-preset", "value"),
+    Input("du-rough-custom", "value"),
+    Input("du-rho", "value"),
+    Input("du-mu", "value"),
+    Input("du-fmode", "value"),
+)
+def size_duct(flow_ls, duty, shape, rough_preset, rough_custom_mm, rho, mu, fmode):
+    try:
+        flow_ls = float(flow_ls)
+        rho, mu = float(rho or RHO_AIR), float(mu or MU_AIR)
+    except (TypeError, ValueError):
+        return "Enter a flow.", [], []
+    if flow_ls <= 0:
+        return "Enter a flow above 0 L/s.", [], []
+    label, max_dp, max_v = DUCT_LIMITS[duty]
+    res = size_ducts(flow_ls, duty, shape=shape, k=8, eps=roughness_m(rough_preset, rough_custom_mm),
+                     rho=rho, mu=mu, mode=fmode if fmode in MODES else "swamee_jain")
+    limits = f"≤ {max_v:.1f} m/s" + ("" if max_dp == float("inf") else f" and ≤ {max_dp:.1f} Pa/m")
+    n = int(res["ok"][0].sum())
+    if not n:
+        return f"No standard size meets the {label.lower()} limits ({limits}).", [], []
+    rows = [{"Rank": i + 1,
+             "Size": f"Ø {a:.0f}" if c else f"{a:.0f} × {b:.0f}",
+             "Dₑ (mm)": round(de, 1), "V (m/s)": round(v, 2), "Δp/L (Pa/m)": round(dp, 3)}
+            for i, (c, a, b, de, v, dp) in enumerate(zip(res["circular"][0][:n], res["a_mm"][0][:n],
+                                                         res["b_mm"][0][:n], res["de_mm"][0][:n],
+                                                         res["v"][0][:n], res["pa_m"][0][:n]))]
+    return (f"{label}: {limits}, target {TARGET_PA_M:.1f} Pa/m", rows,
+            [{"name": c, "id": c} for c in rows[0]])
+
+# ------------------ Rectangular equivalents ------------------
+@callback(
+    Output("du-eq-table", "data"),
+    Input("du-eq-d", "value"),
+    Input("du-eq-tol", "value"),
+)
+def rect_equivalent_table(d_mm, tol):
+    try:
+        d_mm, tol = float(d_mm), max(float(tol or 0.0), 0.0)
+    except (TypeError, ValueError):
+        return []
+    if d_mm <= 0:
+        return []
+    eq = rect_equivalents(d_mm, tol)
+    return [{"Size (mm)": f"{w:.0f} × {h:.0f}", "Dₑ (mm)": round(de, 1), "Aspect": round(r, 2)}
+            for w, h, de, r in zip(eq["width_mm"], eq["height_mm"], eq["de_mm"], eq["aspect"])]
+
+@callback(
+    Output("du-eq-nearest", "children"),
+    Input("du-eq-flow", "value"),
+    Input("du-eq-dp", "value"),
+    Input("du-rough-preset", "value"),
+    Input("du-rough-custom", "value"),
+    Input("du-rho", "value"),
+    Input("du-mu", "value"),
+    Input("du-fmode", "value"),
+)
+def nearest_rect(flow_ls, max_dp, rough_preset, rough_custom_mm, rho, mu, fmode):
+    try:
+        flow_ls, max_dp = float(flow_ls), float(max_dp)
+        rho, mu = float(rho or RHO_AIR), float(mu or MU_AIR)
+    except (TypeError, ValueError):
+        return "Enter a flow and a friction limit."
+    if flow_ls <= 0 or max_dp <= 0:
+        return "Enter a flow and a friction limit above 0."
+    r = nearest_rect_for_flow(flow_ls, max_dp, eps=roughness_m(rough_preset, rough_custom_mm), rho=rho, mu=mu,
+                              mode=fmode if fmode in MODES else "swamee_jain")
+    if np.isnan(r["de_mm"][0]):
+        return f"No standard rectangle carries {flow_ls:,.0f} L/s at ≤ {max_dp:g} Pa/m."
+    return (f"Smallest rectangle for {flow_ls:,.0f} L/s at ≤ {max_dp:g} Pa/m: "
+            f"{r['width_mm'][0]:.0f} × {r['height_mm'][0]:.0f} mm (Dₑ {r['de_mm'][0]:.0f} mm, "
+            f"{r['v'][0]:.2f} m/s, {r['pa_m'][0]:.3f} Pa/m)")
+
+# ------------------ Duct schedule (CSV in, CSV out) ------------------
+def _bulk_results(contents, rough_preset, rough_custom_mm, rho, mu, fmode, t_c, altitude_m):
+    df = parse_schedule_csv(base64.b64decode(contents.split(",", 1)[1]).decode("utf-8-sig"))
+    try:
+        rho, mu = float(rho or RHO_AIR), float(mu or MU_AIR)
+    except (TypeError, ValueError):
+        rho, mu = RHO_AIR, MU_AIR
+    try:
+        t_c, altitude_m = float(t_c), float(altitude_m or 0.0)
+    except (TypeError, ValueError):
+        t_c, altitude_m = 20.0, 0.0
+    rho, mu = schedule_air(df, rho, mu, t_c, altitude_m)
+    return schedule_results(df, eps=roughness_m(rough_preset, rough_custom_mm), rho=rho, mu=mu,
+                            mode=fmode if fmode in MODES else "swamee_jain")
+
+@callback(
+    Output("du-bulk-status", "children"),
+    Output("du-bulk-table", "data"),
+    Output("du-bulk-table", "columns"),
+    Output("du-bulk-go", "disabled"),
+    Input("du-bulk-upload", "contents"),
+    State("du-bulk-upload", "filename"),
+    State("du-rough-preset", "value"),
+    State("du-rough-custom", "value"),
+    State("du-rho", "value"),
+    State("du-mu", "value"),
+    State("du-fmode", "value"),
+    State("du-temp", "value"),
+    State("du-alt", "value"),
+    prevent_initial_call=True,
+)
+def preview_schedule(contents, filename, rough_preset, rough_custom_mm, rho, mu, fmode, t_c, altitude_m):
+    if not contents:
+        return "", [], [], True
+    try:
+        out = _bulk_results(contents, rough_preset, rough_custom_mm, rho, mu, fmode, t_c, altitude_m)
+    except Exception as e:
+        return f"Could not read {filename}: {e}", [], [], True
+    bad = int(out["loss_pa"].isna().sum())
+    status = f"{filename}: {len(out):,} ducts" + (f", {bad:,} missing a flow or size" if bad else "")
+    head = out.head(BULK_PREVIEW_ROWS).round({"area_m2": 4, "de_mm": 1, "velocity_ms": 2, "re": 0,
+                                              "f": 5, "vp_pa": 2, "pa_per_m": 3, "loss_pa": 1})
+    head = head.astype(object).where(head.notna(), None)
+    return status, head.to_dict("records"), [{"name": c, "id": c} for c in head.columns], False
+
+@callback(
+    Output("du-bulk-download", "data"),
+    Input("du-bulk-go", "n_clicks"),
+    State("du-bulk-upload", "contents"),
+    State("du-bulk-upload", "filename"),
+    State("du-rough-preset", "value"),
+    State("du-rough-custom", "value"),
+    State("du-rho", "value"),
+    State("du-mu", "value"),
+    State("du-fmode", "value"),
+    State("du-temp", "value"),
+    State("du-alt", "value"),
+    prevent_initial_call=True,
+)
+def download_schedule(n_clicks, contents, filename, rough_preset, rough_custom_mm, rho, mu, fmode, t_c, altitude_m):
+    if not contents:
+        return no_update
+    out = _bulk_results(contents, rough_preset, rough_custom_mm, rho, mu, fmode, t_c, altitude_m)
+    stem = (filename or "ducts.csv").rsplit(".", 1)[0]
+    return dcc.send_data_frame(out.to_csv, f"{stem}-results.csv", index=False, float_format="%.6g")
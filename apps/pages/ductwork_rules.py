@@ -2,17 +2,23 @@
 from dash import register_page, html, dcc, Input, Output, State, callback, no_update, dash_table
 from apps.shared.ui import BRAND, MUTED, BLACK, section_card, input_box
 import math
+from apps.shared.ducts import DUCT_LIMITS
 
 register_page(__name__, path="/ductwork-rules", name="ductwork-rules")
 
 
 # ---------------- Data ----------------
+def _limit_rule(duty):
+    # the duct sizing solver reads the same numbers
+    _, max_dp, max_v = DUCT_LIMITS[duty]
+    return f"{max_v:.1f} m/s" if math.isinf(max_dp) else f"≤ {max_dp:.1f} Pa/m friction (to a maximum of {max_v:.1f} m/s)"
+
 ROWS = [
-    {"Item": "Ductwork – Supply",                                  "Rule": "≤ 1.2 Pa/m friction (to a maximum of 7.0 m/s)"},
-    {"Item": "Ductwork – Return",                                  "Rule": "≤ 1.2 Pa/m friction (to a maximum of 6.5 m/s)"},
+    {"Item": "Ductwork – Supply",                                  "Rule": _limit_rule("supply")},
+    {"Item": "Ductwork – Return",                                  "Rule": _limit_rule("return")},
     {"Item": "Ductwork – Return (behind R/A grille)",              "Rule": "3.0 m/s (check noise level in manufacturer literature)"},
-    {"Item": "Ductwork – Exhaust",                                 "Rule": "6.5 m/s"},
-    {"Item": "Ductwork – Flexible Supply",                         "Rule": "3.5 m/s"},
+    {"Item": "Ductwork – Exhaust",                                 "Rule": _limit_rule("exhaust")},
+    {"Item": "Ductwork – Flexible Supply",                         "Rule": _limit_rule("flexible")},
     {"Item": "Neck velocity for supply air register",              "Rule": "2.5 m/s"},
     {"Item": "Coil face velocity – Cooling",                       "Rule": "2.25 m/s (check pressure in manufacturer literature)"},
     {"Item": "Coil face velocity – Heating",                       "Rule": "3.5 m/s (check pressure in manufacturer literature)"},
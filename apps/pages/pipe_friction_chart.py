@@ -1,11 +1,16 @@
 # apps/pages/pipe_friction_chart.py
+from functools import lru_cache
 import numpy as np
 import plotly.graph_objects as go
-from dash import register_page, html, dcc, Input, Output, State, callback, ctx, no_update
-from CoolProp.CoolProp import PropsSI
+from dash import register_page, html, dcc, dash_table, Input, Output, State, callback, ctx, no_update, Patch
+from apps.shared import fluids
+from apps.shared.pipes import PIPE_SERIES, friction_factor, dp_per_m_for_diameter, size_pipes
+from apps.shared.friction import MODES
 
 register_page(__name__, path="/pipe-friction-chart", name="Pipe Friction Chart")
 
+fluids.water_table()  # build the ρ/μ table once at startup; slider ticks only interpolate
+
 PIPE_IDS_M = {"DN15":0.0138,"DN20":0.0180,"DN25":0.0235,"DN32":0.0300,"DN40":0.0368,"DN50":0.0476}
 
 ROUGHNESS_PRESETS_MM = {
@@ -20,35 +25,26 @@ ROUGHNESS_PRESETS_MM = {
     "Custom…"                     : None,
 }
 
-def friction_factor(Re, eps, D):
-    Re = np.asarray(Re); f = np.empty_like(Re, float)
-    lam = Re < 2300
-    f[lam] = 64.0 / np.maximum(Re[lam], 1e-9)
-    tur = ~lam
-    term = (eps/(3.7*D))**1.11 + 6.9/np.maximum(Re[tur],1.0)
-    f[tur] = (-1.8*np.log10(term))**-2
-    return f
-
-def dp_per_m_for_diameter(Q_m3s, D, rho, mu, eps):
-    A = np.pi*(D**2)/4.0
-    v = Q_m3s/A
-    Re = rho*v*D/mu
-    f  = friction_factor(Re, eps, D)
-    return f*(rho*v*v)/(2.0*D)
-
-def make_figure(selected_sizes, T_C, eps_m):
-    T_K = T_C + 273.15
-    rho = PropsSI("D","T",T_K,"P",101325,"Water")
-    mu  = PropsSI("V","T",T_K,"P",101325,"Water")
+FIGURE_CACHE_SIZE = 64
+
+T_SLIDER = (-20, 60)
+
+def make_figure(selected_sizes, T_C, eps_m, fluid="Water", conc=0, mode="haaland"):
+    rho, mu = (float(x) for x in fluids.props(T_C, fluid, conc))
     Q_ls  = np.logspace(-1.3, 2.0, 220)
     Q_m3s = Q_ls/1000.0
     fig = go.Figure()
     for label in selected_sizes:
         D = PIPE_IDS_M[label]
-        dpL = dp_per_m_for_diameter(Q_m3s, D, rho, mu, eps_m)
+        dpL = dp_per_m_for_diameter(Q_m3s, D, rho, mu, eps_m, mode)
         fig.add_trace(go.Scatter(x=Q_ls, y=dpL, mode="lines",
                                  name=f"{label} (ID={D*1000:.1f} mm)",
                                  hovertemplate="Q=%{x:.3g} L/s<br>Δp/L=%{y:.3g} Pa/m<extra></extra>"))
+    # state point placeholder, always last, filled via Patch
+    fig.add_trace(go.Scatter(x=[], y=[], mode="markers",
+                             marker=dict(size=10, symbol="x"),
+                             name="State point",
+                             hovertemplate="Q=%{x:.3g} L/s<br>Δp/L=%{y:.3g} Pa/m<extra></extra>"))
     fig.update_layout(
         xaxis=dict(type="log", title="Flow Q (L/s)"),
         yaxis=dict(type="log", title="Pressure drop Δp/L (Pa/m)"),
@@ -57,9 +53,49 @@ def make_figure(selected_sizes, T_C, eps_m):
     )
     return fig, rho, mu
 
+@lru_cache(maxsize=FIGURE_CACHE_SIZE)
+def base_figure(sizes, T_C, eps_mm, fluid="Water", conc=0, mode="haaland"):
+    """Curves for one (sizes, temperature, roughness, fluid, friction mode) key — built once,
+    then reused. Returns (plotly JSON dict, ρ, μ); callers must copy before mutating."""
+    fig, rho, mu = make_figure(sizes, T_C, eps_mm*1e-3, fluid, conc, mode)
+    return fig.to_plotly_json(), rho, mu
+
+def _chart_key(sizes, T_C, eps_mm, fluid, conc):
+    # slider resolution: 1 °C and 0.0001 mm; sizes in catalogue order
+    sizes = tuple(k for k in PIPE_IDS_M if k in (sizes or PIPE_IDS_M))
+    fluid = fluid if fluid in fluids.FLUIDS else "Water"
+    conc = 0 if fluid == "Water" else int(conc or 30)
+    T = float(round(10.0 if T_C is None else T_C))
+    T = max(T, float(int(np.ceil(fluids.liquid_range(fluid, conc)[0] - 0.05))))
+    eps = round(0.0460 if eps_mm is None else eps_mm, 4)
+    return sizes, T, eps, fluid, conc
+
+def fluid_label(fluid, conc):
+    return "Water" if fluid == "Water" else f"{conc} % {fluids.FLUIDS[fluid][0].lower()}"
+
+def point_overlay(sizes, Q_in, dp_in, rho, mu, eps_m, mode="haaland"):
+    """(state-point x, y, readout) for the current Q / Δp inputs."""
+    if not (Q_in and dp_in and Q_in > 0 and dp_in > 0):
+        props = f"ρ = {rho:.1f} kg/m³ · μ = {mu*1e3:.2f} mPa·s"
+        return [], [], html.Div(props, style={"color":"#555","marginTop":"6px"})
+
+    D = np.array([PIPE_IDS_M[k] for k in sizes])
+    v = (Q_in/1000.0)/(np.pi*D**2/4.0)
+    dp_m = friction_factor(rho*v*D/mu, eps_m, D, mode)*(rho*v*v)/(2.0*D)
+    header = html.Thead(html.Tr([html.Th("Size"), html.Th("ID (mm)"),
+                                 html.Th("Velocity (m/s)"), html.Th("Δp/L (Pa/m)"),
+                                 html.Th("Δp (kPa/100 m)")]))
+    rows = [html.Tr([html.Td(label), html.Td(f"{d*1000:.1f}"),
+                     html.Td(f"{vi:.2f}"), html.Td(f"{dpi:,.0f}"),
+                     html.Td(f"{dpi*100/1000:.1f}")])
+            for label, d, vi, dpi in zip(sizes, D, v, dp_m)]
+    table = html.Table([header, html.Tbody(rows)],
+                       style={"borderCollapse":"collapse","marginTop":"10px","width":"100%","maxWidth":"900px"})
+    return [Q_in], [dp_in], table
+
 # --------------- Layout ---------------
 layout = html.Div(style={"padding":"16px"}, children=[
-    html.H2("Interactive Pipe Friction Chart — Water"),
+    html.H2("Interactive Pipe Friction Chart"),
 
     html.Div([
         html.Label("Pipe sizes"),
@@ -69,10 +105,19 @@ layout = html.Div(style={"padding":"16px"}, children=[
         html.Div(style={"height":"8px"}),
 
         html.Div([
-            html.Label("Water temperature (°C)"),
+            html.Label("Fluid", style={"marginRight":"10px"}),
+            dcc.Dropdown(id="fluid", clearable=False, value="Water", style={"width":"220px"},
+                         options=[{"label":lbl,"value":k} for k, (lbl, _, _) in fluids.FLUIDS.items()]),
+            html.Label("Concentration (% mass)", style={"margin":"0 10px 0 14px"}),
+            dcc.Dropdown(id="conc", clearable=False, value=30, disabled=True, style={"width":"100px"},
+                         options=[{"label":f"{c} %","value":c} for c in fluids.CONCENTRATIONS]),
+        ], style={"display":"flex","alignItems":"center","marginBottom":"8px"}),
+
+        html.Div([
+            html.Label("Fluid temperature (°C)"),
             html.Div([
-                dcc.Slider(id="temp", min=0, max=60, step=1, value=10,
-                           marks={i:str(i) for i in range(0,61,10)}, included=False),
+                dcc.Slider(id="temp", min=0, max=T_SLIDER[1], step=1, value=10,
+                           marks={i:str(i) for i in range(T_SLIDER[0],T_SLIDER[1]+1,10)}, included=False),
                 html.Div(id="temp-readout", style={"minWidth":"260px","textAlign":"right","color":"#555"})
             ], style={"display":"grid","gridTemplateColumns":"1fr auto","alignItems":"center","gap":"12px"}),
         ]),
@@ -92,6 +137,12 @@ layout = html.Div(style={"padding":"16px"}, children=[
             html.Div(id="eps-readout", style={"minWidth":"220px","textAlign":"right","color":"#555"})
         ], style={"display":"grid","gridTemplateColumns":"1fr auto","alignItems":"center","gap":"12px"}),
 
+        html.Div([
+            html.Label("Friction factor", style={"marginRight":"10px"}),
+            dcc.Dropdown(id="pipe-fmode", clearable=False, value="haaland", style={"width":"260px"},
+                         options=[{"label":lbl,"value":k} for k, lbl in MODES.items()]),
+        ], style={"display":"flex","alignItems":"center","marginTop":"8px"}),
+
         html.Div(style={"height":"8px"}),
 
         html.Label("Overlay a state point"),
@@ -107,9 +158,31 @@ layout = html.Div(style={"padding":"16px"}, children=[
     ], style={"maxWidth":"1100px"}),
 
     dcc.Graph(id="pipe-chart", style={"height":"700px"}),
+
+    # Sizing from the catalogue: smallest size meeting both limits, for one or many flows
+    html.H3("Size pipes"),
+    html.Div([
+        dcc.Dropdown(id="size-series", clearable=False, value="steel", style={"width":"280px"},
+                     options=[{"label":lbl,"value":k} for k, (lbl, _, _) in PIPE_SERIES.items()]),
+        html.Span("Flows (L/s)"),
+        dcc.Input(id="size-flows", type="text", value="0.5, 2, 8, 25", debounce=True,
+                  style={"width":"240px"}),
+        html.Span("max Δp/L (Pa/m)"),
+        dcc.Input(id="size-maxdp", type="number", value=250.0, step=10.0, style={"width":"90px"}),
+        html.Span("max v (m/s)"),
+        dcc.Input(id="size-maxv", type="number", value=1.5, step=0.1, style={"width":"80px"}),
+    ], style={"display":"flex","alignItems":"center","gap":"10px","flexWrap":"wrap","maxWidth":"1100px"}),
+    html.Div("Uses the fluid and temperature above; roughness is the series' own.",
+             id="size-status", style={"color":"#555","marginTop":"6px"}),
+    dash_table.DataTable(
+        id="size-table", data=[], page_size=20,
+        style_table={"overflowX":"auto","maxWidth":"900px","marginTop":"8px"},
+        style_cell={"padding":"6px","fontSize":"14px","fontVariantNumeric":"tabular-nums"},
+        style_header={"backgroundColor":"#f7f7f7","fontWeight":600},
+    ),
 ])
 
-# --------------- Main chart callback (returns 4 outputs) ---------------
+# --------------- Base chart: curves change only with sizes / temperature / roughness ---------------
 @callback(
     Output("pipe-chart", "figure"),
     Output("point-readout", "children"),
@@ -118,45 +191,97 @@ layout = html.Div(style={"padding":"16px"}, children=[
     Input("sizes", "value"),
     Input("temp", "value"),
     Input("eps", "value"),
-    Input("Q_in", "value"),
-    Input("dp_in", "value"),
+    Input("fluid", "value"),
+    Input("conc", "value"),
+    Input("pipe-fmode", "value"),
+    State("Q_in", "value"),
+    State("dp_in", "value"),
 )
-def draw_chart(sizes, T_C, eps_mm, Q_in, dp_in):
-    sizes = sizes or list(PIPE_IDS_M)
-    eps_m = (eps_mm or 0.0460) * 1e-3
-    fig, rho, mu = make_figure(sizes, T_C or 10.0, eps_m)
+def draw_chart(sizes, T_C, eps_mm, fluid, conc, mode, Q_in, dp_in):
+    sizes, T_C, eps_mm, fluid, conc = _chart_key(sizes, T_C, eps_mm, fluid, conc)
+    mode = mode if mode in MODES else "haaland"
+    base, rho, mu = base_figure(sizes, T_C, eps_mm, fluid, conc, mode)
+    x, y, readout = point_overlay(sizes, Q_in, dp_in, rho, mu, eps_mm*1e-3, mode)
+    data = list(base["data"])
+    data[-1] = {**data[-1], "x": x, "y": y}
+    fig = {**base, "data": data}
 
-    temp_text = f"{(T_C or 10):.0f} °C  ·  ρ = {rho:.1f} kg/m³  ·  μ = {mu*1e3:.2f} mPa·s"
+    temp_text = f"{fluid_label(fluid, conc)} at {T_C:.0f} °C  ·  ρ = {rho:.1f} kg/m³  ·  μ = {mu*1e3:.2f} mPa·s"
     eps_text  = f"ε = {eps_mm:.4f} mm"
+    return fig, readout, temp_text, eps_text
 
-    # No point → just return props
-    if not (Q_in and dp_in and Q_in > 0 and dp_in > 0):
-        props = f"ρ = {rho:.1f} kg/m³ · μ = {mu*1e3:.2f} mPa·s (water at {T_C or 10:.0f} °C)"
-        return fig, html.Div(props, style={"color":"#555","marginTop":"6px"}), temp_text, eps_text
-
-    # Overlay state point + size table
-    fig.add_trace(go.Scatter(x=[Q_in], y=[dp_in], mode="markers",
-                             marker=dict(size=10, symbol="x"),
-                             name="State point",
-                             hovertemplate="Q=%{x:.3g} L/s<br>Δp/L=%{y:.3g} Pa/m<extra></extra>"))
+# --------------- Overlay: Q / Δp only move the marker and refresh the table ---------------
+@callback(
+    Output("pipe-chart", "figure", allow_duplicate=True),
+    Output("point-readout", "children", allow_duplicate=True),
+    Input("Q_in", "value"),
+    Input("dp_in", "value"),
+    State("sizes", "value"),
+    State("temp", "value"),
+    State("eps", "value"),
+    State("fluid", "value"),
+    State("conc", "value"),
+    State("pipe-fmode", "value"),
+    prevent_initial_call=True,
+)
+def draw_point(Q_in, dp_in, sizes, T_C, eps_mm, fluid, conc, mode):
+    sizes, T_C, eps_mm, fluid, conc = _chart_key(sizes, T_C, eps_mm, fluid, conc)
+    mode = mode if mode in MODES else "haaland"
+    _, rho, mu = base_figure(sizes, T_C, eps_mm, fluid, conc, mode)
+    x, y, readout = point_overlay(sizes, Q_in, dp_in, rho, mu, eps_mm*1e-3, mode)
+    fig = Patch()
+    fig["data"][len(sizes)]["x"] = x
+    fig["data"][len(sizes)]["y"] = y
+    return fig, readout
 
-    qs = (Q_in or 0)/1000.0
-    header = html.Thead(html.Tr([html.Th("Size"), html.Th("ID (mm)"),
-                                 html.Th("Velocity (m/s)"), html.Th("Δp/L (Pa/m)"),
-                                 html.Th("Δp (kPa/100 m)")]))
-    rows = []
-    for label in sizes:
-        D = PIPE_IDS_M[label]; A = np.pi*(D**2)/4.0
-        v = qs/A if A>0 else 0.0
-        Re = rho*v*D/mu; f = friction_factor(Re, eps_m, D)
-        dp_m = f*(rho*v*v)/(2.0*D)
-        rows.append(html.Tr([html.Td(label), html.Td(f"{D*1000:.1f}"),
-                             html.Td(f"{v:.2f}"), html.Td(f"{dp_m:,.0f}"),
-                             html.Td(f"{dp_m*100/1000:.1f}")]))
-    table = html.Table([header, html.Tbody(rows)],
-                       style={"borderCollapse":"collapse","marginTop":"10px","width":"100%","maxWidth":"900px"})
+# --------------- Catalogue sizing ---------------
+@callback(
+    Output("size-table", "data"),
+    Output("size-table", "columns"),
+    Output("size-status", "children"),
+    Input("size-series", "value"),
+    Input("size-flows", "value"),
+    Input("size-maxdp", "value"),
+    Input("size-maxv", "value"),
+    Input("temp", "value"),
+    Input("fluid", "value"),
+    Input("conc", "value"),
+    Input("pipe-fmode", "value"),
+)
+def size_table(series, flows, max_dp, max_v, T_C, fluid, conc, mode):
+    try:
+        Q = np.array([float(x) for x in str(flows or "").replace(";", ",").split(",") if x.strip()])
+    except ValueError:
+        return [], [], "Flows must be numbers separated by commas."
+    if not len(Q) or (Q <= 0).any() or not (max_dp and max_v and max_dp > 0 and max_v > 0):
+        return [], [], "Enter positive flows and limits."
+    _, T_C, _, fluid, conc = _chart_key(None, T_C, None, fluid, conc)
+    rho, mu = (float(x) for x in fluids.props(T_C, fluid, conc))
+    res = size_pipes(Q, series, rho, mu, max_dp=max_dp, max_v=max_v,
+                     mode=mode if mode in MODES else "haaland")
+    rows = [{"Q (L/s)": round(q, 3), "Size": str(sz), "ID (mm)": round(d, 1), "v (m/s)": round(v, 2),
+             "Δp/L (Pa/m)": round(dp, 0), "Note": "" if ok else "exceeds limits at largest size"}
+            for q, sz, d, v, dp, ok in zip(Q, res["size"], res["id_mm"], res["v"], res["dp"], res["ok"])]
+    cols = [{"name": k, "id": k} for k in rows[0]]
+    status = (f"{PIPE_SERIES[series][0]} · {fluid_label(fluid, conc)} at {T_C:.0f} °C · "
+              f"limits {max_dp:g} Pa/m and {max_v:g} m/s")
+    return rows, cols, status
 
-    return fig, table, temp_text, eps_text
+# --------------- Fluid → concentration and temperature limits ---------------
+@callback(
+    Output("conc", "disabled"),
+    Output("temp", "min"),
+    Output("temp", "value"),
+    Input("fluid", "value"),
+    Input("conc", "value"),
+    State("temp", "value"),
+)
+def sync_fluid(fluid, conc, T_C):
+    glycol = fluid != "Water"
+    # slider stops at the first whole degree above freezing
+    t_min = max(T_SLIDER[0], int(np.ceil(fluids.liquid_range(fluid, conc if glycol else 0)[0] - 0.05)))
+    T_C = 10 if T_C is None else T_C
+    return not glycol, t_min, T_C if T_C >= t_min else t_min
 
 # --------------- Sync preset <-> slider (single callback, no cycle) ---------------
 @callback(
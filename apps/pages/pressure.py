@@ -1,14 +1,16 @@
 # apps/pages/pressure.py
-from dash import register_page, html, dcc, Input, Output, callback
+import base64
+import pandas as pd
+from dash import register_page, html, dcc, dash_table, Input, Output, callback
 from textwrap import dedent
 
 # Remove if not in your project
 from apps.shared.ui import BLACK
+from apps.shared.hydrostatics import G as g, static_pressure
+from apps.shared import pipe_tree
 
 register_page(__name__, path="/pressure", name="Water Pressure")
 
-g = 9.81  # m/s^2
-
 layout = html.Div(
     style={"width": "100%", "padding": "16px", "fontFamily": "Segoe UI, Inter, Arial", "color": BLACK},
     children=[
@@ -105,6 +107,36 @@ layout = html.Div(
                      mathjax=False, style={"marginBottom": "6px", "textAlign": "left"}),
         dcc.Markdown(r"$$\Delta p_v = 500\,(3.5^2 - 3.0^2) = 1625\ \mathrm{Pa} = 1.625\ \mathrm{kPa}$$",
                      mathjax=True, style={"marginBottom": "0px", "textAlign": "left"}),
+
+        # ----- Distribution tree: index circuit -----
+        html.H2("Index Circuit", style={"marginTop": "24px"}),
+        dcc.Markdown(
+            "For a branched distribution the pump must overcome the losses to the **index terminal**: "
+            "the terminal with the largest pipe and fitting losses from the plant plus its own coil and "
+            "valve loss. Every other terminal has surplus pressure to be taken up by its balancing valve.",
+            style={"marginBottom": "8px", "textAlign": "justify"},
+        ),
+        dcc.Upload(id="tree-upload",
+                   children=html.Div(["Drop or ", html.A("select"), " a pipe tree CSV (node, parent, length_m, "
+                                      "id_mm, k, demand_ls, terminal_kpa, elevation_m)"]),
+                   style={"width": "100%", "maxWidth": "900px", "padding": "14px", "borderWidth": "1px",
+                          "borderStyle": "dashed", "borderRadius": "10px", "textAlign": "center"}),
+        dcc.Store(id="tree-data", data=pipe_tree.SAMPLE_TREE.to_dict("records")),
+        html.Div("Using the sample two-riser tree until a CSV is loaded.",
+                 id="tree-status", style={"color": "#555", "margin": "6px 0"}),
+        html.Div([
+            html.Span("Tank level Z_H (m)"),
+            dcc.Input(id="tree-zh", type="number", value=20.0, step=0.5, style={"width": "90px"}),
+            dcc.Checklist(id="tree-return", value=["x2"],
+                          options=[{"label": " Direct-return pipework (double the pipe losses)", "value": "x2"}]),
+        ], style={"display": "flex", "alignItems": "center", "gap": "10px", "flexWrap": "wrap"}),
+        html.Div(id="tree-summary", style={"fontWeight": 600, "margin": "10px 0"}),
+        dash_table.DataTable(
+            id="tree-table", data=[], page_size=15, sort_action="native",
+            style_table={"overflowX": "auto", "maxWidth": "900px"},
+            style_cell={"padding": "6px", "fontSize": "14px", "fontVariantNumeric": "tabular-nums"},
+            style_header={"backgroundColor": "#f7f7f7", "fontWeight": 600},
+        ),
     ],
 )
 
@@ -125,6 +157,50 @@ def calc_static(zh, za, rho, pp, pl):
     except (TypeError, ValueError):
         return "Invalid input."
 
-    ps = (zh - za) * rho * g + pp - pl  # Pa
+    ps = float(static_pressure(zh, za, rho, pp, pl))  # Pa
     head = ps / (rho * g) if rho > 0 else float("nan")  # m of fluid column
     return f"Static pressure at A: {ps:,.2f} Pa  ({ps/1000:,.3f} kPa)   •   Equivalent head: {head:,.3f} m"
+
+@callback(
+    Output("tree-data", "data"),
+    Output("tree-status", "children"),
+    Input("tree-upload", "contents"),
+    Input("tree-upload", "filename"),
+    prevent_initial_call=True,
+)
+def load_tree(contents, filename):
+    if not contents:
+        return pipe_tree.SAMPLE_TREE.to_dict("records"), "Using the sample two-riser tree."
+    try:
+        df = pipe_tree.parse_tree_csv(base64.b64decode(contents.split(",", 1)[1]).decode("utf-8-sig"))
+        pipe_tree.tree_from_table(df)
+    except Exception as e:
+        return pipe_tree.SAMPLE_TREE.to_dict("records"), f"Could not read {filename}: {e}"
+    return df.to_dict("records"), f"{filename}: {len(df)} nodes"
+
+@callback(
+    Output("tree-summary", "children"),
+    Output("tree-table", "data"),
+    Output("tree-table", "columns"),
+    Input("tree-data", "data"),
+    Input("tree-zh", "value"),
+    Input("tree-return", "value"),
+)
+def index_circuit(rows, zh, ret):
+    df = pd.DataFrame(rows, columns=pipe_tree.TREE_COLUMNS)
+    try: zh = float(zh)
+    except (TypeError, ValueError): zh = 0.0
+    tree = pipe_tree.tree_from_table(df, return_factor=2.0 if ret else 1.0)
+    j, pump_dp, path = tree.index_circuit()
+    ps = tree.static_pressures(zh, pump_dp)
+    names = df["node"].tolist()
+    summary = (f"Index terminal: {names[j]}   •   Pump pressure: {pump_dp/1000:,.1f} kPa   •   "
+               f"Plant flow: {tree.flow[tree.root]*1000:,.2f} L/s   •   Route: {' → '.join(names[i] for i in path)}")
+    leaves = [i for i in tree.order if tree.leaf[i] and i != tree.root]
+    data = [{"Terminal": names[i], "Q (L/s)": round(tree.flow[i]*1000, 2),
+             "Pipe losses (kPa)": round(tree.cum[i]/1000, 1),
+             "Terminal Δp (kPa)": round(tree.terminal_dp[i]/1000, 1),
+             "Surplus to balance (kPa)": round((pump_dp - tree.cum[i] - tree.terminal_dp[i])/1000, 1),
+             "Static pressure (kPa)": round(ps[i]/1000, 1)} for i in leaves]
+    cols = [{"name": c, "id": c} for c in (data[0] if data else ["Terminal"])]
+    return summary, data, cols
@@ -0,0 +1,148 @@
+# apps/pages/pump_selection.py
+import base64
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from dash import register_page, html, dcc, dash_table, Input, Output, callback
+from apps.shared import fluids
+from apps.shared import pumps
+from apps.shared.pipes import PIPE_SERIES
+
+register_page(__name__, path="/pump-selection", name="Pump Selection")
+
+STEEL_SIZES = PIPE_SERIES["steel"][2]
+
+def _num(v, default):
+    try: return float(v)
+    except (TypeError, ValueError): return default
+
+layout = html.Div(
+    style={"width": "100%", "padding": "16px"},
+    children=[
+        html.H2("Pump Selection — Operating Point and VSD Sweep"),
+        dcc.Markdown(
+            "The pump runs where its curve meets the **system curve** (index-circuit friction, "
+            "fitting losses and any static lift). Reduced speeds follow the affinity laws: "
+            "Q ∝ n, Δp ∝ n², efficiency carried along the affinity parabola."
+        ),
+
+        html.H3("Pump curve"),
+        dcc.Upload(id="pump-upload",
+                   children=html.Div(["Drop or ", html.A("select"),
+                                      " a pump curve CSV (flow_ls, head_kpa, eff_pct)"]),
+                   style={"width": "100%", "maxWidth": "900px", "padding": "14px", "borderWidth": "1px",
+                          "borderStyle": "dashed", "borderRadius": "10px", "textAlign": "center"}),
+        dcc.Store(id="pump-points", data=pumps.SAMPLE_PUMP.to_dict("list")),
+        html.Div("Using the sample end-suction curve until a CSV is loaded.",
+                 id="pump-status", style={"color": "#555", "marginTop": "6px"}),
+
+        html.H3("System (index circuit)"),
+        html.Div([
+            html.Span("Pipe"),
+            dcc.Dropdown(id="sys-size", clearable=False, value="DN80", style={"width": "110px"},
+                         options=[{"label": k, "value": k} for k in STEEL_SIZES]),
+            html.Span("Length (m)"),
+            dcc.Input(id="sys-length", type="number", value=120.0, step=5, style={"width": "90px"}),
+            html.Span("ΣK"),
+            dcc.Input(id="sys-k", type="number", value=25.0, step=1, style={"width": "80px"}),
+            html.Span("Static lift (kPa)"),
+            dcc.Input(id="sys-static", type="number", value=30.0, step=5, style={"width": "80px"}),
+            html.Span("Water (°C)"),
+            dcc.Input(id="sys-temp", type="number", value=20.0, step=1, style={"width": "80px"}),
+        ], style={"display": "flex", "alignItems": "center", "gap": "10px", "flexWrap": "wrap"}),
+        html.Div("Steel Sch 40 pipe; static lift is 0 for a closed circuit.",
+                 style={"color": "#555", "marginTop": "6px"}),
+
+        html.H3("Speed range"),
+        html.Div([
+            dcc.RangeSlider(id="vsd-range", min=30, max=100, step=5, value=[50, 100],
+                            marks={i: f"{i} %" for i in range(30, 101, 10)}),
+        ], style={"maxWidth": "700px"}),
+
+        dcc.Graph(id="pump-chart", style={"height": "650px"}),
+        dash_table.DataTable(
+            id="pump-table", data=[], page_size=15,
+            style_table={"overflowX": "auto", "maxWidth": "900px", "marginTop": "8px"},
+            style_cell={"padding": "6px", "fontSize": "14px", "fontVariantNumeric": "tabular-nums"},
+            style_header={"backgroundColor": "#f7f7f7", "fontWeight": 600},
+        ),
+    ],
+)
+
+@callback(
+    Output("pump-points", "data"),
+    Output("pump-status", "children"),
+    Input("pump-upload", "contents"),
+    Input("pump-upload", "filename"),
+    prevent_initial_call=True,
+)
+def load_pump(contents, filename):
+    if not contents:
+        return pumps.SAMPLE_PUMP.to_dict("list"), "Using the sample end-suction curve."
+    try:
+        df = pumps.parse_pump_csv(base64.b64decode(contents.split(",", 1)[1]).decode("utf-8-sig"))
+    except Exception as e:
+        return pumps.SAMPLE_PUMP.to_dict("list"), f"Could not read {filename}: {e}"
+    return df.to_dict("list"), f"{filename}: {len(df)} curve points"
+
+@callback(
+    Output("pump-chart", "figure"),
+    Output("pump-table", "data"),
+    Output("pump-table", "columns"),
+    Input("pump-points", "data"),
+    Input("sys-size", "value"),
+    Input("sys-length", "value"),
+    Input("sys-k", "value"),
+    Input("sys-static", "value"),
+    Input("sys-temp", "value"),
+    Input("vsd-range", "value"),
+)
+def draw_pump(points, size, length, k, static, temp, vsd):
+    pump = pumps.fit_pump(pd.DataFrame(points))
+    rho, mu = (float(x) for x in fluids.water_props(_num(temp, 20.0)))
+    D = STEEL_SIZES.get(size, STEEL_SIZES["DN80"])*1e-3
+    length, k, static = max(_num(length, 0.0), 0.0), max(_num(k, 0.0), 0.0), max(_num(static, 0.0), 0.0)
+    system = lambda q: pumps.system_curve(q, D, length, k, static, rho=rho, mu=mu)
+
+    lo, hi = (vsd or [50, 100])
+    speeds = np.arange(lo, hi + 0.1, 5.0)/100.0
+    duty = pumps.operating_points(pump, system, speeds)
+
+    q_top = pump["q_max"]*max(1.0, hi/100.0)*1.05
+    Q = np.linspace(0.0, q_top, 160)
+    dp_top = float(pumps.pump_head(pump, 0.0, hi/100.0))*1.1
+    # efficiency map on a coarser grid; contour lines are smooth at this size
+    Qm, Pm = np.linspace(0.0, q_top, 80), np.linspace(0.0, dp_top, 60)
+    eff = pumps.efficiency_map(pump, Qm, Pm).astype(np.float32)
+
+    fig = go.Figure()
+    fig.add_trace(go.Contour(x=Qm, y=Pm, z=eff, name="Efficiency (%)",
+                             contours=dict(start=40, end=90, size=5, showlabels=True, coloring="lines"),
+                             colorscale="Greys", showscale=False, line=dict(width=1), hoverinfo="skip"))
+    for n in speeds:
+        q = np.linspace(0.0, pump["q_max"]*n, 80)
+        fig.add_trace(go.Scatter(x=q, y=pumps.pump_head(pump, q, n), mode="lines",
+                                 name=f"{n*100:.0f} %", line=dict(width=1.5 if n < speeds[-1] else 2.5),
+                                 hovertemplate="Q=%{x:.2f} L/s<br>Δp=%{y:.0f} kPa<extra>"
+                                               f"{n*100:.0f} % speed</extra>"))
+    fig.add_trace(go.Scatter(x=Q, y=system(Q), mode="lines", name="System", line=dict(color="#d62728", width=2.5),
+                             hovertemplate="Q=%{x:.2f} L/s<br>Δp=%{y:.0f} kPa<extra>System</extra>"))
+    fig.add_trace(go.Scatter(x=duty["Q"], y=duty["dp"], mode="markers", name="Duty points",
+                             marker=dict(size=9, color="#111"),
+                             customdata=np.column_stack([duty["speed"]*100, duty["eff"], duty["kW"]]),
+                             hovertemplate="%{customdata[0]:.0f} % speed<br>Q=%{x:.2f} L/s<br>Δp=%{y:.0f} kPa"
+                                           "<br>η=%{customdata[1]:.0f} %<br>%{customdata[2]:.2f} kW<extra></extra>"))
+    fig.update_layout(
+        xaxis=dict(title="Flow Q (L/s)", range=[0, q_top]),
+        yaxis=dict(title="Pump pressure Δp (kPa)", range=[0, dp_top]),
+        template="plotly_white", legend_title_text="Speed",
+        margin=dict(l=60, r=20, t=30, b=50),
+    )
+
+    rows = [{"Speed (%)": round(n*100), "Q (L/s)": None if np.isnan(q) else round(q, 2),
+             "Δp (kPa)": None if np.isnan(q) else round(p, 1),
+             "η (%)": None if np.isnan(e) else round(e, 1),
+             "Shaft power (kW)": None if np.isnan(w) else round(w, 2)}
+            for n, q, p, e, w in zip(duty["speed"], duty["Q"], duty["dp"], duty["eff"], duty["kW"])]
+    cols = [{"name": c, "id": c} for c in rows[0]]
+    return fig, rows, cols
@@ -1,48 +1,92 @@
 # apps/pages/psychrometric_chart.py
+from functools import lru_cache
+import base64
+import io
 import numpy as np
+import pandas as pd
 import plotly.graph_objects as go
-from dash import register_page, html, dcc, Input, Output, callback
-from CoolProp.HumidAirProp import HAPropsSI
+from dash import (register_page, html, dcc, dash_table, Input, Output, State, callback, clientside_callback,
+                  ClientsideFunction, Patch, no_update)
 import dash
+from apps.shared import psychrometrics as psy
+from apps.shared import psychro_process as proc
+from apps.shared import weather
+from apps.shared.psychro_grid import build_grid
+from apps.shared import psychro_isolines as iso
+from apps.shared.psychro_inverse import PAIRS, resolve
+from apps.shared.psychro_state import state_point
 
 register_page(__name__, path="/psychrometric-chart", name="Psychrometric Chart")
 
 P_ATM = 101325.0  # Pa
 DB_MIN, DB_MAX = -10.0, 50.0
 RH_MIN, RH_MAX = 0.0, 100.0
+ALT_MIN, ALT_MAX = -500.0, 5000.0  # m
+P_MIN, P_MAX = 50.0, 110.0         # kPa
+PROP_LABELS = {"db": "Dry bulb (°C)", "wb": "Wet bulb (°C)", "dp": "Dew point (°C)",
+               "rh": "RH (%)", "W": "W (g/kg)", "h": "h (kJ/kg)"}
+P_STEP = 25.0                      # Pa — charts are cached per quantised pressure (101325 = 4053 × 25)
+FIGURE_CACHE_SIZE = 16
 
-def _W_from_T_R(T_K, RH):
-    return HAPropsSI("W", "T", float(T_K), "P", P_ATM, "R", float(RH))
-
-def rh_curve(DB_C_array, RH):
+def rh_curve(DB_C_array, RH, P=P_ATM):
+    # vectorised Hyland–Wexler (apps.shared.psychrometrics) — one pass per curve, no HAPropsSI loop
     DB_C_array = np.atleast_1d(DB_C_array).astype(float)
-    return np.array([_W_from_T_R(t + 273.15, RH) for t in DB_C_array])
+    return psy.humidity_ratio(DB_C_array, RH, P)
+
+def sat_curve(DB_C_array, P=P_ATM):
+    return rh_curve(DB_C_array, 1.0, P)
 
-def sat_curve(DB_C_array):
-    return rh_curve(DB_C_array, 1.0)
+def quantise_pressure(P):
+    return round(float(P) / P_STEP) * P_STEP
 
-def make_psychro_figure(tmin=DB_MIN, tmax=DB_MAX):
+@lru_cache(maxsize=FIGURE_CACHE_SIZE)
+def psychro_grid(P=P_ATM, tmin=DB_MIN, tmax=DB_MAX):
+    """RH/saturation curves as (db, {RH: W}) — computed once per pressure, then served from memory."""
     db = np.linspace(tmin, tmax, 400)
+    levels = np.append(np.round(np.arange(0.1, 1.0, 0.1), 1), 1.0)
+    curves = dict(zip(levels.tolist(), psy.rh_curves(db, levels, P)))
+    return db, curves
+
+def curve_name(RH):
+    return "Saturation (100% RH)" if RH >= 1.0 else f"RH {int(RH*100)}%"
+
+def pressure_title(P):
+    return f"Barometric pressure {P/1000:.2f} kPa"
+
+def make_psychro_figure(tmin=DB_MIN, tmax=DB_MAX, P=P_ATM):
+    db, curves = psychro_grid(P, tmin, tmax)
     fig = go.Figure()
-    for RH in np.arange(0.1, 1.0, 0.1):
-        W = rh_curve(db, RH)
+    # weather-hour density sits underneath everything (filled via Patch)
+    fig.add_trace(weather.density_trace())
+    for RH, W in curves.items():
+        if RH >= 1.0:
+            continue
         fig.add_trace(go.Scatter(
             x=db, y=W*1000, mode="lines",
             hovertemplate="DB: %{x:.1f} °C<br>W: %{y:.2f} g/kg<extra>RH " + f"{int(RH*100)}%</extra>",
-            name=f"RH {int(RH*100)}%"
+            name=curve_name(RH)
         ))
-    Wsat = sat_curve(db)
-    fig.add_trace(go.Scatter(x=db, y=Wsat*1000, mode="lines", line=dict(width=3),
-                             name="Saturation (100% RH)"))
+    fig.add_trace(go.Scatter(x=db, y=curves[1.0]*1000, mode="lines", line=dict(width=3),
+                             name=curve_name(1.0)))
+    # Overlay placeholders, filled via Patch (state point last so it draws on top)
+    fig.add_traces(iso.isoline_traces())
+    fig.add_traces(proc.process_traces())
+    fig.add_trace(go.Scatter(x=[], y=[], mode="markers", marker=dict(size=10), name="State point"))
     fig.update_layout(
         xaxis_title="Dry-bulb temperature (°C)",
         yaxis_title="Humidity ratio W (g/kg dry air)",
         template="plotly_white",
         legend_title="Relative Humidity",
+        title=dict(text=pressure_title(P), font=dict(size=13), x=0.01),
         margin=dict(l=40, r=10, t=30, b=40),
     )
     return fig
 
+# Sea-level chart served with the layout; other pressures patch in curves from psychro_grid
+BASE_FIGURE = make_psychro_figure(P=P_ATM).to_plotly_json()
+TRACE_INDEX = {t["name"]: i for i, t in enumerate(BASE_FIGURE["data"])}
+STATE_TRACE = TRACE_INDEX["State point"]
+
 layout = html.Div(
     style={"width": "100%", "padding": "16px"},
     children=[
@@ -53,15 +97,16 @@ layout = html.Div(
             # Dry-bulb row
             html.Div([
                 html.Label("Dry-bulb (°C)", htmlFor="db", style={"marginRight": "10px"}),
+                # exact (server) path: Enter or leaving the box; sliders are interpolated in the browser
                 dcc.Input(id="db_input", type="number", value=25, step=0.1,
-                          debounce=True, style={"width": "110px", "marginRight": "14px"}),
+                          style={"width": "110px", "marginRight": "14px"}),
                 html.Div(  # wrap the slider; put flex on the wrapper, not on Slider
                     dcc.Slider(
                         id="db",
                         min=DB_MIN, max=DB_MAX, step=1, value=25,
                         marks={i: str(i) for i in range(int(DB_MIN), int(DB_MAX)+1, 10)},
                         included=False,
-                        updatemode="mouseup",
+                        updatemode="drag",
                         tooltip={"always_visible": False, "placement": "bottom"},
                     ),
                     style={"flex": "1"}
@@ -71,25 +116,99 @@ layout = html.Div(
             # RH row
             html.Div([
                 html.Label("Relative Humidity (%)", htmlFor="rh", style={"marginRight": "10px"}),
+                # exact (server) path: Enter or leaving the box; sliders are interpolated in the browser
                 dcc.Input(id="rh_input", type="number", value=50, step=0.1,
-                          debounce=True, style={"width": "110px", "marginRight": "14px"}),
+                          style={"width": "110px", "marginRight": "14px"}),
                 html.Div(
                     dcc.Slider(
                         id="rh",
                         min=RH_MIN, max=RH_MAX, step=1, value=50,
                         marks={i: str(i) for i in range(int(RH_MIN), int(RH_MAX)+1, 10)},
                         included=False,
-                        updatemode="mouseup",
+                        updatemode="drag",
                         tooltip={"always_visible": False, "placement": "bottom"},
                     ),
                     style={"flex": "1"}
                 ),
+            ], style={"display": "flex", "alignItems": "center", "gap": "8px", "marginBottom": "14px"}),
+
+            # Site row
+            html.Div([
+                html.Label("Site altitude (m)", htmlFor="alt_input", style={"marginRight": "10px"}),
+                dcc.Input(id="alt_input", type="number", value=0, step=10, min=ALT_MIN, max=ALT_MAX,
+                          debounce=True, style={"width": "110px", "marginRight": "14px"}),
+                html.Label("Barometric pressure (kPa)", htmlFor="p_input", style={"marginRight": "10px"}),
+                dcc.Input(id="p_input", type="number", value=P_ATM/1000.0, step=0.1, min=P_MIN, max=P_MAX,
+                          debounce=True, style={"width": "110px"}),
             ], style={"display": "flex", "alignItems": "center", "gap": "8px"}),
 
+            html.Div([
+                html.Label("Show lines of constant", style={"marginRight": "10px"}),
+                dcc.Checklist(id="psy-isolines", value=[], inline=True,
+                              options=[{"label": f" {name}", "value": key}
+                                       for key, (name, *_rest) in iso.FAMILIES.items()],
+                              inputStyle={"marginLeft": "12px"}),
+            ], style={"display": "flex", "alignItems": "center", "marginTop": "14px"}),
+
             html.Div(id="state-readout", style={"marginTop": "8px", "color": "#555"}),
+
+            # Site measurements: any supported property pair → state
+            html.Div([
+                html.Label("From measurements", style={"marginRight": "10px"}),
+                dcc.Dropdown(id="inv-pair", clearable=False, value="db|wb", style={"width": "260px"},
+                             options=[{"label": lbl, "value": "|".join(k)} for k, lbl in PAIRS.items()]),
+                html.Span(id="inv-a-label"),
+                dcc.Input(id="inv-a", type="number", value=30.0, step=0.1, style={"width": "90px"}),
+                html.Span(id="inv-b-label"),
+                dcc.Input(id="inv-b", type="number", value=22.0, step=0.1, style={"width": "90px"}),
+                html.Button("Plot", id="inv-go", n_clicks=0,
+                            style={"padding": "6px 12px", "borderRadius": "8px", "border": "1px solid #ccc",
+                                   "background": "#f7f7f7"}),
+            ], style={"display": "flex", "alignItems": "center", "gap": "8px", "marginTop": "14px",
+                      "flexWrap": "wrap"}),
+            html.Div(id="inv-readout", style={"marginTop": "6px", "color": "#555"}),
+            dcc.Store(id="psy-grid", data=build_grid(P_ATM)),  # W/h/Twb/v lookup for the client-side readout
+            dcc.Store(id="psy-exact"),
         ], style={"maxWidth": "900px"}),
 
-        dcc.Graph(id="psy", figure=make_psychro_figure(), style={"height": "650px"}),
+        dcc.Graph(id="psy", figure=BASE_FIGURE, style={"height": "650px"}),
+
+        # AHU schedule (batch processes)
+        html.H3("AHU schedule processes"),
+        html.Div([
+            "Upload a CSV with columns ",
+            html.Code(", ".join(proc.SCHEDULE_COLUMNS)),
+            " (flow in L/s, RH in %, OA fraction 0–1, coil ADP °C, bypass factor 0–1). "
+            "Each AHU is mixed, cooled and reheated to its supply temperature; all process lines are "
+            "plotted on the chart above.",
+        ], style={"color": "#555", "marginBottom": "8px", "maxWidth": "900px"}),
+        dcc.Upload(id="ahu-upload", children=html.Div(["Drop or ", html.A("select"), " an AHU schedule CSV"]),
+                   style={"width": "100%", "maxWidth": "900px", "padding": "14px", "borderWidth": "1px",
+                          "borderStyle": "dashed", "borderRadius": "10px", "textAlign": "center"}),
+        dcc.Store(id="ahu-schedule"),
+        html.Div(id="ahu-status", style={"color": "#555", "marginTop": "6px"}),
+        dash_table.DataTable(
+            id="ahu-table", data=[], page_size=15, sort_action="native",
+            style_table={"overflowX": "auto", "maxWidth": "1100px", "marginTop": "8px"},
+            style_cell={"padding": "6px", "fontSize": "14px", "fontVariantNumeric": "tabular-nums"},
+            style_header={"backgroundColor": "#f7f7f7", "fontWeight": 600},
+        ),
+
+        # Hourly weather file (density overlay)
+        html.H3("Hourly weather file"),
+        html.Div([
+            "Upload an EPW file, or a CSV with ", html.Code("db"), " and ", html.Code("rh"),
+            " columns (optional ", html.Code("month, day, hour, p"), "). Every hour is evaluated and binned "
+            "server-side; the chart shows hours per 1 °C × 0.5 g/kg cell.",
+        ], style={"color": "#555", "marginBottom": "8px", "maxWidth": "900px"}),
+        dcc.Upload(id="wx-upload", children=html.Div(["Drop or ", html.A("select"), " a weather file"]),
+                   style={"width": "100%", "maxWidth": "900px", "padding": "14px", "borderWidth": "1px",
+                          "borderStyle": "dashed", "borderRadius": "10px", "textAlign": "center"}),
+        dcc.Checklist(id="wx-station-p", options=[{"label": " Use the file's station pressure", "value": "on"}],
+                      value=[], style={"marginTop": "6px"}),
+        dcc.Store(id="wx-key"),
+        html.Div(id="wx-status", style={"color": "#555", "marginTop": "6px"}),
+        html.Div(id="wx-summary", style={"marginTop": "6px"}),
     ]
 )
 
@@ -100,21 +219,26 @@ layout = html.Div(
     Output("db_input", "value"),
     Output("rh", "value"),
     Output("rh_input", "value"),
-    Input("db", "value"),
-    Input("db_input", "value"),
-    Input("rh", "value"),
-    Input("rh_input", "value"),
+    Output("alt_input", "value"),
+    Output("p_input", "value"),
+    Output("psy-grid", "data"),
+    Output("psy-exact", "data"),
+    Input("db_input", "n_submit"),
+    Input("db_input", "n_blur"),
+    Input("rh_input", "n_submit"),
+    Input("rh_input", "n_blur"),
+    Input("alt_input", "value"),
+    Input("p_input", "value"),
+    State("db_input", "value"),
+    State("rh_input", "value"),
 )
-def update_chart(db_slider, db_input_val, rh_slider, rh_input_val):
+def update_chart(_db_submit, _db_blur, _rh_submit, _rh_blur, alt_val, p_kpa, db_val, rh_val):
     # robust ctx across Dash versions
     ctx = getattr(dash, "ctx", dash.callback_context)
     trig = ctx.triggered[0]["prop_id"].split(".")[0] if ctx.triggered else None
 
-    db_val = db_input_val if trig == "db_input" else db_slider
-    rh_val = rh_input_val if trig == "rh_input" else rh_slider
-
-    if db_val is None: db_val = db_input_val if db_input_val is not None else 25.0
-    if rh_val is None: rh_val = rh_input_val if rh_input_val is not None else 50.0
+    if db_val is None: db_val = 25.0
+    if rh_val is None: rh_val = 50.0
 
     # clamp
     try: db_val = float(db_val)
@@ -125,22 +249,40 @@ def update_chart(db_slider, db_input_val, rh_slider, rh_input_val):
     except (TypeError, ValueError): rh_val = 50.0
     rh_val = max(RH_MIN, min(RH_MAX, rh_val))
 
-    fig = make_psychro_figure()
+    # site pressure: altitude drives pressure unless pressure was typed directly
+    try:
+        if trig == "p_input":
+            P = max(P_MIN, min(P_MAX, float(p_kpa))) * 1000.0
+            alt_val = round(float(psy.altitude_from_pressure(P)))
+        else:
+            alt_val = max(ALT_MIN, min(ALT_MAX, float(alt_val)))
+            P = float(psy.pressure_from_altitude(alt_val))
+    except (TypeError, ValueError):
+        alt_val, P = 0.0, P_ATM
+    P = quantise_pressure(P)
+
+    fig = Patch()
+    if trig in ("alt_input", "p_input"):
+        # new pressure → patch only the RH / saturation curves (cached per pressure) and the title;
+        # the isoline, AHU and weather overlays on the client are left as they are
+        _, curves = psychro_grid(P)
+        for RH, W in curves.items():
+            fig["data"][TRACE_INDEX[curve_name(RH)]]["y"] = (W*1000).tolist()
+        fig["layout"]["title"]["text"] = pressure_title(P)
+        grid = build_grid(P)
+    else:
+        # Background curves are already on the client; only move the state point
+        grid = no_update
 
     try:
-        RH = rh_val / 100.0
-        T_K = db_val + 273.15
-        W   = HAPropsSI("W",   "T", T_K, "P", P_ATM, "R", RH)
-        h   = HAPropsSI("H",   "T", T_K, "P", P_ATM, "R", RH) / 1000.0
-        twb = HAPropsSI("Twb", "T", T_K, "P", P_ATM, "R", RH) - 273.15
-        v   = HAPropsSI("V",   "T", T_K, "P", P_ATM, "R", RH)
+        st = state_point(db_val, rh_val / 100.0, P)  # memoised on quantised (T, RH, P)
+        W, h, twb, v = st["W"], st["h"], st["Twb"], st["v"]
 
-        fig.add_trace(go.Scatter(
-            x=[db_val], y=[W*1000.0],
-            mode="markers", marker=dict(size=10),
-            name="State point",
-            hovertemplate=f"DB: {db_val:.1f} °C<br>RH: {rh_val:.0f}%<br>W: {W*1000:.2f} g/kg<extra></extra>"
-        ))
+        fig["data"][STATE_TRACE]["x"] = [db_val]
+        fig["data"][STATE_TRACE]["y"] = [W*1000.0]
+        fig["data"][STATE_TRACE]["hovertemplate"] = (
+            f"DB: {db_val:.1f} °C<br>RH: {rh_val:.0f}%<br>W: {W*1000:.2f} g/kg<extra></extra>"
+        )
         readout = (
             f"h = {h:.2f} kJ/kg_da · "
             f"W = {W*1000:.2f} g/kg · "
@@ -148,6 +290,205 @@ def update_chart(db_slider, db_input_val, rh_slider, rh_input_val):
             f"v = {v:.3f} m³/kg"
         )
     except Exception as e:
+        fig["data"][STATE_TRACE]["x"] = []
+        fig["data"][STATE_TRACE]["y"] = []
         readout = f"State not defined for the selected inputs. ({e})"
 
-    return fig, readout, db_val, db_val, rh_val, rh_val
+    return (fig, readout, db_val, db_val, rh_val, rh_val, alt_val, round(P / 1000.0, 3),
+            grid, {"db": db_val, "rh": rh_val})
+
+# Slider drags: interpolate the lookup grid in the browser (apps/assets/psychro_grid.js)
+clientside_callback(
+    ClientsideFunction(namespace="psychro", function_name="state_point"),
+    Output("psy", "figure", allow_duplicate=True),
+    Output("state-readout", "children", allow_duplicate=True),
+    Output("db_input", "value", allow_duplicate=True),
+    Output("rh_input", "value", allow_duplicate=True),
+    Output("psy-exact", "data", allow_duplicate=True),
+    Input("db", "value"),
+    Input("rh", "value"),
+    State("psy-grid", "data"),
+    State("psy-exact", "data"),
+    State("psy", "figure"),
+    prevent_initial_call=True,
+)
+
+# ---------- Inverse state from a measured pair ----------
+@callback(
+    Output("inv-a-label", "children"),
+    Output("inv-b-label", "children"),
+    Input("inv-pair", "value"),
+)
+def inverse_labels(pair):
+    a, b = (pair or "db|wb").split("|")
+    return PROP_LABELS[a], PROP_LABELS[b]
+
+@callback(
+    Output("db", "value", allow_duplicate=True),
+    Output("rh", "value", allow_duplicate=True),
+    Output("inv-readout", "children"),
+    Input("inv-go", "n_clicks"),
+    State("inv-pair", "value"),
+    State("inv-a", "value"),
+    State("inv-b", "value"),
+    State("p_input", "value"),
+    prevent_initial_call=True,
+)
+def plot_measurement(_n, pair, a_val, b_val, p_kpa):
+    if a_val is None or b_val is None:
+        return no_update, no_update, "Enter both values."
+    a, b = pair.split("|")
+    try: P = quantise_pressure(max(P_MIN, min(P_MAX, float(p_kpa))) * 1000.0)
+    except (TypeError, ValueError): P = P_ATM
+    try:
+        st = {k: float(v) for k, v in resolve(P, **{a: float(a_val), b: float(b_val)}).items()}
+    except ValueError as e:
+        return no_update, no_update, str(e)
+    if not (np.isfinite(st["db"]) and 0.0 <= st["rh"] <= 100.0 + 1e-6 and DB_MIN <= st["db"] <= DB_MAX):
+        return no_update, no_update, "Those values do not describe a state on this chart."
+    readout = (f"DB = {st['db']:.2f} °C · RH = {st['rh']:.1f} % · W = {st['W']:.2f} g/kg · "
+               f"h = {st['h']:.2f} kJ/kg_da · Twb = {st['Twb']:.2f} °C · Tdp = {st['Tdp']:.2f} °C · "
+               f"v = {st['v']:.3f} m³/kg")
+    # moving the sliders re-plots the marker through the client-side readout
+    return round(st["db"], 2), round(min(st["rh"], 100.0), 1), readout
+
+# ---------- Isolines (precomputed, switched per family) ----------
+@callback(
+    Output("psy", "figure", allow_duplicate=True),
+    Input("psy-isolines", "value"),
+    Input("p_input", "value"),
+    prevent_initial_call=True,
+)
+def toggle_isolines(families, p_kpa):
+    families = families or []
+    try: P = quantise_pressure(max(P_MIN, min(P_MAX, float(p_kpa))) * 1000.0)
+    except (TypeError, ValueError): P = P_ATM
+    fig = Patch()
+    for key, (name, *_rest) in iso.FAMILIES.items():
+        i = TRACE_INDEX[name]
+        on = key in families
+        fig["data"][i]["visible"] = on
+        if on:
+            x, y, text = iso.trace_xy(key, P)
+            fig["data"][i]["x"], fig["data"][i]["y"], fig["data"][i]["text"] = x, y, text
+    return fig
+
+# ---------- AHU schedule ----------
+@callback(
+    Output("ahu-schedule", "data"),
+    Output("ahu-status", "children"),
+    Input("ahu-upload", "contents"),
+    Input("ahu-upload", "filename"),
+    prevent_initial_call=True,
+)
+def load_schedule(contents, filename):
+    if not contents:
+        return None, ""
+    try:
+        raw = base64.b64decode(contents.split(",", 1)[1])
+        df = pd.read_csv(io.BytesIO(raw))
+        df.columns = [c.strip().lower() for c in df.columns]
+        missing = [c for c in proc.SCHEDULE_COLUMNS if c not in df.columns]
+        if missing:
+            return None, f"{filename}: missing column(s) {', '.join(missing)}"
+        df = df[proc.SCHEDULE_COLUMNS]
+        numeric = [c for c in proc.SCHEDULE_COLUMNS if c != "ahu"]
+        df[numeric] = df[numeric].apply(pd.to_numeric, errors="coerce")
+        n_rows = len(df)
+        df = df.dropna()
+    except Exception as e:
+        return None, f"Could not read {filename}: {e}"
+    dropped = n_rows - len(df)
+    skipped = f" ({dropped} row(s) with blank or non-numeric values skipped)" if dropped else ""
+    return df.to_dict("list"), f"{filename}: {len(df)} AHUs{skipped}"
+
+@callback(
+    Output("psy", "figure", allow_duplicate=True),
+    Output("ahu-table", "data"),
+    Output("ahu-table", "columns"),
+    Input("ahu-schedule", "data"),
+    Input("p_input", "value"),
+    prevent_initial_call=True,
+)
+def plot_schedule(sched, p_kpa):
+    fig = Patch()
+    if not sched:
+        for name in proc.PROCESS_TYPES:
+            fig["data"][TRACE_INDEX[name]]["x"] = []
+            fig["data"][TRACE_INDEX[name]]["y"] = []
+        return fig, [], []
+
+    try: P = quantise_pressure(max(P_MIN, min(P_MAX, float(p_kpa))) * 1000.0)
+    except (TypeError, ValueError): P = P_ATM
+    cols = {k: np.asarray(sched[k], float) for k in proc.SCHEDULE_COLUMNS if k != "ahu"}
+    res = proc.ahu_schedule(**cols, p=P)
+
+    # one trace per process type, every AHU in it
+    for name, (x, y) in proc.process_lines(res).items():
+        fig["data"][TRACE_INDEX[name]]["x"] = x
+        fig["data"][TRACE_INDEX[name]]["y"] = y
+
+    coil, sup, mixed = res["coil"], res["supply"], res["mixed"]
+    table = pd.DataFrame({
+        "AHU": sched["ahu"],
+        "Mixed DB (°C)": mixed["t"].round(1),
+        "Mixed W (g/kg)": (mixed["W"]*1000).round(2),
+        "Off-coil DB (°C)": coil["t"].round(1),
+        "Off-coil W (g/kg)": (coil["W"]*1000).round(2),
+        "Cooling total (kW)": coil["Q_total"].round(1),
+        "Cooling sensible (kW)": coil["Q_sensible"].round(1),
+        "Cooling latent (kW)": coil["Q_latent"].round(1),
+        "Reheat (kW)": sup["Q"].round(1),
+        "Condensate (L/h)": (coil["condensate_kgs"]*3600).round(1),
+    })
+    return fig, table.to_dict("records"), [{"name": c, "id": c} for c in table.columns]
+
+# ---------- Weather file ----------
+@callback(
+    Output("wx-key", "data"),
+    Output("wx-status", "children"),
+    Input("wx-upload", "contents"),
+    Input("wx-upload", "filename"),
+    prevent_initial_call=True,
+)
+def load_weather(contents, filename):
+    if not contents:
+        return None, ""
+    try:
+        key = weather.ingest(base64.b64decode(contents.split(",", 1)[1]))
+    except Exception as e:
+        return None, f"Could not read {filename}: {e}"
+    return key, f"{filename}"
+
+@callback(
+    Output("psy", "figure", allow_duplicate=True),
+    Output("wx-summary", "children"),
+    Input("wx-key", "data"),
+    Input("wx-station-p", "value"),
+    Input("p_input", "value"),
+    prevent_initial_call=True,
+)
+def plot_weather(key, station_p, p_kpa):
+    fig = Patch()
+    idx = TRACE_INDEX["Weather hours"]
+    if not key:
+        fig["data"][idx]["x"], fig["data"][idx]["y"], fig["data"][idx]["z"] = [], [], []
+        return fig, ""
+
+    try: P = quantise_pressure(max(P_MIN, min(P_MAX, float(p_kpa))) * 1000.0)
+    except (TypeError, ValueError): P = P_ATM
+    try:
+        cols = weather.load(key)
+    except (ValueError, FileNotFoundError):
+        fig["data"][idx]["x"], fig["data"][idx]["y"], fig["data"][idx]["z"] = [], [], []
+        return fig, html.Div("Weather file is no longer cached; upload it again.", style={"color": "#555"})
+    props = weather.hourly_properties(cols, p=P, use_station_pressure=bool(station_p))
+    if not props["db"].size:
+        fig["data"][idx]["x"], fig["data"][idx]["y"], fig["data"][idx]["z"] = [], [], []
+        return fig, html.Div("No hours with both DB and RH in this file.", style={"color": "#555"})
+    x, y, z = weather.density(props)
+    fig["data"][idx]["x"], fig["data"][idx]["y"], fig["data"][idx]["z"] = x, y, z
+
+    summary = weather.design_summary(props)
+    items = [html.Li(f"{k}: {v:,.0f}" if k == "hours" else f"{k}: {v:.1f}") for k, v in summary.items()]
+    return fig, html.Ul(items, style={"margin": "0 0 0 18px", "color": "#555"})
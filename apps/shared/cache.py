@@ -0,0 +1,28 @@
+# apps/shared/cache.py
+# On-disk cache location for derived data (weather columns, fluid property tables).
+# Override with AWP_CACHE_DIR, e.g. to point at a mounted volume in Docker.
+import os
+import tempfile
+from pathlib import Path
+import numpy as np
+
+CACHE_DIR = Path(os.environ.get("AWP_CACHE_DIR", Path(__file__).resolve().parents[1] / ".cache"))
+
+def cache_path(namespace: str, name: str) -> Path:
+    d = CACHE_DIR / namespace
+    d.mkdir(parents=True, exist_ok=True)
+    return d / name
+
+def save_npy(path: Path, arr) -> None:
+    """np.save via a temp file unique to this writer, then an atomic rename: concurrent
+    workers writing the same entry never share a partial file, and the last one wins."""
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=path.stem + ".", suffix=".tmp",
+                                     delete=False) as f:
+        tmp = Path(f.name)
+        try:
+            np.save(f, arr)
+        except BaseException:
+            f.close()
+            tmp.unlink(missing_ok=True)
+            raise
+    os.replace(tmp, path)
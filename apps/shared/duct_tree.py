@@ -0,0 +1,283 @@
+# apps/shared/duct_tree.py
+# Supply duct trees: the fan is the root (parent −1) and node i is fed by the section from
+# parent[i]. Terminal flows sit on the leaves; section flows are subtree sums. Static-regain
+# sizing works down the tree one depth level at a time, solving every section at a level
+# together, so the cost grows with depth rather than with the number of branches.
+# DuctTree holds a sized network: total pressure loss P_T = friction + K·P_v per section,
+# summed from the fan to every terminal, with edits re-evaluating only what they touch.
+import io
+import numpy as np
+import pandas as pd
+from apps.shared.ducts import (RHO_AIR, MU_AIR, CIRCULAR_MM, duct_drops, geometry, velocity_pressure)
+from apps.shared.trees import euler_tour, subtree_sums, path_sums, path_to_root, depths
+
+REGAIN = 0.75  # fraction of a velocity-pressure drop recovered as static pressure
+
+TREE_COLUMNS = ["node", "parent", "length_m", "k", "flow_ls"]
+
+# Example: AHU main with two branches of diffusers, used until a CSV is uploaded
+SAMPLE_TREE = pd.DataFrame(
+    [("AHU", "", 0, 0, 0),
+     ("Main", "AHU", 8, 0.6, 0),
+     ("M2", "Main", 6, 0.1, 0),
+     ("B1", "Main", 5, 0.8, 0),
+     ("D1", "B1", 3, 1.2, 120),
+     ("D2", "B1", 6, 1.2, 120),
+     ("D3", "B1", 9, 1.2, 120),
+     ("M3", "M2", 7, 0.1, 0),
+     ("B2", "M2", 4, 0.8, 0),
+     ("D4", "B2", 3, 1.2, 150),
+     ("D5", "B2", 6, 1.2, 150),
+     ("D6", "M3", 5, 1.2, 200),
+     ("D7", "M3", 9, 1.2, 200)],
+    columns=TREE_COLUMNS)
+
+def parse_tree_csv(text):
+    """Duct tree table from CSV text; the fan row has a blank parent."""
+    df = pd.read_csv(io.StringIO(text), dtype={"node": str, "parent": str})
+    df.columns = [c.strip().lower() for c in df.columns]
+    missing = [c for c in TREE_COLUMNS if c not in df.columns and c != "k"]
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(missing)}")
+    if "k" not in df.columns:
+        df["k"] = 0.0
+    df["node"] = df["node"].str.strip()
+    df["parent"] = df["parent"].fillna("").str.strip()
+    num = [c for c in df.columns if c not in ("node", "parent")]
+    df[num] = df[num].apply(pd.to_numeric, errors="coerce")
+    df[TREE_COLUMNS[2:]] = df[TREE_COLUMNS[2:]].fillna(0.0)
+    if df["node"].duplicated().any():
+        raise ValueError("Node names must be unique.")
+    return df
+
+def parent_index(df):
+    """Parent positions (−1 for the fan) from a table's node and parent names."""
+    pos = {name: i for i, name in enumerate(df["node"])}
+    bad = [p for p in df["parent"] if p and p not in pos]
+    if bad:
+        raise ValueError(f"Unknown parent(s): {', '.join(sorted(set(bad))[:5])}")
+    return np.array([pos[p] if p else -1 for p in df["parent"]])
+
+def _solve_level(Q, L, K, pv_up, *, R, eps, rho, mu, mode, iters=45):
+    """Ø (m) per section where R·(P_v,up − P_v) = (f·L/D + K)·P_v, by bisection on ln D.
+
+    At the upstream velocity the regain is zero and the losses positive; as D grows the
+    regain tends to R·P_v,up and the losses to zero, so exactly one root lies between;
+    45 halvings of that bracket leave Ø good to ~1e-13.
+    """
+    v_up = np.sqrt(2.0*pv_up/rho)
+    lo = np.log(np.sqrt(4.0*Q/(np.pi*v_up)))
+    hi = lo + np.log(8.0)
+
+    def g(lnD):
+        D = np.exp(lnD)
+        A = np.pi*D*D/4.0
+        r = duct_drops(Q*1000.0, A, D, eps=eps, rho=rho, mu=mu, L=L, mode=mode)
+        pv = velocity_pressure(rho, r["V"])
+        return R*(pv_up - pv) - r["Pa_total"] - K*pv
+
+    for _ in range(iters):
+        mid = 0.5*(lo + hi)
+        low = g(mid) < 0.0
+        lo = np.where(low, mid, lo)
+        hi = np.where(low, hi, mid)
+    return np.exp(0.5*(lo + hi))
+
+def static_regain(parent, length, K, terminal_flow_ls, *, v_start=7.0, v_min=0.0, R=REGAIN, eps=0.00015,
+                  rho=RHO_AIR, mu=MU_AIR, mode="swamee_jain", sizes_mm=CIRCULAR_MM):
+    """Static-regain sizing of circular sections over a supply tree.
+
+    Sections leaving the fan run at v_start (m/s). Every later section is sized so the
+    static regain from its velocity drop pays for its own friction and fitting loss
+    (K on the section's velocity pressure); no section drops below v_min, where the static
+    pressure is allowed to fall instead. With sizes_mm the exact Ø is rounded up to
+    the next standard size before the level below is solved, so each level works from
+    the velocities actually installed; sizes_mm=None keeps the exact Ø.
+
+    Returns a dict of per-node arrays (the fan row is zero): flow_ls, d_exact_mm, d_mm,
+    v, pv, friction, fitting, regain and static (Pa relative to the fan outlet); plus depth,
+    leaf and the pre-order node list for display.
+    """
+    parent = np.asarray(parent, int)
+    n = len(parent)
+    root, order, tin, tout, leaf = euler_tour(parent)
+    Q = subtree_sums(order, tin, tout, np.where(leaf, np.asarray(terminal_flow_ls, float), 0.0))/1000.0
+    L = np.broadcast_to(np.asarray(length, float), (n,))
+    K = np.broadcast_to(np.asarray(K, float), (n,))
+    depth = depths(parent, order)
+    std = None if sizes_mm is None else np.sort(np.asarray(sizes_mm, float))/1000.0
+
+    D_exact, D = np.zeros(n), np.zeros(n)
+    for level in range(1, depth.max() + 1):
+        idx = np.flatnonzero((depth == level) & (Q > 0))
+        if not len(idx):
+            continue
+        if level == 1:
+            D_exact[idx] = np.sqrt(4.0*Q[idx]/(np.pi*v_start))
+        else:
+            up = parent[idx]
+            pv_up = velocity_pressure(rho, Q[up]/(np.pi*D[up]**2/4.0))
+            D_exact[idx] = _solve_level(Q[idx], L[idx], K[idx], pv_up, R=R, eps=eps, rho=rho, mu=mu, mode=mode)
+            if v_min > 0:
+                D_exact[idx] = np.minimum(D_exact[idx], np.sqrt(4.0*Q[idx]/(np.pi*v_min)))
+        if std is None:
+            D[idx] = D_exact[idx]
+        else:
+            pick = np.minimum(np.searchsorted(std, D_exact[idx] - 1e-9), len(std) - 1)
+            D[idx] = np.maximum(std[pick], D_exact[idx]*(D_exact[idx] > std[-1]))
+
+    A, _ = geometry(True, D*1000.0)
+    r = duct_drops(Q*1000.0, A, D, eps=eps, rho=rho, mu=mu, L=L, mode=mode)
+    pv = velocity_pressure(rho, r["V"])
+    pv_up = np.where(parent >= 0, pv[np.maximum(parent, 0)], 0.0)
+    first = depth == 1
+    regain = np.where(first | (parent < 0), 0.0, R*(pv_up - pv))
+    fitting = K*pv
+    change = regain - r["Pa_total"] - fitting
+    # static pressure relative to the fan outlet, accumulated down the tree
+    static = np.zeros(n)
+    for i in order[1:]:
+        static[i] = static[parent[i]] + change[i]
+    return {"flow_ls": Q*1000.0, "d_exact_mm": D_exact*1000.0, "d_mm": D*1000.0, "v": r["V"], "pv": pv,
+            "friction": r["Pa_total"], "fitting": fitting, "regain": regain, "static": static,
+            "depth": depth, "leaf": leaf, "order": order}
+
+class DuctTree:
+    """Sized supply duct tree; node i is fed by the section from parent[i] (the fan is the root).
+
+    Per node: section length (m), fitting K_T on the section's velocity pressure, circular Ø
+    or rectangular width × height (mm; a row with width and height is rectangular), and on
+    leaves the terminal flow (L/s) and terminal device loss (Pa).
+    """
+
+    def __init__(self, parent, length, K, terminal_flow_ls, *, diameter_mm=0.0, width_mm=0.0,
+                 height_mm=0.0, terminal_pa=0.0, eps=0.00015, rho=RHO_AIR, mu=MU_AIR, mode="swamee_jain"):
+        parent = np.asarray(parent, int)
+        n = len(parent)
+        full = lambda v: np.nan_to_num(np.broadcast_to(np.asarray(v, float), (n,)).copy())
+        self.n, self.parent = n, parent
+        self.L, self.K = full(length), full(K)
+        self.d, self.w, self.h = full(diameter_mm), full(width_mm), full(height_mm)
+        self.terminal_pa = full(terminal_pa)
+        self.eps, self.rho, self.mu, self.mode = eps, rho, mu, mode
+        self.root, self.order, self.tin, self.tout, self.leaf = euler_tour(parent)
+        self.terminal = np.where(self.leaf, full(terminal_flow_ls), 0.0)
+        self.recompute()
+
+    def _section_pt(self, idx):
+        rect = (self.w[idx] > 0) & (self.h[idx] > 0)
+        A, De = geometry(~rect, np.where(rect, self.w[idx], self.d[idx]), np.where(rect, self.h[idx], self.d[idx]))
+        r = duct_drops(self.flow[idx], A, De, eps=self.eps, rho=self.rho, mu=self.mu, L=self.L[idx],
+                       mode=self.mode)
+        self.v[idx] = r["V"]
+        pt = r["Pa_total"] + self.K[idx]*velocity_pressure(self.rho, r["V"])
+        return np.where(idx == self.root, 0.0, pt)
+
+    def recompute(self):
+        """Full pass: section flows and losses, and fan → node cumulative total pressure loss."""
+        self.flow = subtree_sums(self.order, self.tin, self.tout, self.terminal)  # L/s
+        self.v = np.zeros(self.n)
+        self.pt = self._section_pt(np.arange(self.n))
+        self.cum = path_sums(self.tin, self.tout, self.pt)
+
+    def set_section(self, i, *, length=None, K=None, diameter_mm=None, width_mm=None, height_mm=None):
+        """Edit section i; only the cumulative losses in i's subtree change."""
+        for arr, v in ((self.L, length), (self.K, K), (self.d, diameter_mm), (self.w, width_mm),
+                       (self.h, height_mm)):
+            if v is not None:
+                arr[i] = v
+        new = float(self._section_pt(np.array([i]))[0])
+        delta, self.pt[i] = new - self.pt[i], new
+        self.cum[self.order[self.tin[i]:self.tout[i]]] += delta
+
+    def set_flow(self, j, flow_ls):
+        """Edit a terminal flow; flows and losses change only along j's path to the fan."""
+        dq = flow_ls - self.terminal[j]
+        self.terminal[j] = flow_ls
+        path = path_to_root(self.parent, j)
+        self.flow[path] += dq
+        old = self.pt[path].copy()
+        self.pt[path] = self._section_pt(path)
+        delta = np.zeros(self.n)
+        delta[path] = self.pt[path] - old
+        self.cum += path_sums(self.tin, self.tout, delta)
+
+    def index_run(self):
+        """(index terminal, fan total pressure Pa, path from fan to terminal)."""
+        total = np.where(self.leaf, self.cum + self.terminal_pa, -np.inf)
+        j = int(np.argmax(total))
+        return j, float(total[j]), path_to_root(self.parent, j)[::-1].tolist()
+
+def random_duct_tree(n, rng=None):
+    """Test supply tree: n nodes, mains with side branches, terminal flows on the leaves."""
+    rng = np.random.default_rng(0) if rng is None else rng
+    parent = np.empty(n, int)
+    parent[0] = -1
+    # each node hangs off one a little earlier in the list: depth grows with log n
+    parent[1:] = np.minimum((np.arange(1, n)*rng.uniform(0.3, 1.0, n - 1)).astype(int), np.arange(n - 1))
+    leaf = np.ones(n, bool)
+    leaf[parent[1:]] = False
+    # straight-through runs (the first child of each node) lose little; takeoffs lose more
+    first = np.zeros(n, bool)
+    first[np.unique(parent[1:], return_index=True)[1] + 1] = True
+    K = np.where(first, rng.uniform(0.05, 0.3, n), rng.uniform(0.3, 1.0, n))
+    return dict(parent=parent, length=rng.uniform(2.0, 8.0, n), K=K,
+                terminal_flow_ls=np.where(leaf, rng.uniform(50.0, 300.0, n), 0.0))
+
+
+if __name__ == "__main__":
+    # Static regain: below the first sections every exactly-sized section balances its regain
+    # against its losses, so the static pressure stays level down each branch; plus timing.
+    # Run: python -m apps.shared.duct_tree
+    import time
+    for n in (100, 1000, 10000):
+        net = random_duct_tree(n)
+        t0 = time.perf_counter()
+        exact = static_regain(**net, v_min=2.0, sizes_mm=None)
+        s_exact = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        std = static_regain(**net, v_min=2.0)
+        s_std = time.perf_counter() - t0
+        p = net["parent"]
+        below = exact["depth"] >= 2
+        step = exact["static"][below] - exact["static"][p[below]]
+        held = np.isclose(exact["v"][below], 2.0)
+        assert np.max(np.abs(step[~held])) < 1e-6 and np.all(step[held] < 1e-9)
+        # rounding up lowers velocities: more regain, so only sections held at v_min lose static
+        step = std["static"][below] - std["static"][p[below]]
+        d = std["d_exact_mm"][below]/1000.0
+        held_std = np.isclose(std["flow_ls"][below]/1000.0/(np.pi*d*d/4.0), 2.0)
+        assert np.all(step[~held_std] > -1e-9) and np.all(std["d_mm"] >= std["d_exact_mm"] - 1e-6)
+        print(f"{n:6d} nodes, {exact['depth'].max():3d} levels   exact {s_exact*1e3:6.1f} ms   "
+              f"standard sizes {s_std*1e3:6.1f} ms   {held.mean()*100:3.0f} % of sections held at v_min")
+
+    # DuctTree on the regain-sized trees: incremental edits against a full rebuild, plus timing
+    rng = np.random.default_rng(1)
+    for n in (1000, 5000, 20000):
+        net = random_duct_tree(n)
+        sized = static_regain(**net, v_min=2.0)
+        t0 = time.perf_counter()
+        tree = DuctTree(net["parent"], net["length"], net["K"], net["terminal_flow_ls"],
+                        diameter_mm=sized["d_mm"], terminal_pa=25.0)
+        build = (time.perf_counter() - t0)*1e3
+        # the regain sizing and the network agree on every section loss
+        assert np.allclose(tree.pt, sized["friction"] + sized["fitting"])
+        edits = rng.integers(1, n, 200)
+        t0 = time.perf_counter()
+        for i in edits:
+            tree.set_section(int(i), K=float(rng.uniform(0.05, 1.0)))
+        t_sec = (time.perf_counter() - t0)/len(edits)*1e6
+        leaves = rng.choice(np.flatnonzero(tree.leaf), 200)
+        t0 = time.perf_counter()
+        for j in leaves:
+            tree.set_flow(int(j), float(rng.uniform(50.0, 300.0)))
+        t_flow = (time.perf_counter() - t0)/len(leaves)*1e6
+        t0 = time.perf_counter()
+        term, fan_pa, path = tree.index_run()
+        t_idx = (time.perf_counter() - t0)*1e6
+        ref = DuctTree(tree.parent, tree.L, tree.K, tree.terminal, diameter_mm=tree.d, terminal_pa=25.0)
+        err = np.max(np.abs(ref.cum - tree.cum))
+        assert err < 1e-6*ref.cum.max() and ref.index_run()[0] == term
+        print(f"{n:6d} sections  build {build:5.1f} ms  section edit {t_sec:5.1f} µs  "
+              f"flow edit {t_flow:6.1f} µs  index run {t_idx:5.0f} µs  "
+              f"(fan {fan_pa:.0f} Pa over {len(path) - 1} sections; drift {err:.1e} Pa)")
@@ -0,0 +1,482 @@
+# apps/shared/ducts.py
+# Straight-duct physics for the ductulator and the duct tools built on it. The scalar
+# helpers serve the single-duct form; the array versions take whole columns of a duct
+# schedule (flows, shapes, sizes) and run velocity, Re, f and Pa/m in one NumPy pass.
+import io
+import math
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from apps.shared.friction import MODES, darcy_f
+from apps.shared.air import air_props_array
+
+RHO_AIR = 1.2     # kg/m^3 @ ~20°C
+MU_AIR  = 1.8e-5  # Pa·s   @ ~20°C
+RE_LAM  = 2000.0  # laminar below this Re in ducts
+
+ROUGHNESS_PRESETS = {
+    "Galvanized steel (0.15 mm)": 0.00015,
+    "Spiral steel (0.09 mm)":     0.00009,
+    "Flexible duct (~1.0 mm)":    0.00100,
+    "Custom…":                    None,
+}
+
+# What the browser-side ductulator (apps/assets/ducts.js) takes from here
+JS_CONSTANTS = {"presets": ROUGHNESS_PRESETS, "modes": MODES, "re_lam": RE_LAM,
+                "rho": RHO_AIR, "mu": MU_AIR, "eps": 0.00015}
+
+# Design limits from the ductwork rules: duty -> (label, max Pa/m, max m/s); inf = no limit
+DUCT_LIMITS = {
+    "supply":   ("Supply",          1.2,    7.0),
+    "return":   ("Return",          1.2,    6.5),
+    "exhaust":  ("Exhaust",         np.inf, 6.5),
+    "flexible": ("Flexible supply", np.inf, 3.5),
+}
+TARGET_PA_M = 1.0  # constant pressure gradient method
+
+# Standard sizes: spiral circular Ø (mm) and a rectangular side grid within an aspect limit
+CIRCULAR_MM = (80, 100, 125, 150, 160, 200, 250, 300, 315, 355, 400, 450, 500, 560, 600, 630,
+               710, 800, 900, 1000, 1120, 1250)
+RECT_SIDES_MM = tuple(range(100, 2501, 50))
+MAX_ASPECT = 4.0
+
+# ------------------ Single duct ------------------
+def area_m2(shape: str, a_mm: float, b_mm: float | None = None) -> float:
+    if shape == "circular":
+        D = (a_mm or 0.0) / 1000.0
+        return math.pi * (D**2) / 4.0
+    a = (a_mm or 0.0) / 1000.0
+    b = (b_mm or 0.0) / 1000.0
+    return a * b
+
+def equiv_diameter_m(shape: str, a_mm: float, b_mm: float | None = None) -> float:
+    if shape == "circular":
+        return (a_mm or 0.0) / 1000.0
+    a = (a_mm or 0.0) / 1000.0
+    b = (b_mm or 0.0) / 1000.0
+    if a + b == 0:
+        return 0.0
+    # ASHRAE equal-friction equivalent diameter
+    return 1.30 * (a * b) ** 0.625 / (a + b) ** 0.25
+
+def velocity_ms(flow_ls: float, area: float) -> float:
+    Q = (flow_ls or 0.0) / 1000.0  # m³/s
+    return 0.0 if area <= 0 else Q / area
+
+def velocity_pressure(rho, v):
+    """p_v = ½ρv² (Pa); broadcasts over arrays."""
+    return 0.5 * rho * v * v
+
+def friction_f(Re: float, eps: float, D: float, mode: str = "swamee_jain") -> float:
+    if Re <= 0 or D <= 0: return 0.0
+    return float(darcy_f(Re, eps, D, mode, re_lam=RE_LAM))
+
+def swamee_jain_f(Re: float, eps: float, D: float) -> float:
+    return friction_f(Re, eps, D, "swamee_jain")
+
+def duct_drop(flow_ls: float, area: float, D: float, *, eps=0.00015, rho=RHO_AIR, mu=MU_AIR, L=1.0,
+              mode="swamee_jain"):
+    """Return (Pa_per_m, Pa_total, V, Re, f) for straight duct."""
+    V  = velocity_ms(flow_ls, area)
+    Re = 0.0 if V == 0 else rho * V * D / mu
+    f  = friction_f(Re, eps, D, mode)
+    pa_per_m = 0.0 if D == 0 else f * (rho * V * V) / (2.0 * D)
+    return pa_per_m, pa_per_m * L, V, Re, f
+
+# ------------------ Arrays ------------------
+def geometry(circular, a_mm, b_mm=None):
+    """(area m², equivalent Ø m) for arrays of ducts; circular is a boolean mask, a is Ø or width."""
+    a = np.asarray(a_mm, float) / 1000.0
+    b = a if b_mm is None else np.asarray(b_mm, float) / 1000.0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        De_rect = np.where(a + b > 0, 1.30 * (a * b) ** 0.625 / np.maximum(a + b, 1e-12) ** 0.25, 0.0)
+    A = np.where(circular, np.pi * a * a / 4.0, a * b)
+    De = np.where(circular, a, De_rect)
+    return A, De
+
+def duct_drops(flow_ls, area, D, *, eps=0.00015, rho=RHO_AIR, mu=MU_AIR, L=1.0, mode="swamee_jain"):
+    """Array duct_drop: dict of Pa_per_m, Pa_total, V, Re, f. Every argument broadcasts,
+    so ρ and μ may be per-row arrays; zero area or Ø gives zeros, as in the scalar form."""
+    flow, area, D = np.broadcast_arrays(np.asarray(flow_ls, float), np.asarray(area, float),
+                                        np.asarray(D, float))
+    ok = (area > 0) & (D > 0)
+    V = np.where(ok, flow / 1000.0 / np.where(ok, area, 1.0), 0.0)
+    Re = rho * V * D / mu
+    f = darcy_f(Re, eps, np.where(ok, D, 1.0), mode, re_lam=RE_LAM)
+    pa_per_m = np.where(ok, f * rho * V * V / (2.0 * np.where(ok, D, 1.0)), 0.0)
+    return {"Pa_per_m": pa_per_m, "Pa_total": pa_per_m * L, "V": V, "Re": Re, "f": f}
+
+# ------------------ Sizing ------------------
+@lru_cache(maxsize=8)
+def size_catalogue(shape="both", max_aspect=MAX_ASPECT):
+    """Candidate sizes as arrays (circular mask, a mm, b mm, area m², Dₑ m); width ≥ height for
+    rectangles. shape is circular, rectangular or both."""
+    a, b = [], []
+    if shape in ("circular", "both"):
+        a += list(CIRCULAR_MM); b += list(CIRCULAR_MM)
+    n_circ = len(a)
+    if shape in ("rectangular", "both"):
+        w, h = np.meshgrid(RECT_SIDES_MM, RECT_SIDES_MM, indexing="ij")
+        keep = (w >= h) & (w <= max_aspect*h)
+        a += w[keep].tolist(); b += h[keep].tolist()
+    circ = np.arange(len(a)) < n_circ
+    a, b = np.array(a, float), np.array(b, float)
+    A, De = geometry(circ, a, b)
+    return circ, a, b, A, De
+
+def size_ducts(flow_ls, duty="supply", *, shape="both", target=TARGET_PA_M, k=5, eps=0.00015,
+               rho=RHO_AIR, mu=MU_AIR, mode="swamee_jain", max_aspect=MAX_ASPECT, chunk=2000):
+    """Ranked sizes for each flow (L/s) under the duty's Pa/m and velocity limits.
+
+    Candidates within both limits are ranked by how close their gradient is to the target
+    (log ratio, so 0.8 and 1.25 Pa/m rank alike against 1.0), then by smaller perimeter.
+    Returns a dict of (n_flows, k) arrays: circular, a_mm, b_mm, de_mm, v, pa_m; NaN/False
+    pads rows with fewer than k sizes inside the limits.
+    """
+    _, max_dp, max_v = DUCT_LIMITS[duty]
+    circ, a, b, A, De = size_catalogue(shape, max_aspect)
+    perim = np.where(circ, np.pi*a, 2.0*(a + b))
+    Q = np.atleast_1d(np.asarray(flow_ls, float))
+    k = min(k, len(a))
+    idx = np.zeros((len(Q), k), int)
+    ok = np.zeros((len(Q), k), bool)
+    V_out, dp_out = np.full((len(Q), k), np.nan), np.full((len(Q), k), np.nan)
+    rows = np.arange(min(chunk, len(Q)))[:, None]
+    for s in range(0, len(Q), chunk):
+        q = Q[s:s + chunk, None]
+        r = duct_drops(q, A, De, eps=eps, rho=rho, mu=mu, mode=mode)
+        fits = (r["Pa_per_m"] <= max_dp) & (r["V"] <= max_v) & (q > 0)
+        # perimeter breaks ties at ~1e-6 of a decade, far below any real gradient difference
+        score = np.abs(np.log(np.maximum(r["Pa_per_m"], 1e-12)/target)) + 1e-9*perim
+        score = np.where(fits, score, np.inf)
+        top = np.argpartition(score, k - 1, axis=1)[:, :k] if k < len(a) else np.tile(np.arange(k), (len(q), 1))
+        rr = rows[:len(q)]
+        top = np.take_along_axis(top, np.argsort(score[rr, top], axis=1), axis=1)
+        idx[s:s + chunk], ok[s:s + chunk] = top, np.isfinite(score[rr, top])
+        V_out[s:s + chunk], dp_out[s:s + chunk] = r["V"][rr, top], r["Pa_per_m"][rr, top]
+    pad = lambda x: np.where(ok, x, np.nan)
+    return {"circular": circ[idx] & ok, "a_mm": pad(a[idx]), "b_mm": pad(b[idx]),
+            "de_mm": pad(De[idx]*1000.0), "v": pad(V_out), "pa_m": pad(dp_out), "ok": ok}
+
+# ------------------ Rectangular equivalents ------------------
+@lru_cache(maxsize=4)
+def rect_index(max_aspect=MAX_ASPECT):
+    """Standard rectangles (width ≥ height) sorted by ASHRAE equivalent Ø: (De mm, w mm, h mm, area m²)."""
+    circ, a, b, A, De = size_catalogue("rectangular", max_aspect)
+    order = np.argsort(De, kind="stable")
+    return De[order]*1000.0, a[order], b[order], A[order]
+
+@lru_cache(maxsize=4)
+def _rect_start_factor(max_aspect=MAX_ASPECT):
+    # Pa/m ∝ f/(A²·Dₑ): a rectangle with r times the area of the circle of its own Dₑ meets
+    # a gradient at Dₑ ≈ D·r^(−2/5); the largest r (flattest duct) bounds how far below the
+    # circular Ø a passing rectangle can sit. 1 % margin for f's weak dependence on Ø.
+    de, w, h, A = rect_index(max_aspect)
+    return 0.99*float(np.max(A/(np.pi*(de/1000.0)**2/4.0)))**-0.4
+
+def rect_equivalents(d_mm, tol_pct=5.0, max_aspect=MAX_ASPECT):
+    """Rectangles whose equivalent Ø is within ±tol_pct of d_mm, nearest first: dict of arrays."""
+    de, w, h, A = rect_index(max_aspect)
+    lo = np.searchsorted(de, d_mm*(1.0 - tol_pct/100.0), side="left")
+    hi = np.searchsorted(de, d_mm*(1.0 + tol_pct/100.0), side="right")
+    sel = lo + np.argsort(np.abs(de[lo:hi] - d_mm), kind="stable")
+    return {"de_mm": de[sel], "width_mm": w[sel], "height_mm": h[sel], "aspect": w[sel]/h[sel]}
+
+def count_equivalents(d_mm, tol_pct=5.0, max_aspect=MAX_ASPECT):
+    """Number of standard rectangles within ±tol_pct of each Ø in d_mm (two binary searches per Ø)."""
+    de = rect_index(max_aspect)[0]
+    d = np.asarray(d_mm, float)
+    return (np.searchsorted(de, d*(1.0 + tol_pct/100.0), side="right")
+            - np.searchsorted(de, d*(1.0 - tol_pct/100.0), side="left"))
+
+def circular_for_gradient(flow_ls, max_pa_m, *, eps=0.00015, rho=RHO_AIR, mu=MU_AIR, mode="swamee_jain",
+                          iters=45):
+    """Circular Ø (mm) running at exactly max_pa_m for each flow; Pa/m falls as Ø grows."""
+    Q = np.atleast_1d(np.asarray(flow_ls, float))
+    lo, hi = np.full(Q.shape, np.log(0.01)), np.full(Q.shape, np.log(10.0))
+    for _ in range(iters):
+        mid = 0.5*(lo + hi)
+        D = np.exp(mid)
+        dp = duct_drops(Q, np.pi*D*D/4.0, D, eps=eps, rho=rho, mu=mu, mode=mode)["Pa_per_m"]
+        high = dp > max_pa_m
+        lo = np.where(high, mid, lo)
+        hi = np.where(high, hi, mid)
+    return np.exp(0.5*(lo + hi))*1000.0
+
+def nearest_rect_for_flow(flow_ls, max_pa_m, *, eps=0.00015, rho=RHO_AIR, mu=MU_AIR, mode="swamee_jain",
+                          max_aspect=MAX_ASPECT, window=64):
+    """Smallest standard rectangle (by equivalent Ø) at ≤ max_pa_m for each flow.
+
+    The circular Ø for the gradient, scaled down by the flattest rectangle's area advantage,
+    gives the start position in the sorted index by binary search; friction is then checked
+    exactly over `window` entries at a time, sliding on for the flows with no pass until the
+    index runs out. Returns a dict of arrays (NaN where no standard rectangle passes).
+    """
+    de, w, h, A = rect_index(max_aspect)
+    Q = np.atleast_1d(np.asarray(flow_ls, float))
+    d = circular_for_gradient(Q, max_pa_m, eps=eps, rho=rho, mu=mu, mode=mode)
+    pos = np.searchsorted(de, _rect_start_factor(max_aspect)*d)
+    pick, pa_m = np.full(len(Q), -1), np.full(len(Q), np.nan)
+    todo = np.flatnonzero(pos < len(de))
+    while len(todo):
+        cand = pos[todo][:, None] + np.arange(window)
+        inside = cand < len(de)
+        cand = np.minimum(cand, len(de) - 1)
+        dp = duct_drops(Q[todo][:, None], A[cand], de[cand]/1000.0, eps=eps, rho=rho, mu=mu, mode=mode)["Pa_per_m"]
+        fits = (dp <= max_pa_m) & inside
+        rows, first = np.arange(len(todo)), np.argmax(fits, axis=1)
+        hit = fits[rows, first]
+        pick[todo[hit]], pa_m[todo[hit]] = cand[rows, first][hit], dp[rows, first][hit]
+        pos[todo] += window
+        todo = todo[~hit & (pos[todo] < len(de))]
+    ok = pick >= 0
+    pad = lambda x: np.where(ok, x, np.nan)
+    return {"width_mm": pad(w[pick]), "height_mm": pad(h[pick]), "de_mm": pad(de[pick]),
+            "v": pad(Q/1000.0/A[pick]), "pa_m": pa_m}
+
+# ------------------ Duct schedules ------------------
+SCHEDULE_COLUMNS = ["id", "shape", "flow_ls", "diameter_mm", "width_mm", "height_mm", "length_m"]
+
+def parse_schedule_csv(text):
+    """Duct schedule from CSV text. shape is circular/rectangular (c/r); if the column is
+    missing, rows with width and height are rectangular and the rest circular."""
+    df = pd.read_csv(io.StringIO(text))
+    df.columns = [c.strip().lower() for c in df.columns]
+    if "flow_ls" not in df.columns:
+        raise ValueError("Missing column: flow_ls")
+    if "diameter_mm" not in df.columns and not {"width_mm", "height_mm"} <= set(df.columns):
+        raise ValueError("Need diameter_mm, or width_mm and height_mm")
+    if "id" not in df.columns:
+        df.insert(0, "id", np.arange(1, len(df) + 1))
+    num = [c for c in SCHEDULE_COLUMNS[2:] if c in df.columns]
+    df[num] = df[num].apply(pd.to_numeric, errors="coerce")
+    for c in SCHEDULE_COLUMNS[3:]:
+        if c not in df.columns:
+            df[c] = np.nan
+    df["length_m"] = df["length_m"].fillna(1.0)
+    if "shape" in df.columns:
+        df["shape"] = np.where(df["shape"].astype(str).str.strip().str.lower().str.startswith("r"),
+                               "rectangular", "circular")
+    else:
+        df["shape"] = np.where(df["width_mm"].notna() & df["height_mm"].notna(), "rectangular", "circular")
+    return df[SCHEDULE_COLUMNS + [c for c in df.columns if c not in SCHEDULE_COLUMNS]]
+
+def schedule_air(df, rho=RHO_AIR, mu=MU_AIR, t_c=20.0, altitude_m=0.0):
+    """Per-row ρ and μ: rows with temp_c or altitude_m take humid-air properties at those
+    conditions (the other one defaulting to t_c / altitude_m); the rest keep ρ and μ."""
+    if "temp_c" not in df and "altitude_m" not in df:
+        return rho, mu
+    col = lambda c: pd.to_numeric(df[c], errors="coerce").to_numpy(float) if c in df else np.full(len(df), np.nan)
+    t, z = col("temp_c"), col("altitude_m")
+    given = np.isfinite(t) | np.isfinite(z)
+    rho_a, mu_a = air_props_array(np.where(np.isfinite(t), t, t_c), np.where(np.isfinite(z), z, altitude_m))
+    return np.where(given, rho_a, rho), np.where(given, mu_a, mu)
+
+def schedule_results(df, *, eps=0.00015, rho=RHO_AIR, mu=MU_AIR, mode="swamee_jain"):
+    """Schedule with area, equivalent Ø, V, Re, f, VP, Pa/m and straight loss appended.
+    ρ and μ may be per-row arrays (see schedule_air). Rows missing a flow or a size come
+    back with blank results."""
+    circ = (df["shape"] == "circular").to_numpy()
+    a = np.where(circ, df["diameter_mm"].to_numpy(float), df["width_mm"].to_numpy(float))
+    b = np.where(circ, a, df["height_mm"].to_numpy(float))
+    flow = df["flow_ls"].to_numpy(float)
+    valid = np.isfinite(flow) & np.isfinite(a) & np.isfinite(b) & (a > 0) & (b > 0)
+    A, De = geometry(circ, np.where(valid, a, 0.0), np.where(valid, b, 0.0))
+    r = duct_drops(np.where(valid, flow, 0.0), A, De, eps=eps, rho=rho, mu=mu,
+                   L=df["length_m"].to_numpy(float), mode=mode)
+    blank = lambda x: np.where(valid, x, np.nan)
+    out = df.copy()
+    out["area_m2"] = blank(A)
+    out["de_mm"] = blank(De * 1000.0)
+    out["velocity_ms"] = blank(r["V"])
+    out["re"] = blank(r["Re"])
+    out["f"] = blank(r["f"])
+    out["vp_pa"] = blank(velocity_pressure(rho, r["V"]))
+    out["pa_per_m"] = blank(r["Pa_per_m"])
+    out["loss_pa"] = blank(r["Pa_total"])
+    return out
+
+
+if __name__ == "__main__":
+    # Parity with the scalar duct_drop and schedule throughput.
+    # Run: python -m apps.shared.ducts
+    import time
+    rng = np.random.default_rng(0)
+    n = 1_000_000
+    circ = rng.random(n) < 0.5
+    df = pd.DataFrame({
+        "id": np.arange(n),
+        "shape": np.where(circ, "circular", "rectangular"),
+        "flow_ls": rng.uniform(20.0, 5000.0, n),
+        "diameter_mm": np.where(circ, rng.choice(np.arange(100, 1300, 25), n), np.nan),
+        "width_mm": np.where(circ, np.nan, rng.choice(np.arange(150, 2000, 50), n)),
+        "height_mm": np.where(circ, np.nan, rng.choice(np.arange(100, 1000, 50), n)),
+        "length_m": rng.uniform(1.0, 30.0, n),
+    })
+    for mode in ("swamee_jain", "colebrook"):
+        t0 = time.perf_counter()
+        out = schedule_results(df, mode=mode)
+        s = time.perf_counter() - t0
+        k = 20_000
+        t0 = time.perf_counter()
+        ref = np.empty(k)
+        for i, row in enumerate(df.head(k).itertuples(index=False)):
+            dims = (row.diameter_mm,) if row.shape == "circular" else (row.width_mm, row.height_mm)
+            A, D = area_m2(row.shape, *dims), equiv_diameter_m(row.shape, *dims)
+            ref[i] = duct_drop(row.flow_ls, A, D, L=row.length_m, mode=mode)[1]
+        s_ref = time.perf_counter() - t0
+        err = np.max(np.abs(out["loss_pa"].to_numpy()[:k] / ref - 1.0))
+        print(f"{mode:<12} {n:,} rows in {s*1e3:6.0f} ms = {n/s/1e6:.2f} M rows/s   "
+              f"scalar loop {k/s_ref/1e3:.0f} k rows/s   max rel diff {err:.1e}")
+    # per-row air conditions: a few distinct states, so a handful of CoolProp calls
+    df["temp_c"] = rng.choice([13.0, 16.0, 18.0, 35.0], n)
+    df["altitude_m"] = rng.choice([0.0, 1600.0], n)
+    t0 = time.perf_counter()
+    rho_rows, mu_rows = schedule_air(df)
+    out = schedule_results(df, rho=rho_rows, mu=mu_rows)
+    s = time.perf_counter() - t0
+    print(f"per-row air (temp_c, altitude_m) {n:,} rows in {s*1e3:.0f} ms = {n/s/1e6:.2f} M rows/s")
+    df = df.drop(columns=["temp_c", "altitude_m"])
+
+    # end to end as the page runs it: parse, compute, write
+    k = 100_000
+    text = df.head(k).to_csv(index=False)
+    t0 = time.perf_counter()
+    out = schedule_results(parse_schedule_csv(text))
+    t1 = time.perf_counter()
+    csv = out.to_csv(index=False, float_format="%.6g")
+    t2 = time.perf_counter()
+    print(f"CSV round trip {k:,} rows: parse + compute {(t1 - t0)*1e3:.0f} ms, write {(t2 - t1)*1e3:.0f} ms "
+          f"({len(csv)/1e6:.1f} MB) = {k/(t2 - t0)/1e3:.0f} k rows/s")
+
+    # Inverse sizing: every candidate satisfies the limits, and no size inside the limits is
+    # closer to the target than the first-ranked one (brute force over the catalogue)
+    for shape in ("circular", "both"):
+        flows = rng.uniform(30.0, 8000.0, 10_000)
+        t0 = time.perf_counter()
+        res = size_ducts(flows, "supply", shape=shape)
+        s = time.perf_counter() - t0
+        assert np.all(res["pa_m"][res["ok"]] <= 1.2 + 1e-12) and np.all(res["v"][res["ok"]] <= 7.0 + 1e-12)
+        circ, a, b, A, De = size_catalogue(shape)
+        for q, best in zip(flows[:200], res["pa_m"][:200, 0]):
+            dp = np.array([duct_drop(q, Ai, Di)[0] for Ai, Di in zip(A, De)])
+            v = q/1000.0/A
+            fit = (dp <= 1.2) & (v <= 7.0)
+            if fit.any():
+                assert abs(np.log(best)) <= np.min(np.abs(np.log(dp[fit]))) + 1e-6
+        print(f"size_ducts {shape:<8} {len(flows):,} flows × {len(a)} sizes in {s*1e3:.0f} ms "
+              f"({len(flows)/s/1e3:.0f} k flows/s), {res['ok'][:, 0].mean()*100:.0f} % sized")
+
+    # Rectangular index: binary-search queries against a brute-force scan of the catalogue
+    de, w, h, A = rect_index()
+    ds = np.linspace(150.0, 2000.0, 10_000)
+    t0 = time.perf_counter()
+    for d in ds[:2000]:
+        rect_equivalents(d, 5.0)
+    s_eq = (time.perf_counter() - t0)/2000
+    t0 = time.perf_counter()
+    for d in ds[:2000]:
+        hit = np.flatnonzero(np.abs(de/d - 1.0) <= 0.05)
+        hit[np.argsort(np.abs(de[hit] - d), kind="stable")]
+    s_scan = (time.perf_counter() - t0)/2000
+    t0 = time.perf_counter()
+    counts = count_equivalents(ds, 5.0)
+    s_batch = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    brute = np.count_nonzero(np.abs(de[None, :]/ds[:, None] - 1.0) <= 0.05, axis=1)
+    s_brute = time.perf_counter() - t0
+    assert np.array_equal(counts, brute)
+    print(f"rect index {len(de)} sizes   equivalents ±5 %: one Ø {s_eq*1e6:.1f} µs (scan {s_scan*1e6:.1f} µs), "
+          f"10k Ø batch {s_batch*1e3:.2f} ms (scan {s_brute*1e3:.0f} ms)")
+    flows = rng.uniform(30.0, 8000.0, 10_000)
+    t0 = time.perf_counter()
+    near = nearest_rect_for_flow(flows, 1.0)
+    s_near = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    full = duct_drops(flows[:, None], A, de/1000.0)["Pa_per_m"]
+    s_full = time.perf_counter() - t0
+    fits = full <= 1.0
+    best = np.where(fits.any(axis=1), de[np.argmax(fits, axis=1)], np.nan)
+    assert np.array_equal(near["de_mm"], best, equal_nan=True)
+    print(f"nearest rectangle at ≤ 1 Pa/m: 10k flows {s_near*1e3:.0f} ms (scan of every size "
+          f"{s_full*1e3:.0f} ms), identical picks")
+    # the start position never skips a passing size, across gradients, roughness, friction
+    # modes and flows from 1 L/s to beyond the largest rectangle; offsets past the first
+    # window show the slide at work
+    flows = np.concatenate([np.geomspace(1.0, 200_000.0, 3000), rng.uniform(1.0, 60_000.0, 1000)])
+    lo_off, hi_off, n_none, n_cases = np.inf, -np.inf, 0, 0
+    for max_pa_m in (0.1, 0.3, 0.6, 1.0, 2.0, 5.0, 10.0):
+        for eps in (0.0, 0.00009, 0.00015, 0.001):
+            for mode in ("swamee_jain", "colebrook"):
+                near = nearest_rect_for_flow(flows, max_pa_m, eps=eps, mode=mode)
+                fits = duct_drops(flows[:, None], A, de/1000.0, eps=eps, mode=mode)["Pa_per_m"] <= max_pa_m
+                first = np.where(fits.any(axis=1), np.argmax(fits, axis=1), -1)
+                best = np.where(first >= 0, de[first], np.nan)
+                assert np.array_equal(near["de_mm"], best, equal_nan=True), (max_pa_m, eps, mode)
+                d = circular_for_gradient(flows, max_pa_m, eps=eps, mode=mode)
+                off = (first - np.searchsorted(de, _rect_start_factor()*d))[first >= 0]
+                lo_off, hi_off = min(lo_off, off.min()), max(hi_off, off.max())
+                n_none += int(np.sum(first < 0))
+                n_cases += len(flows)
+    assert lo_off >= 0
+    print(f"nearest rectangle vs brute force: {n_cases:,} cases (7 gradients × 4 roughnesses × 2 modes, "
+          f"1–200k L/s) identical; first pass {lo_off}…{hi_off} entries after the start, "
+          f"{n_none:,} flows with no passing size")
+
+    # Browser-side ductulator (apps/assets/ducts.js) against the Python on a shared grid:
+    # friction, Pa/m, V, Re, fitting loss and the displayed number formats
+    import itertools, json, os, shutil, subprocess, sys
+    node = shutil.which("node")
+    if node is None:
+        # ducts.js is the only implementation behind the ductulator card: never pass unchecked
+        sys.exit("JS parity check needs Node.js: put `node` on PATH and re-run python -m apps.shared.ducts")
+    js = os.path.join(os.path.dirname(__file__), "..", "assets", "ducts.js")
+    sizes = [("circular", 100, None), ("circular", 350, None), ("circular", 1250, None),
+             ("rectangular", 400, 250), ("rectangular", 1200, 300), ("rectangular", 150, 100)]
+    drops = []
+    for (shape, a, b), q, eps, (rho, mu), mode in itertools.product(
+            sizes, [0.0, 3.0, 40.0, 600.0, 4500.0], [0.0, 0.00009, 0.00015, 0.001],
+            [(RHO_AIR, MU_AIR), (0.9325, 1.871e-5)], MODES):
+        drops.append([shape, a, b, q, eps, rho, mu, 10.0, mode])
+    fits = [list(c) for c in itertools.product([0.9, 1.2], [0.0, 0.5, 3.5, 12.7], [0.0, 0.17, 1.5])]
+    gs = [0.0, 1.8e-5, 1.81e-05, 1.8712e-5, 1e-4, 0.5, 100.0, 123456.0, 1234567.0]
+    harness = """
+        global.window = {dash_clientside: {no_update: null}};
+        require(process.argv[1]);
+        const du = window.dash_clientside.ducts, c = JSON.parse(require("fs").readFileSync(0, "utf8"));
+        const drop = c.drops.map(([shape, a, b, q, eps, rho, mu, L, mode]) => {
+            const [A, D] = du.geometry(shape, a, b);
+            const r = du.drop(q, A, D, eps, rho, mu, L, mode, c.re_lam);
+            return [A, D, r.pa_m, r.pa_total, r.V, r.Re, r.f,
+                    du.fixed(r.pa_m, 3), du.fixed(r.Re, 0, true), du.fixed(r.f, 5)];
+        });
+        const fit = c.fits.map(([rho, v, k]) => {
+            const r = du.fitting(rho, v, k);
+            return [r.vp, r.dp, du.fixed(r.vp, 2, true), du.fixed(r.dp / 1000, 3)];
+        });
+        const card = du.ductulator(1, 600, "circular", 350, null, null, 10, "Custom…", null,
+                                   1.2, 1.8e-5, "colebrook", c.consts)[1];
+        console.log(JSON.stringify({drop, fit, g: c.gs.map(du.g), card}));
+    """
+    t0 = time.perf_counter()
+    res = json.loads(subprocess.run(
+        [node, "-e", harness, os.path.abspath(js)], check=True, capture_output=True, text=True,
+        input=json.dumps({"drops": drops, "fits": fits, "gs": gs, "re_lam": RE_LAM,
+                          "consts": JS_CONSTANTS})).stdout)
+    s_js = time.perf_counter() - t0
+    worst = 0.0
+    for (shape, a, b, q, eps, rho, mu, L, mode), got in zip(drops, res["drop"]):
+        dims = (a,) if shape == "circular" else (a, b)
+        A, D = area_m2(shape, *dims), equiv_diameter_m(shape, *dims)
+        want = (A, D) + duct_drop(q, A, D, eps=eps, rho=rho, mu=mu, L=L, mode=mode)
+        worst = max(worst, max(abs(g - w)/max(abs(w), 1e-300) for g, w in zip(got[:7], want)))
+        assert got[7:] == [f"{want[2]:.3f}", f"{want[5]:,.0f}", f"{want[6]:.5f}"], (got, want)
+    assert worst < 1e-12, worst
+    for (rho, v, k), got in zip(fits, res["fit"]):
+        vp = velocity_pressure(rho, v)
+        assert got == [vp, k*vp, f"{vp:,.2f}", f"{k*vp/1000:.3f}"], (got, vp)
+    assert res["g"] == [f"{x:g}" for x in gs], res["g"]
+    V = duct_drop(600.0, area_m2("circular", 350), 0.35, mode="colebrook")[2]
+    assert res["card"] == round(V, 3)
+    print(f"JS parity: {len(drops)} duct cases (max rel diff {worst:.1e}), {len(fits)} fitting cases, "
+          f"{len(gs)} μ formats identical to Python ({s_js*1e3:.0f} ms incl. node start)")
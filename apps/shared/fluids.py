@@ -0,0 +1,108 @@
+# apps/shared/fluids.py
+# Liquid property tables for the hydronic pages: water and CoolProp incompressible
+# glycol mixtures. Density and viscosity are tabulated once per (fluid, concentration)
+# at 0.1 °C steps, kept on disk under the shared cache, and looked up with np.interp,
+# so a slider tick or fluid switch costs microseconds instead of CoolProp calls.
+from functools import lru_cache
+import numpy as np
+from CoolProp.CoolProp import PropsSI
+from apps.shared.cache import cache_path, save_npy
+
+P_REF = 101325.0  # Pa; liquid properties barely depend on pressure at plant conditions
+T_STEP = 0.1
+
+# key: (label, CoolProp name or INCOMP mixture code, table range °C)
+FLUIDS = {
+    "Water": ("Water", "Water", (0.0, 100.0)),
+    "MPG":   ("Propylene glycol", "MPG", (-40.0, 100.0)),
+    "MEG":   ("Ethylene glycol", "MEG", (-40.0, 100.0)),
+}
+CONCENTRATIONS = (10, 20, 25, 30, 35, 40, 50)  # % by mass, glycols only
+
+# at 1 atm, 0 °C sits on the melting line and 100 °C is past boiling (99.97 °C), so the
+# water end nodes sit just inside the liquid region (lookups beyond them clamp)
+T_FLOOR, T_CEIL = 0.01, 99.96
+
+def coolprop_name(fluid="Water", conc_pct=0):
+    code = FLUIDS[fluid][1]
+    return code if fluid == "Water" else f"INCOMP::{code}[{conc_pct/100.0:g}]"
+
+def _build(fluid, conc_pct):
+    lo, hi = FLUIDS[fluid][2]
+    T = np.round(np.arange(lo, hi + T_STEP/2, T_STEP), 2)
+    if fluid == "Water":
+        T = np.clip(T, T_FLOOR, T_CEIL)
+    name = coolprop_name(fluid, conc_pct)
+    rho = np.asarray(PropsSI("D", "T", T + 273.15, "P", P_REF, name), float)
+    mu = np.asarray(PropsSI("V", "T", T + 273.15, "P", P_REF, name), float)
+    # mixtures return inf below their freezing point: keep the liquid rows only
+    ok = np.isfinite(rho) & np.isfinite(mu)
+    return np.stack([T[ok], rho[ok], mu[ok]])
+
+@lru_cache(maxsize=32)
+def fluid_table(fluid="Water", conc_pct=0):
+    """(T °C, ρ kg/m³, μ Pa·s) arrays for one fluid — built on first use, then read from disk."""
+    conc_pct = 0 if fluid == "Water" else conc_pct
+    path = cache_path("fluids", f"{fluid}-{conc_pct:g}-{T_STEP:g}.npy")
+    if path.exists():
+        arr = np.load(path)
+    else:
+        arr = _build(fluid, conc_pct)
+        save_npy(path, arr)
+    return arr[0], arr[1], arr[2]
+
+def props(T_C, fluid="Water", conc_pct=0):
+    """ρ (kg/m³) and μ (Pa·s) at T_C (°C), scalar or array, clamped to the liquid table."""
+    T, rho, mu = fluid_table(fluid, conc_pct)
+    return np.interp(T_C, T, rho), np.interp(T_C, T, mu)
+
+def liquid_range(fluid="Water", conc_pct=0):
+    """(lowest, highest) tabulated temperature °C — the low end is the freezing point for glycols."""
+    T = fluid_table(fluid, conc_pct)[0]
+    return float(T[0]), float(T[-1])
+
+def water_table():
+    return fluid_table("Water")
+
+def water_props(T_C):
+    """ρ (kg/m³) and μ (Pa·s) of water at T_C (°C)."""
+    return props(T_C, "Water")
+
+
+if __name__ == "__main__":
+    # Table check against PropsSI off the grid nodes, lookup timing and the draw_chart callback.
+    # Run: python -m apps.shared.fluids
+    import time
+    rng = np.random.default_rng(0)
+    cases = [("Water", 0)] + [(f, c) for f in ("MPG", "MEG") for c in (20, 30, 40)]
+    for fluid, conc in cases:
+        fluid_table.cache_clear()
+        t0 = time.perf_counter()
+        lo, hi = liquid_range(fluid, conc)
+        load_ms = 1e3*(time.perf_counter() - t0)
+        Tq = rng.uniform(lo + 0.05, hi - 0.05, 500)
+        rho, mu = props(Tq, fluid, conc)
+        name = coolprop_name(fluid, conc)
+        rho_ref = np.array([PropsSI("D", "T", t + 273.15, "P", P_REF, name) for t in Tq])
+        mu_ref = np.array([PropsSI("V", "T", t + 273.15, "P", P_REF, name) for t in Tq])
+        err_rho = np.max(np.abs(rho/rho_ref - 1.0))
+        err_mu = np.max(np.abs(mu/mu_ref - 1.0))
+        print(f"{name:<18} {lo:6.1f}…{hi:5.1f} °C  table {load_ms:6.1f} ms  "
+              f"max rel err ρ {err_rho:.1e}  μ {err_mu:.1e}")
+        assert err_rho < 1e-5 and err_mu < 1e-4, f"{name} table too coarse"
+
+    Tq = rng.uniform(5.0, 60.0, 2000)
+    t0 = time.perf_counter()
+    for t in Tq:
+        props(t, "MPG", 30)
+    per_lookup = (time.perf_counter() - t0) / len(Tq) * 1e6
+    name = coolprop_name("MPG", 30)
+    t0 = time.perf_counter()
+    for t in Tq[:200]:
+        PropsSI("D", "T", t + 273.15, "P", P_REF, name); PropsSI("V", "T", t + 273.15, "P", P_REF, name)
+    per_props = (time.perf_counter() - t0) / 200 * 1e6
+    print(f"scalar lookup {per_lookup:.1f} µs vs PropsSI pair {per_props:.0f} µs")
+
+    # the pipe chart's draw_chart callback, end to end through the Dash test client
+    from apps import benchmarks
+    benchmarks.pipe()
@@ -0,0 +1,74 @@
+# apps/shared/friction.py
+# Darcy friction factor for pipes and ducts. Two explicit correlations (Haaland, used by
+# the pipe chart, and Swamee–Jain, used by the ductulator) and the Colebrook–White
+# equation itself, solved by vectorised Newton iteration. All take arrays.
+import numpy as np
+
+MODES = {
+    "haaland": "Haaland (explicit)",
+    "swamee_jain": "Swamee–Jain (explicit)",
+    "colebrook": "Colebrook–White (exact)",
+}
+
+LN10 = np.log(10.0)
+
+def haaland(Re, rel):
+    return (-1.8*np.log10((rel/3.7)**1.11 + 6.9/Re))**-2
+
+def swamee_jain(Re, rel):
+    return 0.25/np.log10(rel/3.7 + 5.74/Re**0.9)**2
+
+def colebrook(Re, rel, tol=1e-12, max_iter=10):
+    """Solve 1/√f = −2 log10(ε/3.7D + 2.51/(Re √f)) by Newton on x = 1/√f.
+
+    Starts from Swamee–Jain, which is within ~1 % of the root, so three steps reach
+    machine precision over the Moody range.
+    """
+    a, b = rel/3.7, 2.51/Re
+    x = 1.0/np.sqrt(swamee_jain(Re, rel))
+    for _ in range(max_iter):
+        inner = a + b*x
+        g = x + 2.0*np.log10(inner)
+        dx = g/(1.0 + 2.0*b/(inner*LN10))
+        x = x - dx
+        if np.max(np.abs(dx)/x, initial=0.0) < tol:
+            break
+    return 1.0/(x*x)
+
+_TURBULENT = {"haaland": haaland, "swamee_jain": swamee_jain, "colebrook": colebrook}
+
+def darcy_f(Re, eps, D, mode="haaland", re_lam=2300.0):
+    """Darcy f: 64/Re below re_lam, the chosen correlation above, 0 where there is no flow.
+
+    Re, eps (m) and D (m) broadcast against each other.
+    """
+    Re, rel = np.broadcast_arrays(np.asarray(Re, float), np.asarray(eps, float)/np.asarray(D, float))
+    f = np.zeros(Re.shape)
+    lam = (Re > 0) & (Re < re_lam)
+    f[lam] = 64.0/Re[lam]
+    tur = Re >= re_lam
+    f[tur] = _TURBULENT[mode](Re[tur], rel[tur])
+    return f
+
+
+if __name__ == "__main__":
+    # Throughput and error of each correlation against Colebrook solved to machine precision.
+    # Run: python -m apps.shared.friction
+    import time
+    rng = np.random.default_rng(0)
+    n = 1_000_000
+    Re = 10**rng.uniform(np.log10(4e3), 8.0, n)
+    rel = 10**rng.uniform(-6.0, np.log10(0.05), n)
+    ref = colebrook(Re, rel, tol=0.0, max_iter=30)
+    # residual of the reference in the Colebrook equation itself
+    resid = np.max(np.abs(1/np.sqrt(ref) + 2*np.log10(rel/3.7 + 2.51/(Re*np.sqrt(ref)))))
+    print(f"reference residual {resid:.1e}; {n:,} points, Re 4e3–1e8, ε/D 1e-6–0.05")
+    for mode, label in MODES.items():
+        fn = _TURBULENT[mode]
+        fn(Re[:1000], rel[:1000])
+        t0 = time.perf_counter()
+        f = fn(Re, rel)
+        s = time.perf_counter() - t0
+        err = np.abs(f/ref - 1.0)
+        print(f"{label:<26} {n/s/1e6:6.1f} M/s   max err {100*err.max():.3f} %   "
+              f"mean {100*err.mean():.3f} %")
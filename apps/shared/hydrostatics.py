@@ -0,0 +1,9 @@
+# apps/shared/hydrostatics.py
+# Static pressure relations shared by the water pages and the network models.
+import numpy as np
+
+G = 9.81  # m/s²
+
+def static_pressure(z_tank, z_point, rho, p_pump=0.0, p_loss=0.0):
+    """p_s = (Z_H − Z_A)·ρ·g + p_p − p_L in Pa; broadcasts over arrays of points."""
+    return (np.asarray(z_tank, float) - np.asarray(z_point, float))*rho*G + p_pump - p_loss
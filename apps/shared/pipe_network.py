@@ -0,0 +1,155 @@
+# apps/shared/pipe_network.py
+# Looped hydronic network solver (Todini–Pilati global gradient / sparse Newton).
+# Flows in every link and pressures at every node are solved together: each Newton step
+# is one sparse symmetric solve on the free nodes, so thousands of pipes take a few
+# iterations of milliseconds each. Pipes use the friction functions in apps.shared.pipes.
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import spsolve
+from apps.shared.pipes import friction_factor
+from apps.shared.hydrostatics import G
+Q_FLOOR = 1e-9  # m³/s; keeps the gradient finite for links with no flow
+RE_LAM, RE_TURB = 2000.0, 4000.0  # transition band bridged between laminar and Haaland
+
+def _pipe_loss(Q, L, D, eps, K, rho, mu, mode="haaland"):
+    """Pressure loss (Pa, signed with Q) and its slope dΔp/dQ for each pipe."""
+    A = np.pi*D*D/4.0
+    q = np.maximum(np.abs(Q), Q_FLOOR)
+    Re = rho*(q/A)*D/mu
+    f = friction_factor(Re, eps, D, mode)
+    # the laminar/turbulent jump at Re 2300 leaves no exact root for a pipe sitting on it;
+    # bridge 2000 < Re < 4000 linearly (EPANET does the same with a cubic)
+    tr = (Re > RE_LAM) & (Re < RE_TURB)
+    w = (Re - RE_LAM)/(RE_TURB - RE_LAM)
+    f_turb = friction_factor(np.full_like(Re, RE_TURB), eps, D, mode)
+    f = np.where(tr, (1.0 - w)*64.0/RE_LAM + w*f_turb, f)
+    r = (f*L/D + K)*rho/(2.0*A*A)
+    # laminar loss is linear in Q (f ∝ 1/Q), turbulent close to quadratic
+    slope = np.where(Re <= RE_LAM, 1.0, 2.0)*r*q
+    return r*Q*np.abs(Q), slope
+
+def solve(n_nodes, start, end, length, diameter, *, eps=4.6e-5, K=0.0, demand=None,
+          elevation=None, fixed=None, pumps=None, rho=999.7, mu=1.31e-3,
+          mode="haaland", tol=1e-6, max_iter=50):
+    """Steady flows and pressures in a pipe network.
+
+    Pipes run start[i] → end[i] (node indices); length and diameter in m, eps in m,
+    K the summed fitting loss coefficient per pipe. demand (L/s, + draws out) and
+    elevation (m) are per node. fixed maps node → pressure (Pa) and must hold at least
+    one node (a reservoir, or the expansion vessel of a closed loop). pumps is a dict
+    of arrays start, end, a0, a1, a2 for pressure gain a0 − a1·Q − a2·Q² (Pa, Q in m³/s).
+    mode picks the turbulent friction correlation (apps.shared.friction.MODES).
+
+    Returns a dict: Q (L/s per link, pipes then pumps, + in the start → end direction),
+    dp (Pa loss per link, negative for pumps), v (m/s per pipe), p (Pa per node),
+    iterations and converged.
+    """
+    start, end = np.asarray(start, int), np.asarray(end, int)
+    n_pipes = len(start)
+    L = np.broadcast_to(np.asarray(length, float), (n_pipes,))
+    D = np.broadcast_to(np.asarray(diameter, float), (n_pipes,))
+    K = np.broadcast_to(np.asarray(K, float), (n_pipes,))
+    pumps = pumps or {"start": [], "end": [], "a0": [], "a1": [], "a2": []}
+    p_start, p_end = np.asarray(pumps["start"], int), np.asarray(pumps["end"], int)
+    a0, a1, a2 = (np.asarray(pumps[k], float) for k in ("a0", "a1", "a2"))
+    links_from = np.concatenate([start, p_start])
+    links_to = np.concatenate([end, p_end])
+    n_links = len(links_from)
+
+    if not fixed:
+        raise ValueError("At least one node needs a fixed pressure.")
+    fixed_idx = np.fromiter(fixed, int)
+    free = np.setdiff1d(np.arange(n_nodes), fixed_idx)
+    d = np.zeros(n_nodes) if demand is None else np.asarray(demand, float)/1000.0
+    z = np.zeros(n_nodes) if elevation is None else np.asarray(elevation, float)
+
+    # incidence: −1 at a link's start node, +1 at its end; loss + A·p* = 0 on every link,
+    # where p* = p + ρgz is the piezometric pressure
+    rows = np.repeat(np.arange(n_links), 2)
+    cols = np.column_stack([links_from, links_to]).ravel()
+    vals = np.tile([-1.0, 1.0], n_links)
+    A = sp.csr_matrix((vals, (rows, cols)), shape=(n_links, n_nodes))
+    A_free, A_fixed = A[:, free].tocsc(), A[:, fixed_idx]
+    pstar_fixed = np.array([fixed[i] for i in fixed_idx]) + rho*G*z[fixed_idx]
+
+    Q = np.full(n_links, 1e-3)
+    pstar = np.zeros(n_nodes)
+    pstar[fixed_idx] = pstar_fixed
+    converged = False
+    for it in range(1, max_iter + 1):
+        loss, slope = np.empty(n_links), np.empty(n_links)
+        loss[:n_pipes], slope[:n_pipes] = _pipe_loss(Q[:n_pipes], L, D, eps, K, rho, mu, mode)
+        qp = Q[n_pipes:]
+        loss[n_pipes:] = -(a0 - a1*qp - a2*qp*np.abs(qp))
+        slope[n_pipes:] = a1 + 2.0*a2*np.abs(qp)
+        slope = np.maximum(slope, 1e-12)
+        # Newton step on [G dQ + A dp = −F ; Aᵀ dQ = d − Aᵀ Q], eliminating dQ
+        F = loss + A_free @ pstar[free] + A_fixed @ pstar_fixed
+        Ginv = 1.0/slope
+        M = (A_free.T @ sp.diags(Ginv) @ A_free).tocsc()
+        rhs = -(A_free.T @ (Ginv*F)) - (d[free] - A_free.T @ Q)
+        dp = spsolve(M, rhs, permc_spec="MMD_AT_PLUS_A")  # symmetric ordering suits the SPD system
+        dQ = -Ginv*(F + A_free @ dp)
+        pstar[free] += dp
+        Q += dQ
+        if np.abs(dQ).sum() <= tol*max(np.abs(Q).sum(), Q_FLOOR):
+            converged = True
+            break
+
+    A_p = np.pi*D*D/4.0
+    loss[:n_pipes] = _pipe_loss(Q[:n_pipes], L, D, eps, K, rho, mu, mode)[0]
+    qp = Q[n_pipes:]
+    loss[n_pipes:] = -(a0 - a1*qp - a2*qp*np.abs(qp))
+    return {
+        "Q": Q*1000.0, "dp": loss, "v": Q[:n_pipes]/A_p,
+        "p": pstar - rho*G*z, "iterations": it, "converged": converged,
+    }
+
+def grid_network(side, rng=None):
+    """Looped test network: a side × side street grid fed by a pump from one reservoir."""
+    rng = np.random.default_rng(0) if rng is None else rng
+    idx = np.arange(side*side).reshape(side, side)
+    start = np.concatenate([idx[:, :-1].ravel(), idx[:-1, :].ravel()])
+    end = np.concatenate([idx[:, 1:].ravel(), idx[1:, :].ravel()])
+    n = side*side + 1  # last node is the reservoir
+    demand = np.append(rng.uniform(0.05, 0.3, side*side), 0.0)
+    total = demand.sum()/1000.0
+    # pump sized to deliver the total demand at ~250 kPa
+    pumps = {"start": [n - 1], "end": [0], "a0": [400e3], "a1": [0.0], "a2": [150e3/total**2]}
+    return dict(
+        n_nodes=n, start=start, end=end,
+        length=rng.uniform(10.0, 50.0, len(start)),
+        diameter=rng.choice([0.0526, 0.0627, 0.0779, 0.1023, 0.1282], len(start)),
+        K=rng.uniform(0.0, 3.0, len(start)),
+        demand=demand, elevation=np.append(rng.uniform(0.0, 20.0, side*side), 0.0),
+        fixed={n - 1: 100e3}, pumps=pumps,
+    )
+
+
+if __name__ == "__main__":
+    # Checks (parallel split, mass and energy balance) and scaling benchmark.
+    # Run: python -m apps.shared.pipe_network
+    import time
+    from apps.shared.pipes import dp_per_m_for_diameter
+
+    # two identical parallel pipes split evenly; the loss matches the single-pipe formula
+    res = solve(2, [0, 0], [1, 1], 100.0, 0.05, demand=[0.0, 4.0], fixed={0: 300e3})
+    dp_ref = dp_per_m_for_diameter(0.002, 0.05, 999.7, 1.31e-3, 4.6e-5)*100.0
+    assert np.allclose(res["Q"], 2.0) and abs(res["p"][0] - res["p"][1] - dp_ref) < 1e-3*dp_ref
+
+    for side in (8, 23, 71):
+        net = grid_network(side)
+        t0 = time.perf_counter()
+        res = solve(**net)
+        ms = (time.perf_counter() - t0)*1e3
+        # mass balance at free nodes and energy balance on every link
+        n_links = len(res["Q"])
+        frm = np.concatenate([net["start"], net["pumps"]["start"]])
+        to = np.concatenate([net["end"], net["pumps"]["end"]])
+        inflow = np.bincount(to, res["Q"], net["n_nodes"]) - np.bincount(frm, res["Q"], net["n_nodes"])
+        mass = np.max(np.abs(inflow - net["demand"])[:-1])
+        pstar = res["p"] + 999.7*G*net["elevation"]
+        energy = np.max(np.abs(res["dp"] - (pstar[frm] - pstar[to])))
+        print(f"{n_links - 1:6d} pipes  {res['iterations']:2d} iterations  {ms:7.1f} ms  "
+              f"mass residual {mass:.1e} L/s  energy residual {energy:.1e} Pa")
+        assert res["converged"] and mass < 1e-6 and energy < 1.0
@@ -0,0 +1,74 @@
+# apps/shared/psychro_grid.py
+# Compact DB × RH lookup grid of W/h/Twb/v for the browser-side readout
+# (apps/assets/psychro_grid.js interpolates it bilinearly). One grid per site
+# pressure, built with the vectorised engine in a few ms and cached.
+from functools import lru_cache
+import numpy as np
+from apps.shared import psychrometrics as psy
+
+DB_AXIS = (-10.0, 1.0, 61)  # start °C, step, count → -10…50 °C
+RH_AXIS = (0.0, 5.0, 21)    # start %, step, count → 0…100 %
+_ROUND = {"W": 3, "h": 2, "Twb": 2, "v": 4}  # W in g/kg
+
+# Max |interpolated − CoolProp| over -10…50 °C, 0…100 %RH at 101.325 kPa (off-grid points).
+# W/h are dominated by the ASHRAE-vs-CoolProp model difference at hot/saturated states.
+# Twb jumps where the wet surface switches from water to ice, so near Twb = 0 °C the
+# bilinear cell straddles the jump and the looser band tolerance applies.
+GRID_TOL = {"W": 0.6, "h": 1.3, "Twb": 0.1, "v": 0.001}
+TWB_FREEZE_BAND, TWB_FREEZE_TOL = 1.5, 0.5
+
+def _axis(a):
+    start, step, n = a
+    return start + step*np.arange(n)
+
+@lru_cache(maxsize=16)
+def build_grid(P=psy.P_ATM):
+    """JSON-ready grid (flat row-major lists, DB-major) for pressure P (Pa)."""
+    T, R = np.meshgrid(_axis(DB_AXIS), _axis(RH_AXIS) / 100.0, indexing="ij")
+    st = psy.state(T, R, P)
+    vals = {"W": st["W"]*1000.0, "h": st["h"], "Twb": st["Twb"], "v": st["v"]}
+    grid = {"db": list(DB_AXIS), "rh": list(RH_AXIS), "P": float(P)}
+    for k, arr in vals.items():
+        grid[k] = np.round(arr, _ROUND[k]).ravel().tolist()
+    return grid
+
+def interpolate(grid, db, rh):
+    """Python twin of the JS interpolation (bilinear, clamped to the grid)."""
+    (d0, dd, nd), (r0, dr, nr) = grid["db"], grid["rh"]
+    x = np.clip((np.asarray(db, float) - d0) / dd, 0, nd - 1)
+    y = np.clip((np.asarray(rh, float) - r0) / dr, 0, nr - 1)
+    i = np.minimum(np.floor(x).astype(int), nd - 2)
+    j = np.minimum(np.floor(y).astype(int), nr - 2)
+    fx, fy = x - i, y - j
+    out = {}
+    for k in _ROUND:
+        a = np.asarray(grid[k]).reshape(nd, nr)
+        out[k] = ((1-fx)*(1-fy)*a[i, j] + fx*(1-fy)*a[i+1, j]
+                  + (1-fx)*fy*a[i, j+1] + fx*fy*a[i+1, j+1])
+    return out
+
+
+if __name__ == "__main__":
+    # Tolerance check of the shipped grid against the exact (CoolProp) path.
+    # Run: python -m apps.shared.psychro_grid
+    import json
+    from apps.shared.psychro_state import state_point
+
+    grid = build_grid()
+    rng = np.random.default_rng(0)
+    db = rng.uniform(-10.0, 50.0, 2000)
+    rh = rng.uniform(0.0, 100.0, 2000)
+    approx = interpolate(grid, db, rh)
+    exact = {k: np.empty_like(db) for k in _ROUND}
+    for n, (t, r) in enumerate(zip(db, rh)):
+        st = state_point(t, r / 100.0)
+        exact["W"][n], exact["h"][n], exact["Twb"][n], exact["v"][n] = st["W"]*1000.0, st["h"], st["Twb"], st["v"]
+    print(f"grid payload {len(json.dumps(grid)) / 1024:.1f} KB")
+    band = np.abs(exact["Twb"]) < TWB_FREEZE_BAND
+    checks = [(k, np.ones_like(db, bool) if k != "Twb" else ~band, tol) for k, tol in GRID_TOL.items()]
+    checks.append(("Twb", band, TWB_FREEZE_TOL))
+    for k, mask, tol in checks:
+        err = np.max(np.abs(approx[k] - exact[k])[mask], initial=0.0)
+        label = f"{k} (|Twb| < {TWB_FREEZE_BAND} °C)" if k == "Twb" and mask is band else k
+        print(f"  {label:<24} max |err| {err:.4f}  (tol {tol})")
+        assert err <= tol, f"{label} grid error {err} exceeds {tol}"
@@ -0,0 +1,130 @@
+# apps/shared/psychro_inverse.py
+# Resolve a full moist-air state from any supported pair of known properties.
+# Inputs broadcast as NumPy arrays, so a logger file of thousands of readings is one call.
+# Closed forms are used wherever the pair allows; the rest use vectorised bisection on DB.
+import numpy as np
+from apps.shared import psychrometrics as psy
+
+# property keys: db, wb, dp (°C), rh (%), W (g/kg), h (kJ/kg)
+PAIRS = {
+    ("db", "rh"): "Dry bulb + RH",
+    ("db", "wb"): "Dry bulb + wet bulb",
+    ("db", "dp"): "Dry bulb + dew point",
+    ("db", "W"):  "Dry bulb + humidity ratio",
+    ("db", "h"):  "Dry bulb + enthalpy",
+    ("h", "W"):   "Enthalpy + humidity ratio",
+    ("wb", "W"):  "Wet bulb + humidity ratio",
+    ("wb", "dp"): "Wet bulb + dew point",
+    ("dp", "rh"): "Dew point + RH",
+    ("W", "rh"):  "Humidity ratio + RH",
+    ("h", "dp"):  "Enthalpy + dew point",
+    ("h", "rh"):  "Enthalpy + RH",
+    ("wb", "rh"): "Wet bulb + RH",
+}
+
+def _db_from_wb_w(wb, w, p):
+    # ASHRAE eq. 33/35 are linear in t once t* (and so W_s*) is fixed
+    ws = psy.sat_humidity_ratio(wb, p)
+    water = ((2501.0 - 2.326*wb)*ws + 1.006*wb - w*(2501.0 - 4.186*wb)) / (1.006 + 1.86*w)
+    ice = ((2830.0 - 0.24*wb)*ws + 1.006*wb - w*(2830.0 - 2.1*wb)) / (1.006 + 1.86*w)
+    return np.where(wb >= 0.0, water, ice)
+
+def _bisect_db(f, target, lo, hi, tol=1e-4, max_iter=60):
+    """Vectorised bisection for f(db) = target with f increasing in db."""
+    lo, hi = np.broadcast_arrays(np.asarray(lo, float), np.asarray(hi, float))
+    lo, hi = lo.copy(), hi.copy()
+    for _ in range(max_iter):
+        mid = 0.5*(lo + hi)
+        above = f(mid) > target
+        hi = np.where(above, mid, hi)
+        lo = np.where(above, lo, mid)
+        if np.max(hi - lo, initial=0.0) < tol:
+            break
+    return 0.5*(lo + hi)
+
+def resolve(p=psy.P_ATM, **known):
+    """Full state from exactly two of db, wb, dp, rh (%), W (g/kg), h (kJ/kg).
+
+    Returns a dict of arrays: db, rh (%), W (g/kg), h, Twb, Tdp (°C), v (m³/kg).
+    Raises ValueError for unsupported or ill-conditioned pairs (e.g. h + wb).
+    """
+    keys = tuple(sorted(known))
+    pair = next((k for k in PAIRS if tuple(sorted(k)) == keys), None)
+    if pair is None:
+        raise ValueError(f"Unsupported property pair: {', '.join(known) or 'none'}")
+    v = {k: np.asarray(val, float) for k, val in known.items()}
+    w = db = None
+
+    # humidity ratio fixed directly by W or dew point
+    if "W" in v:
+        w = v["W"] / 1000.0
+    elif "dp" in v:
+        w = psy.w_from_pw(psy.sat_pressure(v["dp"]), p)
+
+    if w is not None:
+        if "db" in v:
+            db = v["db"]
+        elif "h" in v:
+            db = psy.dry_bulb_from_h_w(v["h"], w)
+        elif "wb" in v:
+            db = _db_from_wb_w(v["wb"], w, p)
+        elif "rh" in v:
+            # at 0 % RH any dry bulb matches, so the pair fixes no state
+            if np.any(v["rh"] <= 0.0):
+                raise ValueError("RH must be above 0 % to fix the state with a dew point or W.")
+            db = psy.dew_point_from_pw(psy.pw_from_w(w, p) / (v["rh"] / 100.0))
+    elif "db" in v:
+        db = v["db"]
+        if "rh" in v:
+            w = psy.humidity_ratio(db, v["rh"] / 100.0, p)
+        elif "wb" in v:
+            w = psy._w_from_wet_bulb(db, v["wb"], p)
+        elif "h" in v:
+            w = (v["h"] - 1.006*db) / (2501.0 + 1.86*db)
+    else:
+        # rh with h or wb: both rise monotonically with db along a constant-RH line
+        rh = v["rh"] / 100.0
+        if "h" in v:
+            f = lambda t: psy.enthalpy(t, psy.humidity_ratio(t, rh, p))
+            db = _bisect_db(f, v["h"], -60.0, np.maximum(v["h"] / 1.006, -60.0) + 1.0)
+        else:
+            f = lambda t: psy.wet_bulb(t, psy.humidity_ratio(t, rh, p), p)
+            db = _bisect_db(f, v["wb"], v["wb"], v["wb"] + 80.0)
+        w = psy.humidity_ratio(db, rh, p)
+
+    db, w = np.broadcast_arrays(np.asarray(db, float), np.asarray(w, float))
+    return {
+        "db": db,
+        "rh": psy.relative_humidity(db, w, p) * 100.0,
+        "W": w * 1000.0,
+        "h": psy.enthalpy(db, w),
+        "Twb": psy.wet_bulb(db, w, p),
+        "Tdp": psy.dew_point_from_pw(psy.pw_from_w(w, p)),
+        "v": psy.specific_volume(db, w, p),
+    }
+
+
+if __name__ == "__main__":
+    # Round-trip check over random states for every pair, with timings.
+    # Run: python -m apps.shared.psychro_inverse
+    import time
+    rng = np.random.default_rng(0)
+    db = rng.uniform(-10.0, 45.0, 10_000)
+    rh = rng.uniform(5.0, 100.0, 10_000)
+    truth = resolve(db=db, rh=rh)
+    truth = {"db": truth["db"], "rh": truth["rh"], "W": truth["W"], "h": truth["h"],
+             "wb": truth["Twb"], "dp": truth["Tdp"]}
+    for a, b in PAIRS:
+        t0 = time.perf_counter()
+        got = resolve(**{a: truth[a], b: truth[b]})
+        ms = (time.perf_counter() - t0) * 1e3
+        err_db = np.max(np.abs(got["db"] - truth["db"]))
+        err_w = np.max(np.abs(got["W"] - truth["W"]))
+        print(f"{a}+{b:<4} {ms:7.1f} ms  |Δdb| {err_db:.2e}  |ΔW| {err_w:.2e} g/kg")
+        assert err_db < 5e-3 and err_w < 5e-3, f"{a}+{b} round trip off"
+    for a in ("dp", "W"):
+        try:
+            resolve(**{a: 10.0, "rh": 0.0})
+        except ValueError:
+            continue
+        raise AssertionError(f"{a}+rh at 0 % RH should be rejected")
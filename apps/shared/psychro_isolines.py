@@ -0,0 +1,92 @@
+# apps/shared/psychro_isolines.py
+# Constant-enthalpy, wet-bulb and specific-volume lines for the psychrometric chart.
+# The standard-pressure set is generated offline into apps/assets/psychro_isolines.npz
+# (python -m apps.shared.psychro_isolines) and loaded lazily on first use; other site
+# pressures are built with the same vectorised code and cached.
+from functools import lru_cache
+from pathlib import Path
+import numpy as np
+import plotly.graph_objects as go
+from apps.shared import psychrometrics as psy
+
+NPZ_PATH = Path(__file__).resolve().parents[1] / "assets" / "psychro_isolines.npz"
+
+FAMILIES = {
+    # key: (trace name, levels, label format, line style)
+    "h":   ("Enthalpy (kJ/kg)", np.arange(-10.0, 131.0, 10.0), "h = {:.0f} kJ/kg",
+            dict(color="#e6a100", width=1, dash="dash")),
+    "Twb": ("Wet bulb (°C)", np.arange(-10.0, 33.0, 2.0), "Twb = {:.0f} °C",
+            dict(color="#2ca02c", width=1, dash="dot")),
+    "v":   ("Specific volume (m³/kg)", np.round(np.arange(0.74, 0.961, 0.02), 2), "v = {:.2f} m³/kg",
+            dict(color="#9467bd", width=1, dash="dashdot")),
+}
+
+DB = np.linspace(-10.0, 50.0, 121)
+
+def _family_w(key, levels, db, p):
+    L, T = levels[:, None], db[None, :]
+    if key == "h":
+        return (L - 1.006*T) / (2501.0 + 1.86*T)
+    if key == "v":
+        return (L*(p/1000.0) / (0.287042*(T + 273.15)) - 1.0) / 1.607858
+    # wet bulb: ASHRAE eq. 33/35 with t* fixed along the line, only for t ≥ t*
+    W = psy._w_from_wet_bulb(T, np.broadcast_to(L, (len(levels), len(db))), p)
+    return np.where(T >= L, W, np.nan)
+
+def build_isolines(p=psy.P_ATM):
+    """{key: (levels, W array [levels × DB] in g/kg, NaN outside 0 ≤ W ≤ W_sat)}."""
+    w_sat = psy.sat_humidity_ratio(DB, p)[None, :]
+    out = {}
+    for key, (_, levels, _, _) in FAMILIES.items():
+        W = _family_w(key, levels, DB, p)
+        W = np.where((W >= 0.0) & (W <= w_sat*1.0001), W, np.nan)
+        out[key] = (levels, W*1000.0)
+    return out
+
+def write_npz(path=NPZ_PATH, p=psy.P_ATM):
+    lines = build_isolines(p)
+    arrays = {"P": np.array(p), "db": DB.astype(np.float32)}
+    for key, (levels, W) in lines.items():
+        arrays[f"{key}_levels"] = levels
+        arrays[f"{key}_W"] = W.astype(np.float32)
+    np.savez_compressed(path, **arrays)
+
+@lru_cache(maxsize=1)
+def _npz():
+    if not NPZ_PATH.exists():
+        return None
+    with np.load(NPZ_PATH) as z:
+        return {k: z[k] for k in z.files}
+
+@lru_cache(maxsize=16)
+def isolines(p=psy.P_ATM):
+    z = _npz()
+    if z is not None and abs(float(z["P"]) - p) < 1.0:
+        return {key: (z[f"{key}_levels"], z[f"{key}_W"].astype(float)) for key in FAMILIES}
+    return build_isolines(p)
+
+def trace_xy(key, p=psy.P_ATM):
+    """One None-separated line set (x, y, hover text) for a family."""
+    levels, W = isolines(p)[key]
+    fmt = FAMILIES[key][2]
+    xs, ys, txt = [], [], []
+    for lvl, row in zip(levels, W):
+        ok = np.isfinite(row)
+        if ok.sum() < 2:
+            continue
+        xs += DB[ok].round(2).tolist() + [None]
+        ys += row[ok].round(3).tolist() + [None]
+        txt += [fmt.format(lvl)] * int(ok.sum()) + [None]
+    return xs, ys, txt
+
+def isoline_traces():
+    """Empty, hidden placeholders (one per family) filled via Patch when switched on."""
+    return [go.Scatter(x=[], y=[], text=[], mode="lines", name=name, line=style, visible=False,
+                       hovertemplate="%{text}<extra></extra>")
+            for name, _, _, style in FAMILIES.values()]
+
+
+if __name__ == "__main__":
+    # Build step: python -m apps.shared.psychro_isolines
+    write_npz()
+    print(f"wrote {NPZ_PATH} ({NPZ_PATH.stat().st_size / 1024:.1f} KB)")
@@ -0,0 +1,105 @@
+# apps/shared/psychro_process.py
+# Vectorised air-handling processes for whole AHU schedules.
+# Each function takes arrays (one element per AHU) and returns a dict of arrays;
+# nothing loops per unit. States are (t °C, W kg/kg_da); flows L/s; loads kW.
+import numpy as np
+import plotly.graph_objects as go
+from apps.shared import psychrometrics as psy
+
+P_ATM = psy.P_ATM
+CP_DA, CP_V = 1.006, 1.86  # kJ/kg·K
+
+PROCESS_TYPES = ("Mixing", "Cooling coil", "Heating")
+
+SCHEDULE_COLUMNS = ["ahu", "flow_ls", "oa_frac", "oa_db", "oa_rh", "ra_db", "ra_rh", "adp", "bf", "supply_db"]
+
+def dry_air_mass_flow(flow_ls, t_c, w, p=P_ATM):
+    """kg_da/s for a volume flow measured at state (t, W)."""
+    return np.asarray(flow_ls, float) / 1000.0 / psy.specific_volume(t_c, w, p)
+
+def mix(t1, w1, m1, t2, w2, m2):
+    """Adiabatic mixing of two streams by dry-air mass flow (kg/s).
+
+    Where the total flow is zero the result is the second (return-air) state.
+    """
+    m1, m2 = np.asarray(m1, float), np.asarray(m2, float)
+    m = m1 + m2
+    flowing = m > 0
+    m_safe = np.where(flowing, m, 1.0)
+    h2 = psy.enthalpy(t2, w2)
+    w = np.where(flowing, (m1*w1 + m2*w2) / m_safe, w2)
+    h = np.where(flowing, (m1*psy.enthalpy(t1, w1) + m2*h2) / m_safe, h2)
+    return {"t": psy.dry_bulb_from_h_w(h, w), "W": w, "h": h, "m": m}
+
+def sensible(t_in, w_in, m, t_out):
+    """Sensible heating (t_out > t_in) or cooling at constant W; load kW (+ heating)."""
+    t_out = np.broadcast_to(np.asarray(t_out, float), np.shape(t_in))
+    q = np.asarray(m, float) * (psy.enthalpy(t_out, w_in) - psy.enthalpy(t_in, w_in))
+    return {"t": t_out, "W": np.asarray(w_in, float), "h": psy.enthalpy(t_out, w_in), "Q": q}
+
+def cooling_coil(t_in, w_in, m, adp, bf, p=P_ATM):
+    """Coil leaving state from apparatus dew point and bypass factor.
+
+    Where the entering air is already drier than saturation at the ADP the coil
+    runs dry and only sensible cooling occurs; where it enters colder than the ADP the
+    coil is off (leaving = entering). Loads are kW of cooling, never negative.
+    """
+    t_in, w_in = np.asarray(t_in, float), np.asarray(w_in, float)
+    adp, bf, m = np.asarray(adp, float), np.asarray(bf, float), np.asarray(m, float)
+    w_adp = psy.sat_humidity_ratio(adp, p)
+    t_out = np.minimum(adp + bf*(t_in - adp), t_in)
+    w_out = np.where(w_in > w_adp, w_adp + bf*(w_in - w_adp), w_in)
+    h_in, h_out = psy.enthalpy(t_in, w_in), psy.enthalpy(t_out, w_out)
+    total = np.maximum(m*(h_in - h_out), 0.0)
+    sens = np.maximum(m*(CP_DA + CP_V*w_out)*(t_in - t_out), 0.0)
+    return {
+        "t": t_out, "W": w_out, "h": h_out,
+        "Q_total": total, "Q_sensible": sens, "Q_latent": total - sens,
+        "condensate_kgs": m*(w_in - w_out),
+    }
+
+def ahu_schedule(flow_ls, oa_frac, oa_db, oa_rh, ra_db, ra_rh, adp, bf, supply_db, p=P_ATM):
+    """Mix OA/RA → cooling coil → reheat to supply_db for every AHU at once.
+
+    RH inputs are in %, oa_frac 0–1. Returns the states and loads of each stage.
+    """
+    flow_ls, oa_frac = np.asarray(flow_ls, float), np.asarray(oa_frac, float)
+    w_oa = psy.humidity_ratio(oa_db, np.asarray(oa_rh, float)/100.0, p)
+    w_ra = psy.humidity_ratio(ra_db, np.asarray(ra_rh, float)/100.0, p)
+    m_oa = dry_air_mass_flow(flow_ls*oa_frac, oa_db, w_oa, p)
+    m_ra = dry_air_mass_flow(flow_ls*(1.0 - oa_frac), ra_db, w_ra, p)
+    mixed = mix(oa_db, w_oa, m_oa, ra_db, w_ra, m_ra)
+    coil = cooling_coil(mixed["t"], mixed["W"], mixed["m"], adp, bf, p)
+    # reheat only where the coil leaves air below the supply set point
+    heat = sensible(coil["t"], coil["W"], mixed["m"], np.maximum(coil["t"], supply_db))
+    return {
+        "oa": {"t": np.asarray(oa_db, float), "W": w_oa},
+        "ra": {"t": np.asarray(ra_db, float), "W": w_ra},
+        "mixed": mixed, "coil": coil, "supply": heat,
+    }
+
+def _segments(*states):
+    # [a0, b0, None, a1, b1, None, …] so that one trace carries every AHU's line
+    cols = np.stack([np.asarray(s, float) for s in states] + [np.full(np.shape(states[0]), np.nan)], axis=-1)
+    out = cols.ravel().astype(object)
+    out[np.isnan(cols.ravel())] = None
+    return out.tolist()
+
+def process_lines(res):
+    """x/y (DB °C, W g/kg) per process type — one trace each, not one per AHU."""
+    oa, ra, mx, coil, sup = res["oa"], res["ra"], res["mixed"], res["coil"], res["supply"]
+    return {
+        "Mixing": (_segments(oa["t"], mx["t"], ra["t"]), _segments(oa["W"]*1e3, mx["W"]*1e3, ra["W"]*1e3)),
+        "Cooling coil": (_segments(mx["t"], coil["t"]), _segments(mx["W"]*1e3, coil["W"]*1e3)),
+        "Heating": (_segments(coil["t"], sup["t"]), _segments(coil["W"]*1e3, sup["W"]*1e3)),
+    }
+
+def process_traces():
+    """Empty placeholder traces (one per process type) for a chart to fill via Patch."""
+    styles = {"Mixing": dict(dash="dot", color="#5f6368"),
+              "Cooling coil": dict(color="#1f77b4", width=2.5),
+              "Heating": dict(color="#d62728", width=2.5)}
+    return [go.Scatter(x=[], y=[], mode="lines+markers", name=name, line=styles[name],
+                       marker=dict(size=5), legendgroup="processes",
+                       hovertemplate="DB: %{x:.1f} °C<br>W: %{y:.2f} g/kg<extra>" + name + "</extra>")
+            for name in PROCESS_TYPES]
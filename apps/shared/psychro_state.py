@@ -0,0 +1,53 @@
+# apps/shared/psychro_state.py
+# Exact (CoolProp) psychrometric state points behind a bounded LRU cache.
+# Inputs are quantised before lookup so that slider/typed values that differ only
+# in float noise share an entry; a repeated design state costs a dict lookup
+# instead of four HAPropsSI solves.
+from functools import lru_cache
+from CoolProp.HumidAirProp import HAPropsSI
+
+P_ATM = 101325.0  # Pa
+
+T_STEP = 0.01    # °C
+RH_STEP = 0.001  # fraction (0.1 %RH)
+P_STEP = 10.0    # Pa
+CACHE_SIZE = 4096
+
+def _quantise(t_c, rh, p):
+    return round(float(t_c) / T_STEP), round(float(rh) / RH_STEP), round(float(p) / P_STEP)
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _solve(t_q, rh_q, p_q):
+    T_K = t_q * T_STEP + 273.15
+    RH = rh_q * RH_STEP
+    P = p_q * P_STEP
+    return (
+        HAPropsSI("W",   "T", T_K, "P", P, "R", RH),
+        HAPropsSI("H",   "T", T_K, "P", P, "R", RH) / 1000.0,
+        HAPropsSI("Twb", "T", T_K, "P", P, "R", RH) - 273.15,
+        HAPropsSI("D",   "T", T_K, "P", P, "R", RH) - 273.15,
+        HAPropsSI("V",   "T", T_K, "P", P, "R", RH),
+    )
+
+def state_point(t_c, rh, p=P_ATM):
+    """All properties for dry-bulb t_c (°C), RH fraction and pressure p (Pa).
+
+    Returns a dict: W (kg/kg_da), h (kJ/kg_da), Twb (°C), Tdp (°C), v (m³/kg_da).
+    Raises ValueError from CoolProp for states outside its range.
+    """
+    W, h, twb, tdp, v = _solve(*_quantise(t_c, rh, p))
+    return {"W": W, "h": h, "Twb": twb, "Tdp": tdp, "v": v}
+
+def cache_stats():
+    info = _solve.cache_info()
+    total = info.hits + info.misses
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "maxsize": info.maxsize,
+        "hit_rate": info.hits / total if total else 0.0,
+    }
+
+def clear_cache():
+    _solve.cache_clear()
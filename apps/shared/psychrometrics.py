@@ -0,0 +1,168 @@
+# apps/shared/psychrometrics.py
+# Vectorised moist-air properties (ASHRAE Fundamentals 2017, ch. 1).
+# Every function takes scalars or NumPy arrays and broadcasts, so whole curves
+# and DB × RH grids are evaluated in one pass instead of one HAPropsSI call per point.
+# Units: temperatures °C, pressure Pa, RH as a fraction (0–1), W kg/kg_da, h kJ/kg_da.
+import numpy as np
+
+P_ATM = 101325.0  # Pa
+MW_RATIO = 0.621945  # M_water / M_dry-air
+
+# Hyland–Wexler saturation pressure coefficients (T in K, p in Pa)
+_ICE = (-5.6745359e3, 6.3925247, -9.6778430e-3, 6.2215701e-7, 2.0747825e-9, -9.4840240e-13, 4.1635019)
+_WATER = (-5.8002206e3, 1.3914993, -4.8640239e-2, 4.1764768e-5, -1.4452093e-8, 6.5459673)
+
+def pressure_from_altitude(z_m):
+    """Standard-atmosphere barometric pressure (ASHRAE eq. 3), Pa."""
+    return P_ATM * (1.0 - 2.25577e-5*np.asarray(z_m, float))**5.2559
+
+def altitude_from_pressure(p):
+    return (1.0 - (np.asarray(p, float)/P_ATM)**(1.0/5.2559)) / 2.25577e-5
+
+def _ln_pws(T_K):
+    c1, c2, c3, c4, c5, c6, c7 = _ICE
+    ice = c1/T_K + c2 + c3*T_K + c4*T_K**2 + c5*T_K**3 + c6*T_K**4 + c7*np.log(T_K)
+    c8, c9, c10, c11, c12, c13 = _WATER
+    water = c8/T_K + c9 + c10*T_K + c11*T_K**2 + c12*T_K**3 + c13*np.log(T_K)
+    return np.where(T_K < 273.15, ice, water)
+
+def sat_pressure(t_c):
+    """Saturation vapour pressure over water (t ≥ 0 °C) or ice (t < 0 °C), Pa."""
+    return np.exp(_ln_pws(np.asarray(t_c, float) + 273.15))
+
+def w_from_pw(pw, p=P_ATM):
+    return MW_RATIO * pw / (p - pw)
+
+def pw_from_w(w, p=P_ATM):
+    w = np.asarray(w, float)
+    return p * w / (MW_RATIO + w)
+
+def humidity_ratio(t_c, rh, p=P_ATM):
+    """Humidity ratio W (kg/kg_da) from dry-bulb and RH fraction."""
+    return w_from_pw(np.asarray(rh, float) * sat_pressure(t_c), p)
+
+def sat_humidity_ratio(t_c, p=P_ATM):
+    return w_from_pw(sat_pressure(t_c), p)
+
+def relative_humidity(t_c, w, p=P_ATM):
+    return pw_from_w(w, p) / sat_pressure(t_c)
+
+def enthalpy(t_c, w):
+    """Moist-air enthalpy, kJ/kg_da."""
+    t_c = np.asarray(t_c, float)
+    return 1.006*t_c + np.asarray(w, float)*(2501.0 + 1.86*t_c)
+
+def dry_bulb_from_h_w(h, w):
+    w = np.asarray(w, float)
+    return (np.asarray(h, float) - 2501.0*w) / (1.006 + 1.86*w)
+
+def specific_volume(t_c, w, p=P_ATM):
+    """Moist-air specific volume, m³/kg_da."""
+    return 0.287042 * (np.asarray(t_c, float) + 273.15) * (1.0 + 1.607858*np.asarray(w, float)) / (p / 1000.0)
+
+def dew_point_from_pw(pw, iters=6):
+    """Invert the Hyland–Wexler equation with Newton steps on ln(pws), °C."""
+    ln_pw = np.log(np.maximum(np.asarray(pw, float), 1e-6))
+    # Magnus form as the starting guess — stays finite as pw → 0 (RH = 0)
+    a = ln_pw - np.log(610.94)
+    T = 243.04*a / (17.625 - a) + 273.15
+    for _ in range(iters):
+        h = 1e-3
+        f = _ln_pws(T) - ln_pw
+        df = (_ln_pws(T + h) - _ln_pws(T - h)) / (2*h)
+        T = T - f/df
+    return T - 273.15
+
+def dew_point(t_c, rh):
+    return dew_point_from_pw(np.asarray(rh, float) * sat_pressure(t_c))
+
+def _w_from_wet_bulb(t_c, t_wb, p):
+    # ASHRAE eq. 33 (wet surface) / eq. 35 (ice surface)
+    ws = sat_humidity_ratio(t_wb, p)
+    water = ((2501.0 - 2.326*t_wb)*ws - 1.006*(t_c - t_wb)) / (2501.0 + 1.86*t_c - 4.186*t_wb)
+    ice = ((2830.0 - 0.24*t_wb)*ws - 1.006*(t_c - t_wb)) / (2830.0 + 1.86*t_c - 2.1*t_wb)
+    return np.where(t_wb >= 0.0, water, ice)
+
+def wet_bulb(t_c, w, p=P_ATM, tol=1e-4, max_iter=60):
+    """Thermodynamic wet-bulb temperature (°C) by vectorised bisection between dew point and dry bulb."""
+    t_c, w = np.broadcast_arrays(np.asarray(t_c, float), np.asarray(w, float))
+    lo = dew_point_from_pw(pw_from_w(w, p)).copy()
+    hi = t_c.copy()
+    # Eq. 33/35 are discontinuous at 0 °C, so dry air just above freezing has a root on
+    # both sides; take the ice-surface root when it exists (matches CoolProp).
+    ws0 = sat_humidity_ratio(0.0, p)
+    w_ice0 = (2830.0*ws0 - 1.006*t_c) / (2830.0 + 1.86*t_c)
+    hi = np.where((w < w_ice0) & (lo < 0.0), np.minimum(hi, 0.0), hi)
+    for _ in range(max_iter):
+        mid = 0.5*(lo + hi)
+        # W(t*) falls as t* drops below the true wet bulb
+        above = _w_from_wet_bulb(t_c, mid, p) > w
+        hi = np.where(above, mid, hi)
+        lo = np.where(above, lo, mid)
+        if np.max(hi - lo, initial=0.0) < tol:
+            break
+    return 0.5*(lo + hi)
+
+def state(t_c, rh, p=P_ATM):
+    """All properties for DB/RH inputs (scalars or arrays) as a dict of arrays."""
+    w = humidity_ratio(t_c, rh, p)
+    return {
+        "W": w,
+        "h": enthalpy(t_c, w),
+        "Twb": wet_bulb(t_c, w, p),
+        "Tdp": dew_point(t_c, rh),
+        "v": specific_volume(t_c, w, p),
+    }
+
+def rh_curves(db_c, rh_levels, p=P_ATM):
+    """W for every (RH level, DB) pair in one broadcast — shape (len(rh_levels), len(db_c))."""
+    return humidity_ratio(np.asarray(db_c, float)[None, :], np.asarray(rh_levels, float)[:, None], p)
+
+
+if __name__ == "__main__":
+    # Accuracy harness vs CoolProp over the chart range, plus a timing comparison
+    # against the per-point HAPropsSI loop. Run: python -m apps.shared.psychrometrics
+    import time
+    from CoolProp.HumidAirProp import HAPropsSI
+
+    db = np.linspace(-10.0, 50.0, 121)
+    rh = np.linspace(0.1, 1.0, 10)
+    T, R = np.meshgrid(db, rh)
+    ours = state(T, R)
+
+    keys = {"W": "W", "h": "H", "Twb": "Twb", "Tdp": "D", "v": "V"}
+    ref = {k: np.empty_like(T) for k in keys}
+    for idx in np.ndindex(T.shape):
+        t_k = T[idx] + 273.15
+        for k, cp in keys.items():
+            ref[k][idx] = HAPropsSI(cp, "T", t_k, "P", P_ATM, "R", R[idx])
+    ref["h"] /= 1000.0
+    ref["Twb"] -= 273.15
+    ref["Tdp"] -= 273.15
+
+    print("max |error| vs CoolProp, -10…50 °C, RH 10…100 %")
+    print(f"  W   {np.max(np.abs(ours['W'] - ref['W']))*1000:.4f} g/kg "
+          f"({np.max(np.abs(ours['W']/ref['W'] - 1))*100:.3f} %)")
+    print(f"  h   {np.max(np.abs(ours['h'] - ref['h'])):.4f} kJ/kg   (reference states differ; "
+          f"offset-corrected {np.ptp(ours['h'] - ref['h']):.4f})")
+    print(f"  Twb {np.max(np.abs(ours['Twb'] - ref['Twb'])):.4f} K")
+    print(f"  Tdp {np.max(np.abs(ours['Tdp'] - ref['Tdp'])):.4f} K")
+    print(f"  v   {np.max(np.abs(ours['v'] - ref['v'])):.5f} m³/kg")
+    tolerances = {"W": 0.6e-3, "Twb": 0.15, "Tdp": 0.05, "v": 1e-3}  # kg/kg, K, K, m³/kg
+    for k, tol in tolerances.items():
+        err = np.max(np.abs(ours[k] - ref[k]))
+        assert err <= tol, f"{k} error {err} vs CoolProp exceeds {tol}"
+    assert np.ptp(ours["h"] - ref["h"]) <= 1.5, "h error vs CoolProp exceeds 1.5 kJ/kg after the offset"
+
+    curve_db = np.linspace(-10.0, 50.0, 400)
+    levels = np.append(np.arange(0.1, 1.0, 0.1), 1.0)
+    t0 = time.perf_counter()
+    for RH in levels:
+        [HAPropsSI("W", "T", t + 273.15, "P", P_ATM, "R", RH) for t in curve_db]
+    t_loop = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for _ in range(100):
+        rh_curves(curve_db, levels)
+    t_vec = (time.perf_counter() - t0) / 100
+    print(f"10 chart curves × 400 pts: HAPropsSI loop {t_loop*1000:.1f} ms, vectorised {t_vec*1000:.3f} ms "
+          f"({t_loop/t_vec:,.0f}×)")
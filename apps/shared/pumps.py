@@ -0,0 +1,132 @@
+# apps/shared/pumps.py
+# Pump curves, system curves and operating points. A pump is a polynomial fit of
+# head (kPa) and efficiency (%) against flow (L/s) from catalogue points; other speeds
+# follow the affinity laws (Q ∝ n, Δp ∝ n², η unchanged at similar points). Duty points
+# for a whole speed range are found together by vectorised bisection.
+import io
+import numpy as np
+import pandas as pd
+from apps.shared.pipes import dp_per_m_for_diameter
+
+PUMP_COLUMNS = ["flow_ls", "head_kpa", "eff_pct"]
+
+# Example end-suction curve used until a catalogue CSV is uploaded
+SAMPLE_PUMP = pd.DataFrame({
+    "flow_ls":  [0.0, 2.0, 4.0, 6.0, 8.0, 10.0, 12.0, 14.0],
+    "head_kpa": [310.0, 306.0, 296.0, 279.0, 255.0, 224.0, 186.0, 141.0],
+    "eff_pct":  [0.0, 32.0, 53.0, 66.0, 73.0, 75.0, 72.0, 63.0],
+})
+
+def parse_pump_csv(text):
+    """Catalogue points from CSV text with columns flow_ls, head_kpa and optionally eff_pct."""
+    df = pd.read_csv(io.StringIO(text))
+    df.columns = [c.strip().lower() for c in df.columns]
+    missing = [c for c in PUMP_COLUMNS[:2] if c not in df.columns]
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(missing)}")
+    cols = [c for c in PUMP_COLUMNS if c in df.columns]
+    df = df[cols].apply(pd.to_numeric, errors="coerce").dropna().sort_values("flow_ls")
+    if len(df) < 3:
+        raise ValueError("Need at least three curve points.")
+    return df
+
+def fit_pump(df, deg=2):
+    """Polynomial head and efficiency fits; returns a dict of coefficients and the flow range."""
+    q = df["flow_ls"].to_numpy(float)
+    pump = {"head": np.polyfit(q, df["head_kpa"].to_numpy(float), deg), "q_max": float(q.max())}
+    if "eff_pct" in df:
+        pump["eff"] = np.polyfit(q, df["eff_pct"].to_numpy(float), min(deg + 1, len(q) - 1))
+    return pump
+
+def pump_head(pump, Q_ls, speed=1.0):
+    """Δp (kPa) at flow Q and relative speed n: n²·H(Q/n)."""
+    n = np.asarray(speed, float)
+    return n*n*np.polyval(pump["head"], np.asarray(Q_ls, float)/n)
+
+def pump_eff(pump, Q_ls, speed=1.0):
+    """Efficiency (%) carried along the affinity parabola: η(Q/n); NaN without an efficiency curve."""
+    if "eff" not in pump:
+        return np.full(np.broadcast(np.asarray(Q_ls), np.asarray(speed)).shape, np.nan)
+    return np.clip(np.polyval(pump["eff"], np.asarray(Q_ls, float)/np.asarray(speed, float)), 0.0, 100.0)
+
+def system_curve(Q_ls, D, L, K=0.0, static_kpa=0.0, *, eps=4.6e-5, rho=998.2, mu=1.0e-3, mode="haaland"):
+    """Index-circuit Δp (kPa): pipe friction over L plus ΣK·ρv²/2 plus a fixed static lift."""
+    Q = np.asarray(Q_ls, float)/1000.0
+    v = Q/(np.pi*D*D/4.0)
+    friction = dp_per_m_for_diameter(np.maximum(Q, 1e-12), D, rho, mu, eps, mode)*L
+    return (friction + K*0.5*rho*v*v)/1000.0 + static_kpa
+
+def operating_points(pump, system, speeds, iters=60):
+    """Duty (Q, Δp, η) where the pump curve meets the system at every relative speed.
+
+    system is a callable Δp_kPa(Q_ls). The pump curve falls and the system curve rises,
+    so the difference has one root on [0, n·q_max]; speeds with no root give NaN.
+    """
+    n = np.atleast_1d(np.asarray(speeds, float))
+    lo, hi = np.zeros_like(n), n*pump["q_max"]
+    diff = lambda q: pump_head(pump, q, n) - system(q)
+    ok = (diff(lo) > 0.0) & (diff(hi) < 0.0)
+    for _ in range(iters):
+        mid = 0.5*(lo + hi)
+        above = diff(mid) > 0.0
+        lo = np.where(above, mid, lo)
+        hi = np.where(above, hi, mid)
+    Q = np.where(ok, 0.5*(lo + hi), np.nan)
+    dp = pump_head(pump, Q, n)
+    eff = pump_eff(pump, Q, n)
+    # the fit is clipped at 0 % near shut-off / run-out: no shaft power there rather than P/ε
+    kW = np.divide(Q/1000.0*dp, eff/100.0, out=np.full_like(Q, np.nan), where=eff > 0.0)
+    return {"speed": n, "Q": Q, "dp": dp, "eff": eff, "kW": kW}
+
+def efficiency_map(pump, Q_ls, dp_kpa, n_range=(0.3, 1.2), iters=50):
+    """η (%) over a Q × Δp grid: for each point the speed whose curve passes through it.
+
+    Rising speed lifts the curve at fixed Q, so the speed is found by vectorised bisection.
+    Points outside n_range or the catalogue flow range are NaN.
+    """
+    Qg, Pg = np.meshgrid(np.asarray(Q_ls, float), np.asarray(dp_kpa, float))
+    lo, hi = np.full(Qg.shape, n_range[0]), np.full(Qg.shape, n_range[1])
+    f = lambda n: pump_head(pump, Qg, n) - Pg
+    ok = (f(lo) < 0.0) & (f(hi) > 0.0)
+    for _ in range(iters):
+        mid = 0.5*(lo + hi)
+        up = f(mid) < 0.0
+        lo = np.where(up, mid, lo)
+        hi = np.where(up, hi, mid)
+    n = 0.5*(lo + hi)
+    ok &= Qg/n <= pump["q_max"]
+    return np.where(ok, pump_eff(pump, Qg, n), np.nan)
+
+
+if __name__ == "__main__":
+    # Checks against the affinity laws and a scalar root find, plus timing.
+    # Run: python -m apps.shared.pumps
+    import time
+    pump = fit_pump(SAMPLE_PUMP)
+    sys_fn = lambda q: system_curve(q, 0.0779, 120.0, K=25.0, static_kpa=30.0)
+    speeds = np.linspace(0.5, 1.0, 51)
+    t0 = time.perf_counter()
+    res = operating_points(pump, sys_fn, speeds)
+    ms = (time.perf_counter() - t0)*1e3
+    # each duty point sits on both curves
+    assert np.nanmax(np.abs(res["dp"] - sys_fn(res["Q"]))) < 1e-6
+    # affinity: the point (Q, Δp) on the full-speed curve maps to (nQ, n²Δp)
+    q1 = 7.0
+    assert abs(pump_head(pump, 0.8*q1, 0.8) - 0.64*pump_head(pump, q1)) < 1e-9
+    # scalar cross-check at full speed
+    from math import isclose
+    lo, hi = 0.0, pump["q_max"]
+    for _ in range(80):
+        mid = 0.5*(lo + hi)
+        lo, hi = (mid, hi) if pump_head(pump, mid) > sys_fn(mid) else (lo, mid)
+    assert isclose(res["Q"][-1], 0.5*(lo + hi), rel_tol=1e-9)
+    # shaft power only where the efficiency fit is positive
+    assert isclose(res["kW"][-1], res["Q"][-1]*res["dp"][-1]/res["eff"][-1]/10.0, rel_tol=1e-12)
+    flat = dict(pump, eff=np.zeros_like(pump["eff"]))
+    assert np.isnan(operating_points(flat, sys_fn, speeds)["kW"]).all()
+    print(f"{len(speeds)} speeds in {ms:.2f} ms; full speed {res['Q'][-1]:.2f} L/s at "
+          f"{res['dp'][-1]:.0f} kPa, η {res['eff'][-1]:.0f} %, {res['kW'][-1]:.2f} kW")
+    t0 = time.perf_counter()
+    m = efficiency_map(pump, np.linspace(0.2, 16, 120), np.linspace(5, 400, 120))
+    print(f"efficiency map 120×120 in {(time.perf_counter() - t0)*1e3:.1f} ms "
+          f"({np.isfinite(m).mean()*100:.0f} % of grid reachable)")
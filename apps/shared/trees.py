@@ -0,0 +1,64 @@
+# apps/shared/trees.py
+# Topology helpers for branched distributions given as a parent array (root = plant or
+# fan, parent −1). Nodes are laid out in Euler-tour (DFS pre-order) so each subtree is
+# one contiguous slice [tin, tout) and path totals become one prefix sum.
+import numpy as np
+
+def euler_tour(parent):
+    """(root, order, tin, tout, leaf): pre-order node list, entry/exit positions, leaf mask."""
+    parent = np.asarray(parent, int)
+    n = len(parent)
+    roots = np.flatnonzero(parent < 0)
+    if len(roots) != 1:
+        raise ValueError("The tree needs exactly one root.")
+    children = [[] for _ in range(n)]
+    for i, p in enumerate(parent):
+        if p >= 0:
+            children[p].append(i)
+    order, tout, stack = [], np.empty(n, int), [(roots[0], False)]
+    while stack:
+        node, done = stack.pop()
+        if done:
+            tout[node] = len(order)
+            continue
+        order.append(node)
+        stack.append((node, True))
+        stack.extend((c, False) for c in reversed(children[node]))
+    if len(order) != n:
+        raise ValueError("Some nodes are not connected to the root.")
+    order = np.array(order)
+    tin = np.empty(n, int)
+    tin[order] = np.arange(n)
+    leaf = np.array([not c for c in children])
+    return int(roots[0]), order, tin, tout, leaf
+
+def subtree_sums(order, tin, tout, values):
+    """Sum of values over each node's subtree (itself included)."""
+    cs = np.concatenate([[0.0], np.cumsum(np.asarray(values, float)[order])])
+    return cs[tout] - cs[tin]
+
+def path_sums(tin, tout, values):
+    """Sum of values over each node's path from the root (itself included).
+
+    +v at a node's entry and −v at its exit: the prefix sum at any position is the
+    total over the node's ancestors.
+    """
+    n = len(tin)
+    diff = np.zeros(n + 1)
+    np.add.at(diff, tin, values)
+    np.add.at(diff, tout, -np.asarray(values, float))
+    return np.cumsum(diff)[:-1][tin]
+
+def path_to_root(parent, j):
+    """Node indices from j up to the root."""
+    path = [j]
+    while parent[path[-1]] >= 0:
+        path.append(parent[path[-1]])
+    return np.array(path)
+
+def depths(parent, order):
+    """Edges between each node and the root; pre-order visits parents first."""
+    d = np.zeros(len(parent), int)
+    for i in order[1:]:
+        d[i] = d[parent[i]] + 1
+    return d
@@ -0,0 +1,122 @@
+# apps/shared/weather.py
+# Hourly weather files (EPW or plain CSV) → compact columnar cache → bulk psychrometrics.
+# A file is parsed once; its columns are stored as a float32 .npy keyed by the content
+# hash and re-opened memory-mapped, so re-plotting a site (or 8,760 h × dozens of sites)
+# never re-parses text.
+import hashlib
+import io
+import re
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from apps.shared import psychrometrics as psy
+from apps.shared.cache import cache_path, save_npy
+
+COLUMNS = ("month", "day", "hour", "db", "rh", "p")  # rh in %, p in Pa (NaN if absent)
+_KEY = re.compile(r"^[0-9a-f]{16}$")  # the shape file_key produces
+
+# EPW data rows follow 8 header lines; fixed field positions
+_EPW_FIELDS = {"month": 1, "day": 2, "hour": 3, "db": 6, "rh": 8, "p": 9}
+_EPW_MISSING = {"db": 99.9, "rh": 999.0, "p": 999999.0}
+
+# accepted CSV headers (case-insensitive) for each column
+_CSV_ALIASES = {
+    "month": ("month",),
+    "day": ("day",),
+    "hour": ("hour",),
+    "db": ("db", "dry_bulb", "drybulb", "temperature", "t"),
+    "rh": ("rh", "relative_humidity", "humidity"),
+    "p": ("p", "pressure", "atmospheric_pressure"),
+}
+
+def file_key(raw: bytes) -> str:
+    return hashlib.sha1(raw).hexdigest()[:16]
+
+def _is_epw(raw: bytes) -> bool:
+    return raw.lstrip().upper().startswith(b"LOCATION")
+
+def parse_epw(raw: bytes) -> np.ndarray:
+    df = pd.read_csv(io.BytesIO(raw), header=None, skiprows=8, usecols=list(_EPW_FIELDS.values()))
+    cols = []
+    for name, idx in _EPW_FIELDS.items():
+        v = df[idx].to_numpy(float)
+        if name in _EPW_MISSING:
+            v[v >= _EPW_MISSING[name]] = np.nan
+        cols.append(v)
+    return np.column_stack(cols).astype(np.float32)
+
+def parse_csv(raw: bytes) -> np.ndarray:
+    df = pd.read_csv(io.BytesIO(raw))
+    lower = {c.strip().lower(): c for c in df.columns}
+    cols = []
+    for name in COLUMNS:
+        src = next((lower[a] for a in _CSV_ALIASES[name] if a in lower), None)
+        if src is None and name in ("db", "rh"):
+            raise ValueError(f"CSV needs a '{name}' column")
+        cols.append(df[src].to_numpy(float) if src is not None else np.full(len(df), np.nan))
+    return np.column_stack(cols).astype(np.float32)
+
+def ingest(raw: bytes) -> str:
+    """Parse a weather file into the columnar cache (if not already there); return its key."""
+    key = file_key(raw)
+    path = cache_path("weather", f"{key}.npy")
+    if not path.exists():
+        arr = parse_epw(raw) if _is_epw(raw) else parse_csv(raw)
+        if not np.any(np.isfinite(arr[:, 3]) & np.isfinite(arr[:, 4])):
+            raise ValueError("no hours with both DB and RH")
+        save_npy(path, arr)
+    return key
+
+def load(key: str) -> dict:
+    """Memory-mapped column views for a cached file. Raises ValueError for a key file_key
+    could not have produced and FileNotFoundError if the entry is not (or no longer) cached."""
+    if not isinstance(key, str) or not _KEY.match(key):
+        raise ValueError("not a weather file key")
+    arr = np.load(cache_path("weather", f"{key}.npy"), mmap_mode="r")
+    return {name: arr[:, i] for i, name in enumerate(COLUMNS)}
+
+def hourly_properties(cols: dict, p=psy.P_ATM, use_station_pressure=False) -> dict:
+    """Derived properties for every hour in one vectorised pass (hours with missing DB/RH dropped)."""
+    db = np.asarray(cols["db"], float)
+    rh = np.clip(np.asarray(cols["rh"], float), 0.0, 100.0) / 100.0
+    ok = np.isfinite(db) & np.isfinite(rh)
+    P = np.asarray(cols["p"], float) if use_station_pressure else np.full_like(db, p)
+    P = np.where(np.isfinite(P), P, p)
+    db, rh, P = db[ok], rh[ok], P[ok]
+    props = psy.state(db, rh, P)
+    props["db"] = db
+    props["rh"] = rh * 100.0
+    return props
+
+def design_summary(props: dict) -> dict:
+    """Annual design conditions (ASHRAE-style percentiles) and extremes."""
+    pct = lambda k, q: float(np.percentile(props[k], q))
+    return {
+        "hours": int(props["db"].size),
+        "DB 0.4 % (°C)": pct("db", 99.6),
+        "WB 0.4 % (°C)": pct("Twb", 99.6),
+        "h 0.4 % (kJ/kg)": pct("h", 99.6),
+        "W 0.4 % (g/kg)": pct("W", 99.6) * 1000.0,
+        "DB 99.6 % (°C)": pct("db", 0.4),
+        "Max DB (°C)": float(np.max(props["db"])),
+        "Min DB (°C)": float(np.min(props["db"])),
+    }
+
+def density(props: dict, db_edges=None, w_edges=None):
+    """Hours binned on the chart axes (DB °C × W g/kg); empty bins as NaN so they render transparent."""
+    if db_edges is None:
+        db_edges = np.arange(-10.0, 51.0, 1.0)
+    if w_edges is None:
+        w_edges = np.arange(0.0, 30.5, 0.5)
+    counts, _, _ = np.histogram2d(props["db"], props["W"] * 1000.0, bins=(db_edges, w_edges))
+    z = counts.T
+    z[z == 0] = np.nan
+    xc = 0.5 * (db_edges[1:] + db_edges[:-1])
+    yc = 0.5 * (w_edges[1:] + w_edges[:-1])
+    return xc, yc, z
+
+def density_trace():
+    """Empty heatmap placeholder for a chart to fill via Patch."""
+    return go.Heatmap(x=[], y=[], z=[], name="Weather hours", colorscale="Blues", showscale=False,
+                      opacity=0.75, hoverongaps=False,
+                      hovertemplate="DB %{x:.1f} °C · W %{y:.2f} g/kg<br>%{z:.0f} h<extra></extra>")